@@ -0,0 +1,141 @@
+import asyncio
+import threading
+
+from neo4j import AsyncGraphDatabase
+from neo4j.exceptions import ClientError
+
+from connection import get_connection_manager
+from instrumentation import AsyncInstrumentedDriver, name_by_query
+from neo4j_processes import (
+    DEGREE_BUCKETS, DEGREE_GROUPINGS, GRAPH_STATISTICS_QUERY, LABEL_DISTRIBUTION_QUERY, MOVIE_TITLES_QUERY,
+    RELATIONSHIP_DISTRIBUTION_QUERY, SAMPLE_EDGES_QUERY, SEARCH_FULLTEXT_QUERY, SEARCH_SCAN_QUERY,
+    TOP_CONNECTED_QUERY, _SAMPLE_NODE_QUERIES, _SAMPLE_PROJECTION, _degree_bucket_bounds,
+    _fulltext_query, _fulltext_unavailable, _sample_count_query, _sample_params, _thin_sample,
+)
+
+# Bir sayfanın birbirinden bağımsız okuma sorgularını async driver ile aynı
+# anda çalıştırır; sayfa gecikmesi toplam yerine en yavaş sorguya yaklaşır.
+# Event loop kendi daemon thread'inde yaşar, Streamlit script thread'i
+# yalnızca sonucu bekler. Sorgu metinleri neo4j_processes ile ortaktır.
+
+MAX_CONCURRENCY = 4
+
+
+@name_by_query
+async def _read_rows(tx, query, params):
+    result = await tx.run(query, **params)
+    return [record.data() async for record in result]
+
+
+class AsyncQueryRunner:
+
+    def __init__(self, manager=None, max_concurrency=MAX_CONCURRENCY):
+        self.manager = manager or get_connection_manager()
+        self.max_concurrency = max_concurrency
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="neo4j-async", daemon=True)
+        self._thread.start()
+        # Async driver kendi loop'una bağlıdır; burada oluşturulur
+        self.driver = self.run(self._open())
+
+    async def _open(self):
+        # Sync driver ile aynı metrikler (gecikme, satır, PROFILE örnekleri)
+        driver = AsyncGraphDatabase.driver(self.manager.uri, auth=self.manager.auth, **self.manager.config)
+        return AsyncInstrumentedDriver(driver) if self.manager.instrument else driver
+
+    def run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    async def read(self, query, **params):
+        config = {"database": self.manager.database} if self.manager.database else {}
+        async with self.driver.session(**config) as session:
+            return await session.execute_read(_read_rows, query, params)
+
+    def run_concurrently(self, tasks, limit=None):
+        # tasks: {isim: coroutine}. En fazla limit sorgu aynı anda açık kalır;
+        # hata olursa tüm işler bittikten sonra ilk hata yükseltilir.
+        semaphore = asyncio.Semaphore(limit or self.max_concurrency)
+
+        async def bounded(coro):
+            async with semaphore:
+                return await coro
+
+        async def gather():
+            results = await asyncio.gather(*(bounded(c) for c in tasks.values()), return_exceptions=True)
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+            return dict(zip(tasks, results))
+
+        return self.run(gather())
+
+    def close(self):
+        self.run(self.driver.close())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+# --- Async data-access functions (sync karşılıkları neo4j_processes'te) ---
+
+async def graph_statistics(runner):
+    rows = await runner.read(GRAPH_STATISTICS_QUERY)
+    return rows[0]
+
+
+async def top_connected(runner, limit=10):
+    return await runner.read(TOP_CONNECTED_QUERY, limit=limit)
+
+
+async def movie_titles(runner):
+    return [row["title"] for row in await runner.read(MOVIE_TITLES_QUERY)]
+
+
+async def label_distribution(runner):
+    return await runner.read(LABEL_DISTRIBUTION_QUERY)
+
+
+async def relationship_distribution(runner):
+    return await runner.read(RELATIONSHIP_DISTRIBUTION_QUERY)
+
+
+async def degree_distribution(runner, bucketing="log", group_by="label", width=10):
+    log = bucketing == "log"
+    rows = await runner.read(DEGREE_GROUPINGS[group_by] + DEGREE_BUCKETS, log=log, width=width)
+    return _degree_bucket_bounds(rows, log, width)
+
+
+async def sample_subgraph(runner, labels=None, max_nodes=100, max_edges=500,
+                          strategy="Top degree", communities=5):
+    total = 0
+    if strategy == "Random":
+        total = (await runner.read(_sample_count_query(labels)))[0]["total"]
+    params = _sample_params(labels, max_nodes, communities, total)
+    nodes = await runner.read(_SAMPLE_NODE_QUERIES[strategy] + _SAMPLE_PROJECTION, **params)
+    if strategy == "Random":
+        nodes = _thin_sample(nodes, max_nodes)
+    if not nodes and strategy == "By community":
+        nodes = await runner.read(_SAMPLE_NODE_QUERIES["Top degree"] + _SAMPLE_PROJECTION, **params)
+    edges = await runner.read(SAMPLE_EDGES_QUERY, ids=[n["id"] for n in nodes], max_edges=max_edges)
+    return {"nodes": nodes, "edges": edges}
+
+
+async def search_nodes(runner, term, labels=None, page=0, page_size=10):
+    term = term.strip()
+    if not term:
+        return []
+    params = {"labels": labels or None, "skip": page * page_size, "limit": page_size}
+    try:
+        return await runner.read(SEARCH_FULLTEXT_QUERY, query=_fulltext_query(term), **params)
+    except ClientError as e:
+        if not _fulltext_unavailable(e):
+            raise
+        return await runner.read(SEARCH_SCAN_QUERY, term=term, **params)
+
+
+_runner = {"value": None}
+_runner_lock = threading.Lock()
+
+def get_async_runner():
+    with _runner_lock:
+        if _runner["value"] is None:
+            _runner["value"] = AsyncQueryRunner()
+        return _runner["value"]
@@ -0,0 +1,907 @@
+import bisect
+import heapq
+import json
+import os
+import random
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import Counter
+
+import pandas as pd
+
+import async_queries as aq
+from connection import get_connection_manager, open_session
+from graph_snapshot import GraphSnapshot, get_snapshot
+from neo4j_processes import (
+    EXPORT_CHUNK_SIZE, LEADERBOARDS, REL_TYPE_PATTERN, SCHEMA_CONSTRAINTS, _merge_expansion,
+    add_movie_people, add_movie_person, add_movie_with_genres, add_movies_with_genres, add_user,
+    bump_graph_version, delete_all, delete_movie, delete_person, delete_person_relationship,
+    delete_user, delete_user_relationship, driver as default_driver, expand_ego_network, export_graph,
+    get_degree_distribution, get_ego_network, get_graph_statistics, get_graph_version, get_leaderboard,
+    get_movie_titles, get_node_label_distribution, get_relationship_distribution, get_top_connected,
+    link_movieperson_to_movie, link_people_to_movies, rate_movie, rate_movies, run_write, sample_subgraph,
+    search_nodes, terminate_job_transactions, write_export,
+)
+from rating_cache import RATING_COLUMNS, get_ratings
+
+# Uygulamanın okuma/yazma yolları bu arayüzden geçer. Neo4jBackend mevcut
+# sorgu fonksiyonlarına delege eder; MemoryBackend aynı işlemleri süreç
+# içinde, anahtar property'ler üzerinde dict indeksleri ve arama için
+# sıralı token dizisi ile yapar (Neo4j sunucusu gerekmez, kalıcı değildir).
+# Seçim GRAPH_BACKEND ortam değişkeniyle: "neo4j" (varsayılan) ya da "memory".
+
+GRAPH_BACKEND = os.environ.get("GRAPH_BACKEND", "neo4j")
+# memory: generate_graph.py --output ile yazılmış JSON; yoksa MEMORY_GRAPH_MOVIES
+# filmlik sentetik graf üretilir (0 ise boş başlar)
+MEMORY_GRAPH_FILE = os.environ.get("MEMORY_GRAPH_FILE") or None
+MEMORY_GRAPH_MOVIES = int(os.environ.get("MEMORY_GRAPH_MOVIES", 0))
+
+# Label -> MERGE anahtarı (Neo4j'deki unique constraint'ler)
+KEY_PROPERTIES = {label: prop for _, label, prop in SCHEMA_CONSTRAINTS}
+PERSON_REL_TYPES = ("ACTED_IN", "DIRECTED", "PRODUCED")
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+class GraphBackend(ABC):
+    # Eksik metodu olan backend oluşturulurken hata verir (sayfa ortasında değil)
+
+    name = None
+    # Ham Cypher sekmeleri ve GDS algoritmaları yalnızca Neo4j'de
+    supports_cypher = False
+    supports_gds = False
+
+    # --- Writes ---
+
+    @abstractmethod
+    def add_user(self, username):
+        ...
+
+    @abstractmethod
+    def add_person(self, name, age, gender, roles):
+        ...
+
+    @abstractmethod
+    def add_movie(self, title, year, genres):
+        ...
+
+    @abstractmethod
+    def link(self, person_name, movie_title, roles):
+        ...
+
+    @abstractmethod
+    def rate(self, username, movie_title, score):
+        ...
+
+    @abstractmethod
+    def add_people(self, people):
+        ...
+
+    @abstractmethod
+    def add_movies(self, movies):
+        ...
+
+    @abstractmethod
+    def link_people(self, links):
+        ...
+
+    @abstractmethod
+    def rate_movies(self, ratings):
+        ...
+
+    def load_graph(self, graph):
+        # generate_graph.generate_movie_graph çıktısı (ya da aynı şekilde JSON)
+        return {
+            "people": self.add_people(graph["people"]),
+            "movies": self.add_movies(graph["movies"]),
+            "links": self.link_people(graph["links"]),
+            "ratings": self.rate_movies(graph["ratings"]),
+        }
+
+    @abstractmethod
+    def delete_user(self, username):
+        ...
+
+    @abstractmethod
+    def delete_person(self, name):
+        ...
+
+    @abstractmethod
+    def delete_movie(self, title):
+        ...
+
+    @abstractmethod
+    def delete_rating(self, username, movie_title):
+        ...
+
+    @abstractmethod
+    def delete_link(self, person_name, movie_title, rel_type):
+        ...
+
+    @abstractmethod
+    def delete_all(self):
+        ...
+
+    # --- Reads ---
+
+    @abstractmethod
+    def healthy(self):
+        ...
+
+    @abstractmethod
+    def info(self):
+        ...
+
+    @abstractmethod
+    def statistics(self):
+        ...
+
+    @abstractmethod
+    def top_connected(self, limit=10):
+        ...
+
+    @abstractmethod
+    def label_distribution(self):
+        ...
+
+    @abstractmethod
+    def relationship_distribution(self):
+        ...
+
+    @abstractmethod
+    def degree_distribution(self, bucketing="log", group_by="label", width=10):
+        ...
+
+    @abstractmethod
+    def search_nodes(self, term, labels=None, page=0, page_size=10):
+        ...
+
+    @abstractmethod
+    def sample_subgraph(self, labels=None, max_nodes=100, max_edges=500,
+                        strategy="Top degree", communities=5):
+        ...
+
+    @abstractmethod
+    def ego_network(self, node_id, hops=1, fanout=25):
+        ...
+
+    @abstractmethod
+    def expand_ego_network(self, graph, node_id, fanout=25):
+        ...
+
+    @abstractmethod
+    def leaderboard(self, name, limit=10, **filters):
+        ...
+
+    @abstractmethod
+    def ratings(self):
+        ...
+
+    @abstractmethod
+    def movie_titles(self):
+        # Snapshot kurmadan film adları (sıralı)
+        ...
+
+    @abstractmethod
+    def snapshot(self):
+        ...
+
+    @abstractmethod
+    def export(self, fmt="CSV", path=None):
+        ...
+
+    # --- Jobs ---
+
+    @abstractmethod
+    def cancel_job(self, job_id):
+        # İptal edilen arka plan işinin backend tarafındaki işini durdurur
+        ...
+
+    def read_many(self, calls):
+        # calls: {isim: (metot adı, args)}. Varsayılan sıralı; süreç içi
+        # backend'de her çağrı zaten mikro saniyeler sürer
+        return {key: getattr(self, method)(*args) for key, (method, args) in calls.items()}
+
+
+########## NEO4J ##########
+
+class Neo4jBackend(GraphBackend):
+
+    name = "neo4j"
+    supports_cypher = True
+    supports_gds = True
+
+    # read_many'de async driver ile eşzamanlı çalışan okumalar
+    ASYNC_READS = {
+        "top_connected": aq.top_connected,
+        "sample_subgraph": aq.sample_subgraph,
+        "search_nodes": aq.search_nodes,
+        "label_distribution": aq.label_distribution,
+        "relationship_distribution": aq.relationship_distribution,
+        "degree_distribution": aq.degree_distribution,
+        "movie_titles": aq.movie_titles,
+    }
+
+    def __init__(self, driver=None):
+        self.driver = driver or default_driver
+
+    def _write(self, tx_fn, *args):
+        # Graf versiyonu commit'ten sonra artar (run_write)
+        return run_write(self.driver, tx_fn, *args)
+
+    def _read(self, tx_fn, *args):
+        with open_session(self.driver) as session:
+            return session.execute_read(tx_fn, *args)
+
+    def add_user(self, username):
+        self._write(add_user, username)
+
+    def add_person(self, name, age, gender, roles):
+        self._write(add_movie_person, name, age, gender, roles)
+
+    def add_movie(self, title, year, genres):
+        self._write(add_movie_with_genres, title, year, genres)
+
+    def link(self, person_name, movie_title, roles):
+        self._write(link_movieperson_to_movie, person_name, movie_title, roles)
+
+    def rate(self, username, movie_title, score):
+        self._write(rate_movie, username, movie_title, score)
+
+    def add_people(self, people):
+        return add_movie_people(self.driver, people)
+
+    def add_movies(self, movies):
+        return add_movies_with_genres(self.driver, movies)
+
+    def link_people(self, links):
+        return link_people_to_movies(self.driver, links)
+
+    def rate_movies(self, ratings):
+        return rate_movies(self.driver, ratings)
+
+    def delete_user(self, username):
+        self._write(delete_user, username)
+
+    def delete_person(self, name):
+        self._write(delete_person, name)
+
+    def delete_movie(self, title):
+        self._write(delete_movie, title)
+
+    def delete_rating(self, username, movie_title):
+        return self._write(delete_user_relationship, username, movie_title)
+
+    def delete_link(self, person_name, movie_title, rel_type):
+        return self._write(delete_person_relationship, person_name, movie_title, rel_type)
+
+    def delete_all(self):
+        self._write(delete_all)
+
+    def healthy(self):
+        return get_connection_manager().healthy()
+
+    def info(self):
+        manager = get_connection_manager()
+        health = manager.health()
+        return {
+            "backend": self.name,
+            "uri": manager.uri,
+            "database": manager.database or "default",
+            "server": health["server"],
+            "latency_ms": health["latency_ms"],
+            "checked": f"{round(time.time() - health['checked_at'])}s ago",
+            **manager.pool_stats(),
+        }
+
+    def statistics(self):
+        return self._read(get_graph_statistics)
+
+    def top_connected(self, limit=10):
+        return self._read(get_top_connected, limit)
+
+    def label_distribution(self):
+        return get_node_label_distribution(self.driver)
+
+    def relationship_distribution(self):
+        return get_relationship_distribution(self.driver)
+
+    def degree_distribution(self, bucketing="log", group_by="label", width=10):
+        return get_degree_distribution(bucketing, group_by, width, self.driver)
+
+    def search_nodes(self, term, labels=None, page=0, page_size=10):
+        return search_nodes(self.driver, term, labels, page, page_size)
+
+    def sample_subgraph(self, labels=None, max_nodes=100, max_edges=500,
+                        strategy="Top degree", communities=5):
+        return self._read(sample_subgraph, labels, max_nodes, max_edges, strategy, communities)
+
+    def ego_network(self, node_id, hops=1, fanout=25):
+        return get_ego_network(self.driver, node_id, hops, fanout)
+
+    def expand_ego_network(self, graph, node_id, fanout=25):
+        return expand_ego_network(self.driver, graph, node_id, fanout)
+
+    def leaderboard(self, name, limit=10, **filters):
+        return get_leaderboard(self.driver, name, limit, **filters)
+
+    def ratings(self):
+        return get_ratings(self.driver)
+
+    def movie_titles(self):
+        return self._read(get_movie_titles)
+
+    def snapshot(self):
+        return get_snapshot(self.driver)
+
+    def export(self, fmt="CSV", path=None):
+        return export_graph(self.driver, path, fmt)
+
+    def cancel_job(self, job_id):
+        # İşin transaction'ları sunucuda sonlandırılır
+        terminate_job_transactions(job_id, self.driver)
+
+    def read_many(self, calls):
+        # Bağımsız okumalar async driver üzerinde aynı anda
+        runner = aq.get_async_runner()
+        return runner.run_concurrently({
+            key: self.ASYNC_READS[method](runner, *args) for key, (method, args) in calls.items()
+        })
+
+
+########## IN-MEMORY ##########
+
+def _tokens(text):
+    return set(TOKEN_PATTERN.findall(str(text).lower())) if text is not None else set()
+
+
+class MemoryBackend(GraphBackend):
+
+    name = "memory"
+
+    def __init__(self, source=None):
+        self.source = source
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        # id -> {"label", "props"}; id'ler dışarıya string olarak verilir (elementId gibi)
+        self._nodes = {}
+        self._next_id = 0
+        # label -> {anahtar değeri: id}
+        self._keys = {label: {} for label in KEY_PROPERTIES}
+        # id -> {(tip, komşu id): ilişki property'leri}; aynı dict iki yönde paylaşılır
+        self._out = {}
+        self._in = {}
+        self._type_counts = Counter()
+        self._score_sum = 0.0
+        # Arama: (token, id) sıralı dizisi; eklemeler toplanır, ilk aramada birleştirilir
+        self._search_tokens = []
+        self._pending_tokens = []
+        self._snapshot = None
+
+    @classmethod
+    def from_graph(cls, graph, source="generator"):
+        backend = cls(source)
+        backend.load_graph(graph)
+        return backend
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, encoding="utf-8") as f:
+            return cls.from_graph(json.load(f), source=path)
+
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        # Snapshot yalnızca label, anahtar ve ilişki tipini taşır; diğer property'ler boş
+        backend = cls("snapshot")
+        with backend._lock:
+            # Anahtarı olmayan ya da bilinmeyen label'lı düğümler atlanır
+            ids = [backend._merge_node(snapshot.label(i), snapshot.name(i))
+                   if snapshot.label(i) in KEY_PROPERTIES and snapshot.name(i) is not None else None
+                   for i in range(snapshot.n_nodes)]
+            for i in range(snapshot.n_nodes):
+                start, end = snapshot.indptr[i], snapshot.indptr[i + 1]
+                for j, code in zip(snapshot.indices[start:end], snapshot.rel_type_codes[start:end]):
+                    if ids[i] is not None and ids[j] is not None:
+                        backend._merge_rel(ids[i], snapshot.rel_types[code], ids[j])
+        bump_graph_version()
+        return backend
+
+    # --- Internals ---
+
+    def _node_id(self, label, key):
+        return self._keys[label].get(key)
+
+    def _merge_node(self, label, key):
+        node_id = self._keys[label].get(key)
+        if node_id is None:
+            node_id = self._next_id
+            self._next_id += 1
+            self._nodes[node_id] = {"label": label, "props": {KEY_PROPERTIES[label]: key}}
+            self._keys[label][key] = node_id
+            self._out[node_id] = {}
+            self._in[node_id] = {}
+            self._pending_tokens.extend((token, node_id) for token in _tokens(key))
+        return node_id
+
+    def _merge_rel(self, source, rel_type, target):
+        props = self._out[source].get((rel_type, target))
+        if props is None:
+            props = self._out[source][(rel_type, target)] = {}
+            self._in[target][(rel_type, source)] = props
+            self._type_counts[rel_type] += 1
+        return props
+
+    def _delete_rel(self, source, rel_type, target):
+        props = self._out[source].pop((rel_type, target), None)
+        if props is None:
+            return None
+        del self._in[target][(rel_type, source)]
+        self._type_counts[rel_type] -= 1
+        if rel_type == "RATED":
+            self._score_sum -= props.get("score") or 0.0
+        return props
+
+    def _search_index(self):
+        if self._pending_tokens:
+            self._search_tokens = list(heapq.merge(self._search_tokens, sorted(self._pending_tokens)))
+            self._pending_tokens = []
+        return self._search_tokens
+
+    def _delete_node(self, node_id):
+        node = self._nodes.pop(node_id, None)
+        if node is None:
+            return False
+        for rel_type, target in list(self._out[node_id]):
+            self._delete_rel(node_id, rel_type, target)
+        for rel_type, source in list(self._in[node_id]):
+            self._delete_rel(source, rel_type, node_id)
+        del self._out[node_id], self._in[node_id]
+        key = node["props"][KEY_PROPERTIES[node["label"]]]
+        del self._keys[node["label"]][key]
+        index = self._search_index()
+        for token in _tokens(key):
+            pos = bisect.bisect_left(index, (token, node_id))
+            if pos < len(index) and index[pos] == (token, node_id):
+                del index[pos]
+        return True
+
+    def _caption(self, node_id):
+        props = self._nodes[node_id]["props"]
+        return props.get("name") or props.get("title") or props.get("username")
+
+    def _projection(self, node_id):
+        # _SAMPLE_PROJECTION ile aynı şekil
+        node = self._nodes[node_id]
+        return {"id": str(node_id), "labels": [node["label"]],
+                "caption": self._caption(node_id), "props": dict(node["props"])}
+
+    def _degree(self, node_id):
+        return len(self._out[node_id]) + len(self._in[node_id])
+
+    def _in_genre(self, movie_id, genre):
+        genre_id = self._node_id("Genre", genre)
+        return genre_id is not None and ("IN_GENRE", genre_id) in self._out[movie_id]
+
+    def _rows_stats(self, rows, start):
+        seconds = time.perf_counter() - start
+        return {"rows": rows, "batches": 1, "seconds": round(seconds, 3),
+                "rows_per_sec": round(rows / seconds, 1) if seconds > 0 else None}
+
+    # --- Writes (Neo4j'deki MERGE/MATCH anlamlarıyla) ---
+
+    def add_user(self, username):
+        with self._lock:
+            self._merge_node("User", username)
+        bump_graph_version("User")
+
+    def _set_person(self, name, age, gender, roles):
+        props = self._nodes[self._merge_node("Person", name)]["props"]
+        props.update(age=age, gender=gender, roles=list(roles))
+
+    def _set_movie(self, title, year, genres):
+        movie_id = self._merge_node("Movie", title)
+        self._nodes[movie_id]["props"].update(year=year, genres=list(genres))
+        for genre in genres:
+            self._merge_rel(movie_id, "IN_GENRE", self._merge_node("Genre", genre))
+
+    def _link(self, person_name, movie_title, role):
+        # MATCH: kişi ya da film yoksa ilişki kurulmaz
+        person_id = self._node_id("Person", person_name)
+        movie_id = self._node_id("Movie", movie_title)
+        if person_id is not None and movie_id is not None:
+            self._merge_rel(person_id, role, movie_id)
+
+    def _rate(self, username, movie_title, score):
+        props = self._merge_rel(self._merge_node("User", username), "RATED", self._merge_node("Movie", movie_title))
+        self._score_sum += score - (props.get("score") or 0.0)
+        props.update(score=score, updated_at=int(time.time() * 1000))
+
+    def add_person(self, name, age, gender, roles):
+        with self._lock:
+            self._set_person(name, age, gender, roles)
+        bump_graph_version("Person")
+
+    def add_movie(self, title, year, genres):
+        with self._lock:
+            self._set_movie(title, year, genres)
+        bump_graph_version("Movie", "Genre", "IN_GENRE")
+
+    def link(self, person_name, movie_title, roles):
+        with self._lock:
+            for role in roles:
+                self._link(person_name, movie_title, role)
+        bump_graph_version(*roles)
+
+    def rate(self, username, movie_title, score):
+        with self._lock:
+            self._rate(username, movie_title, score)
+        bump_graph_version("User", "Movie", "RATED")
+
+    def add_people(self, people):
+        start = time.perf_counter()
+        with self._lock:
+            for p in people:
+                self._set_person(p["name"], p.get("age"), p.get("gender"), p.get("roles", []))
+        bump_graph_version("Person")
+        return self._rows_stats(len(people), start)
+
+    def add_movies(self, movies):
+        start = time.perf_counter()
+        with self._lock:
+            for m in movies:
+                self._set_movie(m["title"], m.get("year"), m.get("genres", []))
+        bump_graph_version("Movie", "Genre", "IN_GENRE")
+        return self._rows_stats(len(movies), start)
+
+    def link_people(self, links):
+        start = time.perf_counter()
+        rows, roles = 0, set()
+        with self._lock:
+            for link in links:
+                for role in link["roles"]:
+                    if not REL_TYPE_PATTERN.fullmatch(role):
+                        raise ValueError(f"Invalid relationship type: {role!r}")
+                    self._link(link["person_name"], link["movie_title"], role)
+                    roles.add(role)
+                    rows += 1
+        bump_graph_version(*roles)
+        return self._rows_stats(rows, start)
+
+    def rate_movies(self, ratings):
+        start = time.perf_counter()
+        with self._lock:
+            for r in ratings:
+                self._rate(r["username"], r["movie_title"], r["score"])
+        bump_graph_version("User", "Movie", "RATED")
+        return self._rows_stats(len(ratings), start)
+
+    def delete_user(self, username):
+        with self._lock:
+            self._delete_node(self._node_id("User", username))
+        bump_graph_version("User", "RATED")
+
+    def delete_person(self, name):
+        with self._lock:
+            self._delete_node(self._node_id("Person", name))
+        bump_graph_version("Person", "ACTED_IN", "DIRECTED", "PRODUCED")
+
+    def delete_movie(self, title):
+        with self._lock:
+            self._delete_node(self._node_id("Movie", title))
+        bump_graph_version("Movie", "ACTED_IN", "DIRECTED", "PRODUCED", "IN_GENRE", "RATED")
+
+    def delete_rating(self, username, movie_title):
+        with self._lock:
+            user_id = self._node_id("User", username)
+            movie_id = self._node_id("Movie", movie_title)
+            props = None
+            if user_id is not None and movie_id is not None:
+                props = self._delete_rel(user_id, "RATED", movie_id)
+        bump_graph_version("RATED")
+        if props is None:
+            return {"status": "not_found", "score": None}
+        return {"status": "deleted", "score": props.get("score")}
+
+    def delete_link(self, person_name, movie_title, rel_type):
+        with self._lock:
+            person_id = self._node_id("Person", person_name)
+            movie_id = self._node_id("Movie", movie_title)
+            props = None
+            if person_id is not None and movie_id is not None:
+                props = self._delete_rel(person_id, rel_type, movie_id)
+        bump_graph_version(rel_type)
+        return {"status": "deleted" if props is not None else "not_found"}
+
+    def delete_all(self):
+        with self._lock:
+            self._reset()
+        bump_graph_version()
+
+    # --- Reads ---
+
+    def healthy(self):
+        return True
+
+    def info(self):
+        with self._lock:
+            return {
+                "backend": self.name,
+                "source": self.source,
+                "nodes": len(self._nodes),
+                "relationships": sum(self._type_counts.values()),
+            }
+
+    def statistics(self):
+        with self._lock:
+            rated = self._type_counts["RATED"]
+            return {
+                "movies": len(self._keys["Movie"]),
+                "persons": len(self._keys["Person"]),
+                "users": len(self._keys["User"]),
+                "genres": len(self._keys["Genre"]),
+                "total_relationships": sum(self._type_counts.values()),
+                "avg_rating": self._score_sum / rated if rated else None,
+            }
+
+    def top_connected(self, limit=10):
+        # TOP_CONNECTED_QUERY ile aynı: çıkan ilişki sayısı, isim yoksa "Unnamed Node"
+        with self._lock:
+            top = heapq.nlargest(limit, ((len(rels), node_id) for node_id, rels in self._out.items() if rels))
+            return [{"node": self._nodes[i]["props"].get("name") or self._nodes[i]["props"].get("title") or "Unnamed Node",
+                     "relation_count": count} for count, i in top]
+
+    def label_distribution(self):
+        with self._lock:
+            rows = [{"label": label, "count": len(keys)} for label, keys in self._keys.items() if keys]
+        return sorted(rows, key=lambda r: r["count"], reverse=True)
+
+    def relationship_distribution(self):
+        with self._lock:
+            rows = [{"relationship_type": t, "count": c} for t, c in self._type_counts.items() if c]
+        return sorted(rows, key=lambda r: r["count"], reverse=True)
+
+    def degree_distribution(self, bucketing="log", group_by="label", width=10):
+        # DEGREE_GROUPINGS + DEGREE_BUCKETS karşılığı; satır şekli aynı
+        log = bucketing == "log"
+        counts = Counter()
+        with self._lock:
+            for node_id, node in self._nodes.items():
+                if group_by == "rel_type":
+                    degrees = Counter(t for t, _ in self._out[node_id])
+                    degrees.update(t for t, _ in self._in[node_id])
+                    groups = degrees.items()
+                else:
+                    groups = [(node["label"] if group_by == "label" else "All", self._degree(node_id))]
+                for group, degree in groups:
+                    bucket = (degree + 1).bit_length() - 1 if log else degree // width
+                    counts[(group, bucket)] += 1
+        rows = []
+        for (group, bucket), nodes in sorted(counts.items()):
+            rows.append({"group": group, "bucket": bucket, "nodes": nodes,
+                         "bucket_start": 2 ** bucket - 1 if log else bucket * width,
+                         "bucket_end": 2 ** (bucket + 1) - 2 if log else (bucket + 1) * width - 1})
+        return rows
+
+    def search_nodes(self, term, labels=None, page=0, page_size=10):
+        # Fulltext sorgusuyla aynı anlam: her kelime bir token'ın prefix'i olmalı
+        terms = TOKEN_PATTERN.findall(term.lower())
+        if not terms:
+            return []
+        with self._lock:
+            index = self._search_index()
+            matches = None
+            for prefix in terms:
+                ids = set()
+                pos = bisect.bisect_left(index, (prefix,))
+                while pos < len(index) and index[pos][0].startswith(prefix):
+                    ids.add(index[pos][1])
+                    pos += 1
+                matches = ids if matches is None else matches & ids
+                if not matches:
+                    return []
+            if labels:
+                matches = [i for i in matches if self._nodes[i]["label"] in labels]
+            # Kısa ve birebir eşleşen isimler önce (Lucene skoruna yakın)
+            scored = sorted(((len(" ".join(terms)) / max(len(self._caption(i)), 1), i) for i in matches),
+                            key=lambda s: (-s[0], self._caption(s[1])))
+            page_rows = scored[page * page_size:(page + 1) * page_size]
+            return [{"id": str(i), "labels": [self._nodes[i]["label"]], "n": dict(self._nodes[i]["props"]),
+                     "score": round(score, 4)} for score, i in page_rows]
+
+    def sample_subgraph(self, labels=None, max_nodes=100, max_edges=500,
+                        strategy="Top degree", communities=5):
+        # Louvain bu backend'de yok; "By community" Neo4j'deki gibi dereceye düşer
+        with self._lock:
+            candidates = [i for i, node in self._nodes.items() if not labels or node["label"] in labels]
+            if strategy == "Random":
+                chosen = random.sample(candidates, min(max_nodes, len(candidates)))
+            else:
+                chosen = heapq.nlargest(max_nodes, candidates, key=self._degree)
+            chosen_set = set(chosen)
+            edges = []
+            for i in chosen:
+                for rel_type, j in self._out[i]:
+                    if j in chosen_set:
+                        edges.append({"source": str(i), "target": str(j), "rel_type": rel_type})
+                if len(edges) >= max_edges:
+                    break
+            return {"nodes": [self._projection(i) for i in chosen], "edges": edges[:max_edges]}
+
+    def _expand_rows(self, node_ids, known_ids, fanout):
+        # expand_nodes ile aynı satırlar: yeni komşular fanout ile sınırlı, bilinenler sınırsız
+        known = {int(i) for i in known_ids}
+        rows = []
+        for node_id in map(int, node_ids):
+            if node_id not in self._nodes:
+                continue
+            new = 0
+            rels = [(t, node_id, j) for t, j in self._out[node_id]] + [(t, j, node_id) for t, j in self._in[node_id]]
+            for rel_type, source, target in rels:
+                other = target if source == node_id else source
+                if other not in known:
+                    if new >= fanout:
+                        continue
+                    new += 1
+                rows.append({"source": str(source), "target": str(target), "rel_type": rel_type,
+                             **self._projection(other)})
+        return rows
+
+    def ego_network(self, node_id, hops=1, fanout=25):
+        graph = {"nodes": {}, "edges": {}, "expanded": set()}
+        with self._lock:
+            if int(node_id) not in self._nodes:
+                return graph
+            graph["nodes"][node_id] = self._projection(int(node_id))
+            frontier = [node_id]
+            for _ in range(hops):
+                if not frontier:
+                    break
+                rows = self._expand_rows(frontier, graph["nodes"].keys(), fanout)
+                graph["expanded"].update(frontier)
+                frontier = _merge_expansion(graph, rows)
+        return graph
+
+    def expand_ego_network(self, graph, node_id, fanout=25):
+        if node_id in graph["expanded"]:
+            return []
+        with self._lock:
+            rows = self._expand_rows([node_id], graph["nodes"].keys(), fanout)
+        graph["expanded"].add(node_id)
+        return _merge_expansion(graph, rows)
+
+    # --- Leaderboards (LEADERBOARDS sorgularının karşılıkları) ---
+
+    def _most_acted(self, limit=10, genre=None):
+        rows = []
+        for name, person_id in self._keys["Person"].items():
+            count = sum(1 for t, m in self._out[person_id]
+                        if t == "ACTED_IN" and (genre is None or self._in_genre(m, genre)))
+            if count:
+                rows.append({"Actor": name, "MovieCount": count})
+        return sorted(rows, key=lambda r: -r["MovieCount"])[:limit]
+
+    def _movies_per_genre(self, limit=10, min_year=None):
+        rows = []
+        for name, genre_id in self._keys["Genre"].items():
+            count = sum(1 for t, m in self._in[genre_id]
+                        if t == "IN_GENRE" and (min_year is None or (self._nodes[m]["props"].get("year") or 0) >= min_year))
+            if count:
+                rows.append({"Genre": name, "Count": count})
+        return sorted(rows, key=lambda r: -r["Count"])[:limit]
+
+    def _highest_rated(self, limit=10, min_ratings=1, genre=None):
+        rows = []
+        for title, movie_id in self._keys["Movie"].items():
+            if genre is not None and not self._in_genre(movie_id, genre):
+                continue
+            scores = [props["score"] for (t, _), props in self._in[movie_id].items() if t == "RATED"]
+            if scores and len(scores) >= min_ratings:
+                rows.append({"Movie": title, "AvgRating": sum(scores) / len(scores), "RatingCount": len(scores)})
+        return sorted(rows, key=lambda r: -r["AvgRating"])[:limit]
+
+    def _most_related(self, limit=10, genre=None):
+        rows = []
+        for title, movie_id in self._keys["Movie"].items():
+            if genre is not None and not self._in_genre(movie_id, genre):
+                continue
+            count = sum(1 for t, p in self._in[movie_id] if self._nodes[p]["label"] == "Person")
+            if count:
+                rows.append({"Movie": title, "TotalLinks": count})
+        return sorted(rows, key=lambda r: -r["TotalLinks"])[:limit]
+
+    def _acted_together(self, limit=10):
+        pairs = Counter()
+        for movie_id in self._keys["Movie"].values():
+            actors = sorted(p for t, p in self._in[movie_id] if t == "ACTED_IN")
+            for a in range(len(actors)):
+                for b in range(a + 1, len(actors)):
+                    pairs[(actors[a], actors[b])] += 1
+        return [{"Actor1": self._caption(p1), "Actor2": self._caption(p2), "SharedMovies": count}
+                for (p1, p2), count in pairs.most_common(limit)]
+
+    LEADERBOARD_METHODS = {
+        "Most active actors": "_most_acted",
+        "Movies per genre": "_movies_per_genre",
+        "Highest rated movies": "_highest_rated",
+        "Most connected movies": "_most_related",
+        "Actors acting together": "_acted_together",
+    }
+
+    def leaderboard(self, name, limit=10, **filters):
+        if name not in LEADERBOARDS:
+            raise KeyError(name)
+        with self._lock:
+            rows = getattr(self, self.LEADERBOARD_METHODS[name])(limit, **filters)
+        return pd.DataFrame(rows)
+
+    # --- Bulk reads ---
+
+    def ratings(self):
+        with self._lock:
+            rows = [(self._caption(u), self._caption(m), props["score"])
+                    for u in self._keys["User"].values()
+                    for (t, m), props in self._out[u].items() if t == "RATED"]
+        return pd.DataFrame(rows, columns=RATING_COLUMNS)
+
+    def movie_titles(self):
+        with self._lock:
+            return sorted(title for title in self._keys["Movie"] if title is not None)
+
+    def snapshot(self):
+        # Graf versiyonu değişmedikçe aynı snapshot; centrality/similarity girdisi
+        version = get_graph_version()
+        with self._lock:
+            if self._snapshot is not None and self._snapshot.version == version:
+                return self._snapshot
+            ids = sorted(self._nodes)
+            position = {node_id: i for i, node_id in enumerate(ids)}
+            sources, targets, types = [], [], []
+            for node_id in ids:
+                for rel_type, target in self._out[node_id]:
+                    sources.append(position[node_id])
+                    targets.append(position[target])
+                    types.append(rel_type)
+            self._snapshot = GraphSnapshot.from_edges(
+                [self._nodes[i]["label"] for i in ids], [self._caption(i) for i in ids],
+                sources, targets, types, version)
+            return self._snapshot
+
+    def iter_relationship_chunks(self, chunk_size=EXPORT_CHUNK_SIZE):
+        with self._lock:
+            rows = [[str(i), self._caption(i), rel_type, str(j), self._caption(j)]
+                    for i in sorted(self._out) for rel_type, j in self._out[i]]
+        for start in range(0, len(rows), chunk_size):
+            yield rows[start:start + chunk_size]
+
+    def export(self, fmt="CSV", path=None):
+        return write_export(self.iter_relationship_chunks(), path, fmt)
+
+    def cancel_job(self, job_id):
+        # Sunucu tarafında iş yok; iptal bayrağı yeterli
+        pass
+
+
+def create_backend(kind=GRAPH_BACKEND):
+    if kind == "neo4j":
+        return Neo4jBackend()
+    if kind == "memory":
+        if MEMORY_GRAPH_FILE:
+            return MemoryBackend.from_file(MEMORY_GRAPH_FILE)
+        if MEMORY_GRAPH_MOVIES:
+            from benchmarks.generate_graph import generate_movie_graph
+            return MemoryBackend.from_graph(generate_movie_graph(MEMORY_GRAPH_MOVIES))
+        return MemoryBackend()
+    raise ValueError(f"Unknown GRAPH_BACKEND: {kind!r} (expected 'neo4j' or 'memory')")
+
+
+_backend = {"value": None}
+_backend_lock = threading.Lock()
+
+def get_backend():
+    with _backend_lock:
+        if _backend["value"] is None:
+            _backend["value"] = create_backend()
+        return _backend["value"]
@@ -0,0 +1,63 @@
+"""Local centrality engine timings against graph size (no database needed).
+
+    python benchmarks/bench_centrality.py --sizes 1000 10000 100000 --samples 64
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from centrality import betweenness, degree_centrality, pagerank
+from graph_snapshot import GraphSnapshot
+
+
+def power_law_graph(n, avg_degree=8, exponent=2.1, seed=42):
+    # Hedefler Zipf dağılımına göre seçilir -> ağır kuyruklu derece dağılımı
+    rng = np.random.default_rng(seed)
+    m = n * avg_degree // 2
+    weights = 1.0 / np.arange(1, n + 1) ** (1.0 / (exponent - 1.0))
+    weights /= weights.sum()
+    sources = rng.integers(0, n, size=m)
+    targets = rng.choice(n, size=m, p=weights)
+    keep = sources != targets
+    labels = ["Movie"] * n
+    names = [f"node-{i}" for i in range(n)]
+    return GraphSnapshot.from_edges(labels, names, sources[keep], targets[keep], ["ACTED_IN"] * int(keep.sum()))
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    fn(*args, **kwargs)
+    return round(time.perf_counter() - start, 4)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--samples", type=int, default=64)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--exact-up-to", type=int, default=5000)
+    args = parser.parse_args()
+
+    for n in args.sizes:
+        snapshot = power_law_graph(n)
+        indptr, indices = snapshot.undirected()
+        row = {
+            "nodes": n,
+            "relationships": snapshot.n_relationships,
+            "degree_s": timed(degree_centrality, indptr),
+            "pagerank_s": timed(pagerank, indptr, indices),
+            "betweenness_sampled_s": timed(betweenness, indptr, indices, samples=args.samples, workers=args.workers),
+        }
+        if n <= args.exact_up_to:
+            row["betweenness_exact_s"] = timed(betweenness, indptr, indices, workers=args.workers)
+        print(json.dumps(row))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""MERGE latency vs. graph size, with and without a uniqueness constraint.
+
+Uses a separate :BenchPerson label so application data is not touched.
+
+    python benchmarks/bench_schema.py --sizes 1000 10000 50000 --lookups 200
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from connection import open_session
+from neo4j_processes import driver
+
+LABEL = "BenchPerson"
+CONSTRAINT = "bench_person_name_unique"
+
+
+def reset(session):
+    session.run(f"DROP CONSTRAINT {CONSTRAINT} IF EXISTS").consume()
+    while session.run(f"""
+        MATCH (n:{LABEL}) WITH n LIMIT 10000
+        DETACH DELETE n RETURN count(*) AS c
+    """).single()["c"]:
+        pass
+
+
+def grow_to(session, current, size):
+    for start in range(current, size, 10000):
+        names = [f"bench-{i}" for i in range(start, min(start + 10000, size))]
+        session.run(f"UNWIND $names AS name CREATE (:{LABEL} {{name: name}})", names=names).consume()
+
+
+def time_merges(session, size, lookups):
+    samples = []
+    for _ in range(lookups):
+        name = f"bench-{random.randrange(size)}"
+        start = time.perf_counter()
+        session.run(f"MERGE (n:{LABEL} {{name: $name}})", name=name).consume()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "p50_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(samples[int(len(samples) * 0.95) - 1], 3),
+        "mean_ms": round(statistics.fmean(samples), 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--lookups", type=int, default=200)
+    args = parser.parse_args()
+
+    results = []
+    with open_session(driver) as session:
+        reset(session)
+        current = 0
+        for size in sorted(args.sizes):
+            grow_to(session, current, size)
+            current = size
+
+            session.run(f"DROP CONSTRAINT {CONSTRAINT} IF EXISTS").consume()
+            without = time_merges(session, size, args.lookups)
+
+            session.run(
+                f"CREATE CONSTRAINT {CONSTRAINT} IF NOT EXISTS "
+                f"FOR (n:{LABEL}) REQUIRE n.name IS UNIQUE"
+            ).consume()
+            session.run("CALL db.awaitIndexes(300)").consume()
+            with_schema = time_merges(session, size, args.lookups)
+
+            row = {"nodes": size, "without_schema": without, "with_schema": with_schema}
+            results.append(row)
+            print(json.dumps(row))
+
+        reset(session)
+    driver.close()
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""Synthetic movie graph with the application's labels and relationship types.
+
+Person/Movie/Genre/User nodes; ACTED_IN, DIRECTED, PRODUCED, IN_GENRE and
+RATED relationships. Cast membership, genre choice and rating targets are
+drawn from Zipf-like popularity weights, and ratings per user follow a
+Pareto distribution, so every degree distribution has a heavy tail.
+
+    python benchmarks/generate_graph.py --movies 10000 --summary
+    python benchmarks/generate_graph.py --movies 10000 --ingest   # writes to NEO4J_URI
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from graph_snapshot import GraphSnapshot
+
+GENRES = ["Drama", "Comedy", "Action", "Thriller", "Romance", "Horror", "Sci-Fi", "Adventure",
+          "Crime", "Animation", "Documentary", "Fantasy", "Mystery", "Family", "War",
+          "History", "Music", "Western", "Biography", "Sport"]
+
+# Bir filmdeki kişi bağlantılarının tip dağılımı
+ROLE_WEIGHTS = {"ACTED_IN": 0.8, "DIRECTED": 0.1, "PRODUCED": 0.1}
+PERSON_ROLES = {"ACTED_IN": "Actor", "DIRECTED": "Director", "PRODUCED": "Producer"}
+
+
+def zipf_weights(n, exponent=2.1):
+    # P(rank k) ~ k^(-1/(exponent-1)) -> derece dağılımı ~ d^(-exponent)
+    weights = 1.0 / np.arange(1, n + 1) ** (1.0 / (exponent - 1.0))
+    return weights / weights.sum()
+
+
+def _unique_pairs(a, b):
+    pairs = np.unique(np.stack([a, b], axis=1), axis=0)
+    return pairs[:, 0], pairs[:, 1]
+
+
+def generate_movie_graph(movies=1000, people=None, users=None, genres=len(GENRES),
+                         cast_per_movie=8, genres_per_movie=2, ratings_per_user=20,
+                         exponent=2.1, seed=42):
+    rng = np.random.default_rng(seed)
+    people = people or movies * 3
+    users = users or movies
+    genre_names = (GENRES * (genres // len(GENRES) + 1))[:genres]
+    genre_names = [g if i < len(GENRES) else f"{g} {i // len(GENRES)}" for i, g in enumerate(genre_names)]
+
+    # Kişi -> film: her film Poisson(cast_per_movie) kişi, kişiler popülerliğe göre
+    cast_sizes = np.maximum(1, rng.poisson(cast_per_movie, movies))
+    cast_movie = np.repeat(np.arange(movies), cast_sizes)
+    cast_person = rng.choice(people, size=len(cast_movie), p=zipf_weights(people, exponent))
+    role_names = list(ROLE_WEIGHTS)
+    cast_role = rng.choice(len(role_names), size=len(cast_movie), p=list(ROLE_WEIGHTS.values()))
+    keep = np.unique(np.stack([cast_person, cast_movie, cast_role], axis=1), axis=0)
+    cast_person, cast_movie, cast_role = keep[:, 0], keep[:, 1], keep[:, 2]
+
+    # Film -> tür
+    genre_sizes = np.maximum(1, rng.poisson(genres_per_movie, movies))
+    genre_movie = np.repeat(np.arange(movies), genre_sizes)
+    genre_idx = rng.choice(genres, size=len(genre_movie), p=zipf_weights(genres, exponent + 1))
+    genre_movie, genre_idx = _unique_pairs(genre_movie, genre_idx)
+
+    # Kullanıcı -> film: Pareto sayıda puan, filmler popülerliğe göre
+    per_user = np.minimum(movies, np.maximum(1, (rng.pareto(1.5, users) + 1) * ratings_per_user / 3).astype(np.int64))
+    rating_user = np.repeat(np.arange(users), per_user)
+    rating_movie = rng.choice(movies, size=len(rating_user), p=zipf_weights(movies, exponent))
+    rating_user, rating_movie = _unique_pairs(rating_user, rating_movie)
+    quality = rng.normal(6.5, 1.5, movies)
+    leniency = rng.normal(0.0, 1.0, users)
+    scores = np.clip(np.rint(quality[rating_movie] + leniency[rating_user] + rng.normal(0, 1, len(rating_user))), 1, 10)
+
+    person_roles = [set() for _ in range(people)]
+    for p, r in zip(cast_person, cast_role):
+        person_roles[p].add(PERSON_ROLES[role_names[r]])
+    genders = rng.choice(["Male", "Female"], size=people)
+    ages = rng.integers(18, 90, size=people)
+    years = rng.integers(1950, 2026, size=movies)
+
+    movie_titles = [f"Movie {i}" for i in range(movies)]
+    person_names = [f"Person {i}" for i in range(people)]
+    usernames = [f"user{i}" for i in range(users)]
+
+    movie_genres = [[] for _ in range(movies)]
+    for m, g in zip(genre_movie, genre_idx):
+        movie_genres[m].append(genre_names[g])
+
+    links = {}
+    for p, m, r in zip(cast_person, cast_movie, cast_role):
+        links.setdefault((p, m), []).append(role_names[r])
+
+    return {
+        "people": [{"name": person_names[i], "age": int(ages[i]), "gender": str(genders[i]),
+                    "roles": sorted(person_roles[i])} for i in range(people)],
+        "movies": [{"title": movie_titles[i], "year": int(years[i]), "genres": movie_genres[i]}
+                   for i in range(movies)],
+        "links": [{"person_name": person_names[p], "movie_title": movie_titles[m], "roles": roles}
+                  for (p, m), roles in links.items()],
+        "ratings": [{"username": usernames[u], "movie_title": movie_titles[m], "score": int(s)}
+                    for u, m, s in zip(rating_user, rating_movie, scores)],
+        "users": usernames,
+        "genres": genre_names,
+    }
+
+
+def to_snapshot(graph):
+    # Veritabanı olmadan (snapshot üstündeki) analizler için
+    labels, names, index = [], [], {}
+
+    def add(label, name):
+        index[(label, name)] = len(labels)
+        labels.append(label)
+        names.append(name)
+
+    for p in graph["people"]:
+        add("Person", p["name"])
+    for m in graph["movies"]:
+        add("Movie", m["title"])
+    for g in graph["genres"]:
+        add("Genre", g)
+    for u in graph["users"]:
+        add("User", u)
+
+    sources, targets, types = [], [], []
+    for link in graph["links"]:
+        for role in link["roles"]:
+            sources.append(index[("Person", link["person_name"])])
+            targets.append(index[("Movie", link["movie_title"])])
+            types.append(role)
+    for m in graph["movies"]:
+        for g in m["genres"]:
+            sources.append(index[("Movie", m["title"])])
+            targets.append(index[("Genre", g)])
+            types.append("IN_GENRE")
+    for r in graph["ratings"]:
+        sources.append(index[("User", r["username"])])
+        targets.append(index[("Movie", r["movie_title"])])
+        types.append("RATED")
+
+    return GraphSnapshot.from_edges(labels, names, sources, targets, types)
+
+
+def ratings_frame(graph):
+    # getAllData ile aynı sütunlar
+    import pandas as pd
+    return pd.DataFrame({
+        "user": [r["username"] for r in graph["ratings"]],
+        "movie": [r["movie_title"] for r in graph["ratings"]],
+        "rating": [r["score"] for r in graph["ratings"]],
+    })
+
+
+def ingest(driver, graph, batch_size=None):
+    # Uygulamanın batch yazma yardımcılarıyla yükler; adım başına süre döner
+    from neo4j_processes import (BATCH_SIZE, add_movie_people, add_movies_with_genres,
+                                 link_people_to_movies, rate_movies)
+    batch_size = batch_size or BATCH_SIZE
+    return {
+        "people": add_movie_people(driver, graph["people"], batch_size),
+        "movies": add_movies_with_genres(driver, graph["movies"], batch_size),
+        "links": link_people_to_movies(driver, graph["links"], batch_size),
+        "ratings": rate_movies(driver, graph["ratings"], batch_size),
+    }
+
+
+def summary(graph):
+    snapshot = to_snapshot(graph)
+    degree = snapshot.degree()
+    return {
+        "nodes": snapshot.n_nodes,
+        "relationships": snapshot.n_relationships,
+        "by_type": snapshot.relationship_distribution(),
+        "max_degree": int(degree.max()) if len(degree) else 0,
+        "mean_degree": round(float(degree.mean()), 2) if len(degree) else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--movies", type=int, default=1000)
+    parser.add_argument("--people", type=int)
+    parser.add_argument("--users", type=int)
+    parser.add_argument("--ratings-per-user", type=int, default=20)
+    parser.add_argument("--exponent", type=float, default=2.1)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--summary", action="store_true", help="print node/relationship counts")
+    parser.add_argument("--ingest", action="store_true", help="write the graph to the configured database")
+    parser.add_argument("--output", help="write the generated rows as JSON")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    graph = generate_movie_graph(args.movies, args.people, args.users,
+                                 ratings_per_user=args.ratings_per_user,
+                                 exponent=args.exponent, seed=args.seed)
+    print(json.dumps({"generated_s": round(time.perf_counter() - start, 3)}))
+
+    if args.summary:
+        print(json.dumps(summary(graph)))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(graph, f)
+    if args.ingest:
+        from neo4j_processes import driver
+        print(json.dumps(ingest(driver, graph)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""Time every data path on synthetic graphs and write the results as JSON.
+
+Offline steps (no database): snapshot build, degree histogram, local
+centralities, movie similarity, graph rendering, the in-memory backend's
+read paths, model training and recommendations. With --database the
+generated graph is also ingested and the Neo4j-backed paths are timed;
+this requires an empty database and --allow-write.
+
+    python benchmarks/run_benchmarks.py --scales 1000 10000
+    python benchmarks/run_benchmarks.py --scales 1000 --database --allow-write --cleanup
+    python benchmarks/run_benchmarks.py --scales 1000 --compare benchmarks/results/baseline.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from generate_graph import generate_movie_graph, ratings_frame, to_snapshot, ingest
+
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+REGRESSION_RATIO = 1.2
+
+
+def timed(results, scale, step, fn, *args, **kwargs):
+    start = time.perf_counter()
+    row = {"scale": scale, "step": step}
+    try:
+        value = fn(*args, **kwargs)
+        row["ok"] = True
+    except Exception as e:
+        value = None
+        row.update(ok=False, error=f"{type(e).__name__}: {e}")
+    row["seconds"] = round(time.perf_counter() - start, 4)
+    results.append(row)
+    print(json.dumps(row))
+    return value
+
+
+def sample_graph_data(snapshot, max_nodes=100, max_edges=500):
+    # sample_subgraph("Top degree") ile aynı şekil: nodes (id, labels, caption, props), edges
+    degree = snapshot.degree()
+    top = np.argsort(-degree, kind="stable")[:max_nodes]
+    chosen = set(int(i) for i in top)
+    nodes = [{"id": str(i), "labels": [snapshot.label(i)], "caption": snapshot.name(i),
+              "props": {"name": snapshot.name(i)}} for i in top]
+    edges = []
+    for i in top:
+        for j in snapshot.neighbors(i, "out"):
+            if int(j) in chosen:
+                edges.append({"source": str(i), "target": str(j), "rel_type": "REL"})
+        if len(edges) >= max_edges:
+            break
+    return {"nodes": nodes, "edges": edges[:max_edges]}
+
+
+def render_network(graph_data):
+    from graph_view import draw_network
+    net = draw_network(graph_data)
+    return net.generate_html()
+
+
+def train_and_recommend(results, scale, ratings):
+    from neo4j_processes import encodeTrainTest, recommend_movies, recommend_movies_batch
+
+    # encodeTrainTest model sürümlerini ve results_df.json'u cwd'ye yazar
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            trained = timed(results, scale, "encodeTrainTest", encodeTrainTest, ratings.copy())
+        finally:
+            os.chdir(cwd)
+    if trained is None:
+        return
+    models, user_enc, movie_enc = trained
+    user = user_enc.classes_[0]
+    for name, model in models.items():
+        timed(results, scale, f"recommend_movies[{name}]", recommend_movies, user, model, ratings, user_enc, movie_enc)
+    timed(results, scale, "recommend_movies_batch[MatrixFactorization]", recommend_movies_batch,
+          models["MatrixFactorization"], ratings, user_enc, movie_enc)
+
+
+def memory_backend_benchmarks(results, scale, graph):
+    # GRAPH_BACKEND=memory ile UI'ın kullandığı okuma yolları
+    from backends import MemoryBackend
+
+    backend = timed(results, scale, "load[memory]", MemoryBackend.from_graph, graph)
+    if backend is None:
+        return
+    title = graph["movies"][0]["title"]
+    timed(results, scale, "show_statistics[memory]", backend.statistics)
+    timed(results, scale, "search_nodes[memory]", backend.search_nodes, title)
+    timed(results, scale, "sample_subgraph[memory]", backend.sample_subgraph)
+    timed(results, scale, "degree_distribution[memory]", backend.degree_distribution)
+    timed(results, scale, "leaderboard[memory,Highest rated movies]", backend.leaderboard, "Highest rated movies")
+    timed(results, scale, "ratings[memory]", backend.ratings)
+
+
+def offline_benchmarks(results, scale, graph, args):
+    from centrality import betweennessLocal, degreeCentralityLocal, pageRankLocal
+    from similarity import similar_movies, similarity_pairs
+
+    snapshot = timed(results, scale, "snapshot_build", to_snapshot, graph)
+    timed(results, scale, "degree_histogram[snapshot]", snapshot.degree_histogram)
+    timed(results, scale, "degree_centrality[local]", degreeCentralityLocal, snapshot)
+    timed(results, scale, "pagerank[local]", pageRankLocal, snapshot)
+    timed(results, scale, f"betweenness[local,samples={args.samples}]", betweennessLocal, snapshot, samples=args.samples)
+    timed(results, scale, "similar_movies[jaccard]", similar_movies, graph["movies"][0]["title"], snapshot=snapshot)
+    timed(results, scale, "similarity_pairs[jaccard]", similarity_pairs, snapshot=snapshot)
+
+    graph_data = timed(results, scale, "sample_graph[snapshot]", sample_graph_data, snapshot)
+    timed(results, scale, "draw_network", render_network, graph_data)
+
+    memory_backend_benchmarks(results, scale, graph)
+
+    if not args.skip_train:
+        train_and_recommend(results, scale, ratings_frame(graph))
+
+
+def check_empty_database(args):
+    # İlk ölçekten önce bir kez; sonraki ölçekler --cleanup ile boş başlar
+    from connection import open_session
+    from neo4j_processes import driver
+
+    with open_session(driver) as session:
+        existing = session.run("MATCH (n) RETURN count(n) AS n").single()["n"]
+    if existing and not args.force:
+        raise SystemExit(f"Database has {existing} nodes; use an empty database or --force.")
+
+
+def database_benchmarks(results, scale, graph, args):
+    from connection import open_session
+    from graph_snapshot import load_snapshot
+    from graph_view import draw_network
+    from neo4j_processes import (betweennessGDS, degreeCentralityGDS, delete_all, driver,
+                                 getAllData, get_degree_distribution, get_graph_statistics,
+                                 pageRankGDS, run_write, sample_subgraph)
+
+    ingest_stats = timed(results, scale, "ingest", ingest, driver, graph)
+    if ingest_stats:
+        for step, stats in ingest_stats.items():
+            results.append({"scale": scale, "step": f"ingest[{step}]", "ok": True, **stats})
+
+    def statistics():
+        with open_session(driver) as session:
+            return session.execute_read(get_graph_statistics)
+
+    def graph_view():
+        with open_session(driver) as session:
+            data = session.execute_read(sample_subgraph, [], 100, 500, "Top degree")
+        return draw_network(data).generate_html()
+
+    timed(results, scale, "show_statistics", statistics)
+    timed(results, scale, "get_graph_data+draw_network", graph_view)
+    timed(results, scale, "degree_distribution[db]", get_degree_distribution)
+    timed(results, scale, "getAllData", getAllData)
+    timed(results, scale, "load_snapshot", load_snapshot)
+    timed(results, scale, "pagerank[gds]", pageRankGDS)
+    timed(results, scale, f"betweenness[gds,samples={args.samples}]", betweennessGDS, sampling_size=args.samples)
+    timed(results, scale, "degree_centrality[gds]", degreeCentralityGDS)
+
+    if args.cleanup:
+        timed(results, scale, "cleanup", run_write, driver, delete_all)
+
+
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BENCH_DIR,
+                                capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor() or None,
+    }
+
+
+def compare(current, baseline_path, threshold=REGRESSION_RATIO):
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {(r["scale"], r["step"]): r for r in json.load(f)["results"] if r.get("ok") and r.get("seconds")}
+    regressions = []
+    for row in current:
+        old = baseline.get((row["scale"], row["step"]))
+        if not old or not row.get("ok") or not row.get("seconds"):
+            continue
+        ratio = row["seconds"] / old["seconds"]
+        print(f"{row['scale']:>8} {row['step']:<48} {old['seconds']:>9.4f}s -> {row['seconds']:>9.4f}s  x{ratio:.2f}")
+        if ratio > threshold:
+            regressions.append({"scale": row["scale"], "step": row["step"], "ratio": round(ratio, 2)})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scales", type=int, nargs="+", default=[1000, 10000], help="number of movies")
+    parser.add_argument("--samples", type=int, default=64, help="betweenness source samples")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--skip-train", action="store_true")
+    parser.add_argument("--database", action="store_true", help="also ingest and time Neo4j paths")
+    parser.add_argument("--allow-write", action="store_true", help="required with --database")
+    parser.add_argument("--force", action="store_true", help="ingest even if the database is not empty")
+    parser.add_argument("--cleanup", action="store_true", help="delete all data after each scale")
+    parser.add_argument("--output", help="result file (default benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--compare", help="baseline result file to compare against")
+    args = parser.parse_args()
+
+    if args.database and not args.allow_write:
+        parser.error("--database writes the synthetic graph; pass --allow-write to confirm")
+    if args.database and len(args.scales) > 1 and not (args.cleanup or args.force):
+        parser.error("--database with several scales needs --cleanup (each scale starts from an empty database)")
+    if args.database:
+        check_empty_database(args)
+
+    results = []
+    try:
+        for scale in args.scales:
+            graph = timed(results, scale, "generate", generate_movie_graph, scale, seed=args.seed)
+            offline_benchmarks(results, scale, graph, args)
+            if args.database:
+                database_benchmarks(results, scale, graph, args)
+    finally:
+        # Yarıda kesilse de toplanan sonuçlar yazılır
+        output = args.output or os.path.join(RESULTS_DIR, time.strftime("%Y%m%d-%H%M%S") + ".json")
+        os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump({"meta": environment(), "args": vars(args), "results": results}, f, indent=2)
+        print(f"Results written to {output}")
+
+    if args.compare:
+        regressions = compare(results, args.compare)
+        if regressions:
+            print(json.dumps({"regressions": regressions}))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
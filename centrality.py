@@ -0,0 +1,233 @@
+import math
+import multiprocessing
+
+import numpy as np
+
+from graph_snapshot import edge_ranges, get_snapshot
+from jobs import JobCancelled, cancel_requested, report_progress
+from neo4j_processes import GDS_PROJECTION_KEYS, betweennessGDS, ensure_gds_projection
+
+# GDS eklentisi olmadan çalışan merkeziyet hesapları. Girdi, snapshot'tan
+# alınan simetrik CSR (indptr, indices); full-movie-graph ile aynı kapsam.
+
+PROJECTION_LABELS = list(GDS_PROJECTION_KEYS[:4])
+PROJECTION_REL_TYPES = list(GDS_PROJECTION_KEYS[4:])
+
+
+def degree_centrality(indptr):
+    return np.diff(indptr).astype(np.float64)
+
+
+def pagerank(indptr, indices, damping=0.85, tol=1e-7, max_iter=20):
+    # GDS ile aynı ölçek: PR(v) = (1 - d) + d * sum(PR(u) / deg(u))
+    n = len(indptr) - 1
+    degree = np.diff(indptr).astype(np.float64)
+    rows = np.repeat(np.arange(n), np.diff(indptr))
+    inv_degree = np.divide(1.0, degree, out=np.zeros(n), where=degree > 0)
+
+    scores = np.full(n, 1.0 - damping)
+    for _ in range(max_iter):
+        contrib = (scores * inv_degree)[indices]
+        updated = (1.0 - damping) + damping * np.bincount(rows, weights=contrib, minlength=n)
+        delta = np.abs(updated - scores).max() if n else 0.0
+        scores = updated
+        if delta < tol:
+            break
+    return scores
+
+
+def _brandes_partition(indptr, indices, sources):
+    # Seviye senkron BFS: her seviyedeki kenarlar vektörel işlenir
+    n = len(indptr) - 1
+    centrality = np.zeros(n)
+
+    for done, s in enumerate(sources):
+        if done % 32 == 0:
+            # Arka plan işinde ilerleme + iptal kontrolü
+            report_progress(done / len(sources), f"Betweenness: {done}/{len(sources)} sources")
+        sigma = np.zeros(n)
+        sigma[s] = 1.0
+        dist = np.full(n, -1, dtype=np.int64)
+        dist[s] = 0
+        frontier = np.array([s], dtype=np.int64)
+        level_edges = []
+        depth = 0
+
+        while frontier.size:
+            src, pos = edge_ranges(indptr, frontier)
+            dst = indices[pos]
+            new = np.unique(dst[dist[dst] == -1])
+            dist[new] = depth + 1
+            on_path = dist[dst] == depth + 1
+            src, dst = src[on_path], dst[on_path]
+            np.add.at(sigma, dst, sigma[src])
+            level_edges.append((src, dst))
+            frontier = new
+            depth += 1
+
+        delta = np.zeros(n)
+        for src, dst in reversed(level_edges):
+            np.add.at(delta, src, sigma[src] / sigma[dst] * (1.0 + delta[dst]))
+        delta[s] = 0.0
+        centrality += delta
+
+    return centrality
+
+
+# Süreç havuzundaki işler beklenirken iptal bayrağına bakma aralığı
+CANCEL_POLL_SECONDS = 0.5
+
+
+def betweenness(indptr, indices, samples=None, seed=42, workers=1):
+    # samples verilirse rastgele kaynak düğümlerle yaklaşık hesap (n / samples ile ölçeklenir).
+    # workers > 1 ise kaynaklar süreçlere bölünür.
+    n = len(indptr) - 1
+    if samples is not None and samples < n:
+        sources = np.random.default_rng(seed).choice(n, size=samples, replace=False)
+        scale = n / samples
+    else:
+        sources = np.arange(n)
+        scale = 1.0
+
+    if workers > 1 and len(sources) > workers:
+        partitions = np.array_split(sources, workers)
+        # Alt süreçler iptal bayrağını göremez; Pool'dan çıkış (iptal ya da hata
+        # dahil) terminate() ile çalışan süreçleri sonlandırır
+        with multiprocessing.Pool(workers) as pool:
+            pending = [pool.apply_async(_brandes_partition, (indptr, indices, part)) for part in partitions]
+            centrality = np.zeros(n)
+            done = 0
+            while pending:
+                pending[0].wait(CANCEL_POLL_SECONDS)
+                for result in [r for r in pending if r.ready()]:
+                    pending.remove(result)
+                    centrality += result.get()
+                    done += 1
+                    report_progress(done / workers, f"Betweenness: {done}/{workers} partitions")
+                if cancel_requested():
+                    raise JobCancelled()
+    else:
+        centrality = _brandes_partition(indptr, indices, sources)
+
+    # Yönsüz grafta her yol iki kez sayılır
+    return centrality * scale / 2.0
+
+
+def top_k(snapshot, scores, k=10, decimals=None):
+    # GDS fonksiyonlarıyla aynı satır şekli: name, labels, score
+    k = min(k, len(scores))
+    if k == 0:
+        return []
+    top = np.argpartition(-scores, k - 1)[:k]
+    top = top[np.argsort(-scores[top], kind="stable")]
+    rows = []
+    for i in top:
+        score = float(scores[i])
+        rows.append({
+            "name": snapshot.name(i),
+            "labels": [snapshot.label(i)],
+            "score": round(score, decimals) if decimals is not None else score,
+        })
+    return rows
+
+
+def _projection(snapshot):
+    return snapshot.undirected(PROJECTION_REL_TYPES, PROJECTION_LABELS)
+
+
+def _in_projection(snapshot, scores):
+    # Projeksiyon dışı label'lar listede görünmesin
+    keep = np.isin(snapshot.label_codes, [snapshot.label_names.index(l) for l in PROJECTION_LABELS if l in snapshot.label_names])
+    return np.where(keep, scores, -np.inf)
+
+
+def pageRankLocal(snapshot=None, k=10, damping=0.85, tol=1e-7, max_iter=20):
+    snapshot = snapshot or get_snapshot()
+    indptr, indices = _projection(snapshot)
+    scores = pagerank(indptr, indices, damping, tol, max_iter)
+    return top_k(snapshot, _in_projection(snapshot, scores), k, decimals=4)
+
+
+def betweennessLocal(snapshot=None, k=10, samples=None, seed=42, workers=1):
+    snapshot = snapshot or get_snapshot()
+    indptr, indices = _projection(snapshot)
+    scores = betweenness(indptr, indices, samples, seed, workers)
+    return top_k(snapshot, _in_projection(snapshot, scores), k, decimals=2)
+
+
+def degreeCentralityLocal(snapshot=None, k=10):
+    snapshot = snapshot or get_snapshot()
+    indptr, _ = _projection(snapshot)
+    return top_k(snapshot, _in_projection(snapshot, degree_centrality(indptr)), k)
+
+
+# --- Approximate betweenness ---
+# k rastgele kaynakla tahmin (Brandes & Pich). Her kaynağın bir düğüme katkısı
+# [0, n-2] aralığında; Hoeffding + n düğüm üzerinde union bound ile, 1 - delta
+# olasılıkla tüm düğümlerde normalize hata (skor / (n (n-2))) en fazla eps olur.
+
+BETWEENNESS_DELTA = 0.1
+
+def betweenness_sample_size(n, target_error, delta=BETWEENNESS_DELTA):
+    if n < 3:
+        return n
+    return min(n, math.ceil(math.log(2 * n / delta) / (2 * target_error ** 2)))
+
+def betweenness_error_bound(n, samples, delta=BETWEENNESS_DELTA):
+    if n < 3 or samples >= n:
+        return 0.0
+    return math.sqrt(math.log(2 * n / delta) / (2 * samples))
+
+def _resolve_samples(n, samples, target_error, delta):
+    if samples is None and target_error is not None:
+        samples = betweenness_sample_size(n, target_error, delta)
+    if samples is None or samples >= n:
+        return None
+    return int(samples)
+
+def betweennessEstimateLocal(snapshot=None, k=10, samples=None, target_error=None,
+                             delta=BETWEENNESS_DELTA, seed=42, workers=1):
+    # samples / target_error ikisi de yoksa kesin hesap
+    snapshot = snapshot or get_snapshot()
+    indptr, indices = _projection(snapshot)
+    n = len(indptr) - 1
+    samples = _resolve_samples(n, samples, target_error, delta)
+
+    scores = _in_projection(snapshot, betweenness(indptr, indices, samples, seed, workers))
+    rows = top_k(snapshot, scores, k + 1, decimals=2)
+
+    eps = betweenness_error_bound(n, samples or n, delta)
+    # Yönsüz ölçekte mutlak hata
+    error = eps * n * (n - 2) / 2.0
+    cutoff = rows[k]["score"] if len(rows) > k else -math.inf
+    rows = rows[:k]
+    for row in rows:
+        # Güven aralığı ilk k dışındaki en iyi düğümün aralığıyla kesişmiyorsa
+        # bu düğümün top-k'da olduğu 1 - delta güvenle kesin
+        row["confident"] = samples is None or row["score"] - error > cutoff + error
+
+    return {
+        "rows": rows,
+        "exact": samples is None,
+        "sample_size": samples or n,
+        "nodes": n,
+        "normalized_error": round(eps, 4),
+        "error_bound": round(error, 2),
+        "confidence": 1.0 if samples is None else 1.0 - delta,
+    }
+
+def betweennessEstimateGDS(k=10, samples=None, target_error=None, delta=BETWEENNESS_DELTA, seed=42):
+    # GDS skorları kendi ölçeğinde döner; hata normalize olarak raporlanır
+    n = ensure_gds_projection()["node_count"]
+    samples = _resolve_samples(n, samples, target_error, delta)
+    rows = betweennessGDS(sampling_size=samples, sampling_seed=seed, k=k)
+    eps = betweenness_error_bound(n, samples or n, delta)
+    return {
+        "rows": rows,
+        "exact": samples is None,
+        "sample_size": samples or n,
+        "nodes": n,
+        "normalized_error": round(eps, 4),
+        "error_bound": None,
+        "confidence": 1.0 if samples is None else 1.0 - delta,
+    }
@@ -0,0 +1,132 @@
+import os
+import threading
+import time
+
+from neo4j import GraphDatabase
+
+from instrumentation import InstrumentedDriver
+
+# Süreç başına tek pooled driver. Ayarlar ortam değişkenlerinden okunur;
+# sağlık kontrolü arka planda periyodik yapılır, istek yolları yalnızca son
+# sonucu okur.
+
+NEO4J_URI = os.environ.get("NEO4J_URI", "bolt://localhost:7687")
+NEO4J_USER = os.environ.get("NEO4J_USER", "neo4j")
+NEO4J_PASSWORD = os.environ.get("NEO4J_PASSWORD", "password")
+NEO4J_DATABASE = os.environ.get("NEO4J_DATABASE") or None
+
+MAX_POOL_SIZE = int(os.environ.get("NEO4J_MAX_POOL_SIZE", 50))
+FETCH_SIZE = int(os.environ.get("NEO4J_FETCH_SIZE", 1000))
+ACQUISITION_TIMEOUT = float(os.environ.get("NEO4J_ACQUISITION_TIMEOUT", 30))
+CONNECTION_TIMEOUT = float(os.environ.get("NEO4J_CONNECTION_TIMEOUT", 15))
+MAX_CONNECTION_LIFETIME = float(os.environ.get("NEO4J_MAX_CONNECTION_LIFETIME", 3600))
+HEALTH_CHECK_INTERVAL = float(os.environ.get("NEO4J_HEALTH_CHECK_INTERVAL", 15))
+# Sorgu metrikleri (instrumentation.py); NEO4J_INSTRUMENT=0 ile kapatılır
+INSTRUMENT = os.environ.get("NEO4J_INSTRUMENT", "1") != "0"
+
+
+class ConnectionManager:
+
+    def __init__(self, uri=NEO4J_URI, user=NEO4J_USER, password=NEO4J_PASSWORD,
+                 database=NEO4J_DATABASE, max_pool_size=MAX_POOL_SIZE, fetch_size=FETCH_SIZE,
+                 acquisition_timeout=ACQUISITION_TIMEOUT, connection_timeout=CONNECTION_TIMEOUT,
+                 max_connection_lifetime=MAX_CONNECTION_LIFETIME,
+                 health_interval=HEALTH_CHECK_INTERVAL, instrument=INSTRUMENT):
+        self.uri = uri
+        self.auth = (user, password)
+        self.database = database
+        self.config = {
+            "max_connection_pool_size": max_pool_size,
+            "fetch_size": fetch_size,
+            "connection_acquisition_timeout": acquisition_timeout,
+            "connection_timeout": connection_timeout,
+            "max_connection_lifetime": max_connection_lifetime,
+        }
+        # Driver bağlantıları tembel açar; burada ağ trafiği yok
+        self.raw_driver = GraphDatabase.driver(uri, auth=self.auth, **self.config)
+        self.driver = InstrumentedDriver(self.raw_driver) if instrument else self.raw_driver
+        self.instrument = instrument
+        self.health_interval = health_interval
+
+        self._health = None
+        self._health_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    # --- Health ---
+
+    def check_health(self):
+        start = time.perf_counter()
+        try:
+            info = self.raw_driver.get_server_info()
+            health = {"ok": True, "server": info.agent, "protocol": ".".join(map(str, info.protocol_version)),
+                      "error": None}
+        except Exception as e:
+            health = {"ok": False, "server": None, "protocol": None, "error": str(e)}
+        health["latency_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        health["checked_at"] = time.time()
+        with self._health_lock:
+            self._health = health
+        return health
+
+    def _health_loop(self):
+        while not self._stop.wait(self.health_interval):
+            self.check_health()
+
+    def start_health_checks(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._health_loop, name="neo4j-health", daemon=True)
+            self._thread.start()
+
+    def health(self):
+        # İlk çağrı senkron kontrol yapar; sonrası arka plan thread'inin sonucunu okur
+        with self._health_lock:
+            health = self._health
+        if health is None:
+            health = self.check_health()
+            self.start_health_checks()
+        return dict(health)
+
+    def healthy(self):
+        return self.health()["ok"]
+
+    # --- Pool ---
+
+    def pool_stats(self):
+        stats = {"max_pool_size": self.config["max_connection_pool_size"],
+                 "fetch_size": self.config["fetch_size"],
+                 "acquisition_timeout": self.config["connection_acquisition_timeout"]}
+        # Driver havuz metriği sunmuyor; iç yapı okunamazsa yalnızca ayarlar döner
+        try:
+            pool = self.raw_driver._pool
+            with pool.lock:
+                connections = [c for conns in pool.connections.values() for c in conns]
+            in_use = sum(1 for c in connections if c.in_use)
+            stats.update({"open": len(connections), "in_use": in_use, "idle": len(connections) - in_use})
+        except AttributeError:
+            pass
+        return stats
+
+    def session(self, driver=None, **config):
+        # NEO4J_DATABASE her oturuma eklenir; driver verilmezse paylaşılan driver
+        if self.database and "database" not in config:
+            config["database"] = self.database
+        return (driver or self.driver).session(**config)
+
+    def close(self):
+        self._stop.set()
+        self.driver.close()
+
+
+_manager = {"value": None}
+_manager_lock = threading.Lock()
+
+def get_connection_manager():
+    with _manager_lock:
+        if _manager["value"] is None:
+            _manager["value"] = ConnectionManager()
+        return _manager["value"]
+
+def open_session(driver=None, **config):
+    return get_connection_manager().session(driver, **config)
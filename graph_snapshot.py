@@ -0,0 +1,300 @@
+import threading
+import time
+
+import numpy as np
+
+from connection import open_session
+from neo4j_processes import driver as default_driver, get_graph_version, graph_cache_fresh
+
+# Grafın tamamını bir kez sayfalı olarak çekip kompakt dizilerde tutar:
+# CSR (çıkan) / CSC (giren) komşuluk int32, label ve ilişki tipi kodları,
+# tekil isim tablosu. Analizler veritabanına gitmeden bu diziler üzerinde
+# çalışır ve GDS gerektirmez.
+
+SNAPSHOT_BATCH_SIZE = 50000
+
+
+def _intern(values, table, lookup):
+    codes = np.empty(len(values), dtype=np.int32)
+    for i, value in enumerate(values):
+        code = lookup.get(value)
+        if code is None:
+            code = lookup[value] = len(table)
+            table.append(value)
+        codes[i] = code
+    return codes
+
+
+def _compress(keys, n):
+    # keys'e göre stabil sıralama + satır başlangıçları
+    order = np.argsort(keys, kind="stable")
+    indptr = np.zeros(n + 1, dtype=np.int32)
+    np.cumsum(np.bincount(keys, minlength=n), out=indptr[1:])
+    return indptr, order
+
+
+def edge_ranges(indptr, nodes):
+    # nodes'un komşuluk dilimlerini tek bir indeks dizisinde birleştirir
+    starts = indptr[nodes]
+    counts = indptr[nodes + 1] - starts
+    total = int(counts.sum())
+    offsets = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+    return np.repeat(nodes, counts), offsets + np.arange(total)
+
+
+class GraphSnapshot:
+
+    def __init__(self, node_ids, label_codes, label_names, name_codes, names,
+                 sources, targets, rel_type_codes, rel_types, version=None):
+        n = len(node_ids)
+        self.node_ids = np.asarray(node_ids, dtype=np.int64)
+        self.label_codes = np.asarray(label_codes, dtype=np.int16)
+        self.label_names = list(label_names)
+        self.name_codes = np.asarray(name_codes, dtype=np.int32)
+        self.names = list(names)
+        self.rel_types = list(rel_types)
+        self.version = version
+        # Dışarıdan yazmalar sayacı değiştirmez; get_snapshot TTL ile yeniler
+        self.built_at = time.time()
+
+        sources = np.asarray(sources, dtype=np.int32)
+        targets = np.asarray(targets, dtype=np.int32)
+        rel_type_codes = np.asarray(rel_type_codes, dtype=np.int16)
+
+        # CSR: satır = kaynak düğüm
+        self.indptr, order = _compress(sources, n)
+        self.indices = targets[order]
+        self.rel_type_codes = rel_type_codes[order]
+
+        # CSC: satır = hedef düğüm
+        self.in_indptr, order = _compress(targets, n)
+        self.in_indices = sources[order]
+        self.in_rel_type_codes = rel_type_codes[order]
+
+        self._name_index = None
+        self._undirected = {}
+
+    @classmethod
+    def from_edges(cls, labels, names, sources, targets, rel_types, version=None):
+        # Veritabanı olmadan (benchmark, test verisi) snapshot kurmak için;
+        # düğümler 0..n-1, kenarlar bu indekslerle verilir
+        label_names, label_lookup = [], {}
+        label_codes = _intern(labels, label_names, label_lookup)
+        name_table, name_lookup = [], {}
+        name_codes = _intern(names, name_table, name_lookup)
+        type_names, type_lookup = [], {}
+        type_codes = _intern(rel_types, type_names, type_lookup)
+        return cls(np.arange(len(labels)), label_codes, label_names, name_codes, name_table,
+                   sources, targets, type_codes, type_names, version)
+
+    @property
+    def n_nodes(self):
+        return len(self.node_ids)
+
+    @property
+    def n_relationships(self):
+        return len(self.indices)
+
+    # --- Node lookups ---
+
+    def name(self, i):
+        return self.names[self.name_codes[i]]
+
+    def label(self, i):
+        return self.label_names[self.label_codes[i]]
+
+    def index_of(self, name):
+        # İsim -> düğüm indeksleri (isimler tekil olmayabilir)
+        if self._name_index is None:
+            lookup = {value: code for code, value in enumerate(self.names)}
+            order = np.argsort(self.name_codes, kind="stable")
+            bounds = np.searchsorted(self.name_codes[order], np.arange(len(self.names) + 1))
+            self._name_index = (lookup, order, bounds)
+        lookup, order, bounds = self._name_index
+        code = lookup.get(name)
+        if code is None:
+            return np.empty(0, dtype=np.int64)
+        return order[bounds[code]:bounds[code + 1]]
+
+    def nodes_with_label(self, label):
+        if label not in self.label_names:
+            return np.empty(0, dtype=np.int64)
+        return np.flatnonzero(self.label_codes == self.label_names.index(label))
+
+    def neighbors(self, i, direction="both"):
+        out = self.indices[self.indptr[i]:self.indptr[i + 1]]
+        if direction == "out":
+            return out
+        incoming = self.in_indices[self.in_indptr[i]:self.in_indptr[i + 1]]
+        if direction == "in":
+            return incoming
+        return np.concatenate([out, incoming])
+
+    # --- Degrees ---
+
+    def out_degree(self):
+        return np.diff(self.indptr)
+
+    def in_degree(self):
+        return np.diff(self.in_indptr)
+
+    def degree(self):
+        return self.out_degree() + self.in_degree()
+
+    # --- Derived adjacency ---
+
+    def rel_type_mask(self, rel_types=None, csc=False):
+        codes = self.in_rel_type_codes if csc else self.rel_type_codes
+        if rel_types is None:
+            return np.ones(len(codes), dtype=bool)
+        wanted = [self.rel_types.index(t) for t in rel_types if t in self.rel_types]
+        return np.isin(codes, wanted)
+
+    def undirected(self, rel_types=None, labels=None):
+        # GDS'deki UNDIRECTED projeksiyonun karşılığı: simetrik CSR (indptr, indices).
+        # labels verilirse diğer düğümlerin kenarları düşer (düğümler indekste kalır).
+        key = (tuple(sorted(rel_types)) if rel_types else None,
+               tuple(sorted(labels)) if labels else None)
+        if key in self._undirected:
+            return self._undirected[key]
+
+        n = self.n_nodes
+        rows = np.repeat(np.arange(n, dtype=np.int32), self.out_degree())
+        mask = self.rel_type_mask(rel_types)
+        src, dst = rows[mask], self.indices[mask]
+
+        if labels is not None:
+            keep = np.zeros(n, dtype=bool)
+            for label in labels:
+                keep[self.nodes_with_label(label)] = True
+            edge_keep = keep[src] & keep[dst]
+            src, dst = src[edge_keep], dst[edge_keep]
+
+        both_src = np.concatenate([src, dst])
+        both_dst = np.concatenate([dst, src])
+        indptr, order = _compress(both_src, n)
+        result = (indptr, both_dst[order].astype(np.int32))
+        self._undirected[key] = result
+        return result
+
+    # --- Analytics (veritabanı sorgularının snapshot karşılıkları) ---
+
+    def label_distribution(self):
+        counts = np.bincount(self.label_codes, minlength=len(self.label_names))
+        rows = [{"label": self.label_names[i], "count": int(c)} for i, c in enumerate(counts) if c]
+        return sorted(rows, key=lambda r: r["count"], reverse=True)
+
+    def relationship_distribution(self):
+        counts = np.bincount(self.rel_type_codes, minlength=len(self.rel_types))
+        rows = [{"relationship_type": self.rel_types[i], "count": int(c)} for i, c in enumerate(counts) if c]
+        return sorted(rows, key=lambda r: r["count"], reverse=True)
+
+    def degree_histogram(self, log=True, bins=30):
+        degrees = self.degree()
+        if log:
+            buckets = np.floor(np.log2(degrees + 1)).astype(np.int64)
+            counts = np.bincount(buckets)
+            return [{"bucket_start": int(2 ** b - 1), "bucket_end": int(2 ** (b + 1) - 2), "nodes": int(c)}
+                    for b, c in enumerate(counts) if c]
+        counts, edges = np.histogram(degrees, bins=bins)
+        return [{"bucket_start": int(np.ceil(lo)), "bucket_end": int(np.floor(hi)), "nodes": int(c)}
+                for lo, hi, c in zip(edges[:-1], edges[1:], counts) if c]
+
+    def top_connected(self, k=10):
+        # show_relationship_counts karşılığı: en çok çıkan ilişkisi olan düğümler
+        out = self.out_degree()
+        top = np.argsort(out)[::-1][:k]
+        return [{"node": self.name(i) or "Unnamed Node", "relation_count": int(out[i])} for i in top if out[i]]
+
+    def memory_bytes(self):
+        arrays = [self.node_ids, self.label_codes, self.name_codes, self.indptr, self.indices,
+                  self.rel_type_codes, self.in_indptr, self.in_indices, self.in_rel_type_codes]
+        return int(sum(a.nbytes for a in arrays))
+
+
+def _stream_batches(tx, query, batch_size):
+    batch = []
+    for record in tx.run(query):
+        batch.append(record.values())
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def load_snapshot(driver=None, batch_size=SNAPSHOT_BATCH_SIZE):
+    driver = driver or default_driver
+    version = get_graph_version()
+
+    label_names, label_lookup = [], {}
+    names, name_lookup = [], {}
+    type_names, type_lookup = [], {}
+    id_chunks, label_chunks, name_chunks = [], [], []
+    src_chunks, dst_chunks, type_chunks = [], [], []
+
+    # id() Neo4j 5'te deprecated ama elementId string'lerine göre çok daha kompakt.
+    # Düğümler ve ilişkiler aynı okuma transaction'ında: arada bir yazma
+    # snapshot'ı tutarsız bırakamaz
+    def read_tx(tx):
+        # execute_read retry'ında baştan başlanır
+        for table in (label_names, label_lookup, names, name_lookup, type_names, type_lookup,
+                      id_chunks, label_chunks, name_chunks, src_chunks, dst_chunks, type_chunks):
+            table.clear()
+        for batch in _stream_batches(tx, """
+            MATCH (n)
+            RETURN id(n) AS id, labels(n)[0] AS label,
+                   coalesce(n.name, n.title, n.username) AS name
+        """, batch_size):
+            ids, labels, node_names = zip(*batch)
+            id_chunks.append(np.fromiter(ids, dtype=np.int64, count=len(ids)))
+            label_chunks.append(_intern(labels, label_names, label_lookup))
+            name_chunks.append(_intern(node_names, names, name_lookup))
+
+        for batch in _stream_batches(tx, """
+            MATCH (a)-[r]->(b)
+            RETURN id(a) AS source, id(b) AS target, type(r) AS type
+        """, batch_size):
+            sources, targets, types = zip(*batch)
+            src_chunks.append(np.fromiter(sources, dtype=np.int64, count=len(sources)))
+            dst_chunks.append(np.fromiter(targets, dtype=np.int64, count=len(targets)))
+            type_chunks.append(_intern(types, type_names, type_lookup))
+
+    with open_session(driver, fetch_size=batch_size) as session:
+        session.execute_read(read_tx)
+
+    def concat(chunks, dtype):
+        return np.concatenate(chunks) if chunks else np.empty(0, dtype=dtype)
+
+    node_ids = concat(id_chunks, np.int64)
+    order = np.argsort(node_ids)
+    node_ids = node_ids[order]
+    label_codes = concat(label_chunks, np.int32)[order]
+    name_codes = concat(name_chunks, np.int32)[order]
+
+    # Neo4j id -> yoğun 0..n-1 indeks; düğüm listesinde birebir karşılığı
+    # olmayan uçlara sahip kenarlar atılır (CSR'ı bozmasınlar)
+    source_ids = concat(src_chunks, np.int64)
+    target_ids = concat(dst_chunks, np.int64)
+    sources = np.searchsorted(node_ids, source_ids)
+    targets = np.searchsorted(node_ids, target_ids)
+    n = len(node_ids)
+    valid = (sources < n) & (targets < n)
+    valid[valid] &= (node_ids[sources[valid]] == source_ids[valid]) & (node_ids[targets[valid]] == target_ids[valid])
+
+    return GraphSnapshot(node_ids, label_codes, label_names, name_codes, names,
+                         sources[valid].astype(np.int32), targets[valid].astype(np.int32),
+                         concat(type_chunks, np.int32)[valid], type_names, version)
+
+
+_snapshot = {"value": None}
+_snapshot_lock = threading.Lock()
+
+def get_snapshot(driver=None):
+    # Graf versiyonu değişmedikçe (ve TTL dolmadıkça) aynı snapshot paylaşılır
+    with _snapshot_lock:
+        snapshot = _snapshot["value"]
+        if (snapshot is None or snapshot.version != get_graph_version()
+                or not graph_cache_fresh(snapshot.built_at)):
+            snapshot = _snapshot["value"] = load_snapshot(driver)
+        return snapshot
@@ -0,0 +1,32 @@
+# Pyvis ağ çizimi. Streamlit'e bağlı değil; benchmark'lar da buradan import eder.
+
+
+def draw_network(graph_data):
+    from pyvis.network import Network
+
+    net = Network(height="550px", width="100%", bgcolor="#ffffff", font_color="black", notebook=False, directed=True)
+    net.force_atlas_2based()
+
+    def get_color(labels):
+        if "Person" in labels:
+            return "#FF6B6B"
+        elif "Movie" in labels:
+            return "#4D96FF"
+        elif "Genre" in labels:
+            return "#FFD93D"
+        elif "User" in labels:
+            return "#6BCB77"
+        else:
+            return "#D3D3D3"
+
+    added_nodes = set()
+    for node in graph_data["nodes"]:
+        tooltip = "\n".join([f"{k}: {v}" for k, v in node["props"].items()])
+        net.add_node(node["id"], label=node["caption"], title=tooltip, color=get_color(node["labels"]))
+        added_nodes.add(node["id"])
+
+    for edge in graph_data["edges"]:
+        if edge["source"] in added_nodes and edge["target"] in added_nodes:
+            net.add_edge(edge["source"], edge["target"], label=edge["rel_type"])
+
+    return net
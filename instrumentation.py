@@ -0,0 +1,581 @@
+import os
+import random
+import re
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+from neo4j import Query
+
+# Driver / session / transaction proxy'leri: her tx.run ve session.run için
+# duvar saati, sunucu süreleri (result_available_after / result_consumed_after),
+# satır sayısı ve yaklaşık bayt kaydeder. Sorgu adı transaction fonksiyonunun
+# adıdır (aynı fonksiyondaki ikinci sorgu "#2" alır); ham session.run için
+# sorgu metninin başı. Örneklenen çağrılar PROFILE ile çalıştırılıp db hit
+# sayısı saklanır.
+
+LATENCY_WINDOW = 1000
+PROFILE_SAMPLE_RATE = float(os.environ.get("NEO4J_PROFILE_SAMPLE_RATE", 0.0))
+METRICS_PORT = os.environ.get("NEO4J_METRICS_PORT")
+# Varsayılan yalnızca yerel; sorgu adları/gecikmeler dışarı açılmasın.
+# Prometheus başka makineden okuyacaksa NEO4J_METRICS_HOST=0.0.0.0
+METRICS_HOST = os.environ.get("NEO4J_METRICS_HOST", "127.0.0.1")
+
+# PROFILE ön eki alamayan komutlar
+_NOT_PROFILABLE = re.compile(r"^\s*(PROFILE|EXPLAIN|SHOW|TERMINATE|CREATE\s+(CONSTRAINT|INDEX|RANGE|FULLTEXT|TEXT|POINT|VECTOR|LOOKUP)|DROP|ALTER|USE|CYPHER)\b", re.I)
+
+
+def _approx_bytes(value):
+    if value is None or isinstance(value, bool):
+        return 1
+    if isinstance(value, (int, float)):
+        return 8
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(len(k) + _approx_bytes(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sum(_approx_bytes(v) for v in value)
+    if hasattr(value, "items"):
+        # Node / Relationship: property'ler
+        return sum(len(k) + _approx_bytes(v) for k, v in value.items())
+    return 8
+
+
+def _db_hits(plan):
+    if not plan:
+        return 0
+    return plan.get("dbHits", 0) + sum(_db_hits(child) for child in plan.get("children", []))
+
+
+def _raw_name(query):
+    text = query.text if isinstance(query, Query) else str(query)
+    return "raw: " + " ".join(text.split())[:60]
+
+
+def _tx_name(fn):
+    fn = getattr(fn, "__wrapped__", fn)
+    name = getattr(fn, "__qualname__", None) or getattr(fn, "__name__", repr(fn))
+    return name.replace(".<locals>", "")
+
+
+class QueryStats:
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.rows = 0
+        self.bytes = 0
+        self.wall_ms = 0.0
+        self.available_ms = 0
+        self.consumed_ms = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.profile = None
+
+
+class QueryMetrics:
+
+    def __init__(self):
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def record(self, name, wall_ms, rows=0, nbytes=0, summary=None, error=False):
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = QueryStats()
+            stats.calls += 1
+            stats.errors += int(error)
+            stats.rows += rows
+            stats.bytes += nbytes
+            stats.wall_ms += wall_ms
+            stats.latencies.append(wall_ms)
+            if summary is not None:
+                stats.available_ms += summary.result_available_after or 0
+                stats.consumed_ms += summary.result_consumed_after or 0
+                if summary.profile:
+                    stats.profile = {"db_hits": _db_hits(summary.profile), "rows": rows,
+                                     "operator": summary.profile.get("operatorType"),
+                                     "captured_at": time.time()}
+
+    def snapshot(self):
+        rows = []
+        with self._lock:
+            items = [(name, s, list(s.latencies)) for name, s in self._stats.items()]
+        for name, s, latencies in items:
+            p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if latencies else (0.0, 0.0, 0.0)
+            rows.append({
+                "query": name, "calls": s.calls, "errors": s.errors,
+                "p50_ms": round(float(p50), 2), "p95_ms": round(float(p95), 2), "p99_ms": round(float(p99), 2),
+                "avg_ms": round(s.wall_ms / s.calls, 2) if s.calls else 0.0,
+                "server_available_ms": s.available_ms, "server_consumed_ms": s.consumed_ms,
+                "rows": s.rows, "bytes": s.bytes,
+                "profile_db_hits": s.profile["db_hits"] if s.profile else None,
+            })
+        return sorted(rows, key=lambda r: r["p95_ms"], reverse=True)
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+    def prometheus(self):
+        def label(name):
+            return name.replace("\\", "\\\\").replace('"', '\\"')
+
+        lines = [
+            "# HELP neo4j_query_calls_total Query executions.",
+            "# TYPE neo4j_query_calls_total counter",
+        ]
+        snapshot = self.snapshot()
+        for row in snapshot:
+            lines.append(f'neo4j_query_calls_total{{query="{label(row["query"])}"}} {row["calls"]}')
+        for metric, key, help_text in [
+            ("neo4j_query_errors_total", "errors", "Failed query executions."),
+            ("neo4j_query_rows_total", "rows", "Rows returned."),
+            ("neo4j_query_bytes_total", "bytes", "Approximate bytes returned."),
+            ("neo4j_query_server_available_ms_total", "server_available_ms", "Server time until first record."),
+            ("neo4j_query_server_consumed_ms_total", "server_consumed_ms", "Server time to consume the result."),
+        ]:
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} counter"]
+            lines += [f'{metric}{{query="{label(r["query"])}"}} {r[key]}' for r in snapshot]
+
+        lines += ["# HELP neo4j_query_latency_ms Client wall time over the rolling window.",
+                  "# TYPE neo4j_query_latency_ms summary"]
+        for r in snapshot:
+            q = label(r["query"])
+            for quantile, key in (("0.5", "p50_ms"), ("0.95", "p95_ms"), ("0.99", "p99_ms")):
+                lines.append(f'neo4j_query_latency_ms{{query="{q}",quantile="{quantile}"}} {r[key]}')
+            lines.append(f'neo4j_query_latency_ms_sum{{query="{q}"}} {round(r["avg_ms"] * r["calls"], 2)}')
+            lines.append(f'neo4j_query_latency_ms_count{{query="{q}"}} {r["calls"]}')
+
+        lines += ["# HELP neo4j_query_profile_db_hits DB hits of the last profiled execution.",
+                  "# TYPE neo4j_query_profile_db_hits gauge"]
+        lines += [f'neo4j_query_profile_db_hits{{query="{label(r["query"])}"}} {r["profile_db_hits"]}'
+                  for r in snapshot if r["profile_db_hits"] is not None]
+        return "\n".join(lines) + "\n"
+
+
+metrics = QueryMetrics()
+
+
+def set_profile_sample_rate(rate):
+    global PROFILE_SAMPLE_RATE
+    PROFILE_SAMPLE_RATE = max(0.0, min(1.0, float(rate)))
+
+
+def _maybe_profile(query):
+    if PROFILE_SAMPLE_RATE <= 0 or random.random() >= PROFILE_SAMPLE_RATE:
+        return query
+    text = query.text if isinstance(query, Query) else str(query)
+    if _NOT_PROFILABLE.match(text):
+        return query
+    if isinstance(query, Query):
+        return Query("PROFILE " + text, metadata=query.metadata, timeout=query.timeout)
+    return "PROFILE " + text
+
+
+class InstrumentedResult:
+
+    def __init__(self, result, name, start):
+        self._result = result
+        self._name = name
+        self._start = start
+        self._rows = 0
+        self._bytes = 0
+        self._recorded = False
+
+    def _count(self, record):
+        self._rows += 1
+        self._bytes += _approx_bytes(record.values())
+
+    def _finish(self, summary=None, error=False):
+        if self._recorded:
+            return
+        self._recorded = True
+        if summary is None and not error:
+            try:
+                summary = self._result.consume()
+            except Exception:
+                summary = None
+        wall_ms = (time.perf_counter() - self._start) * 1000
+        metrics.record(self._name, wall_ms, self._rows, self._bytes, summary, error)
+
+    def _guard(self, fn, *args, **kwargs):
+        try:
+            return fn(*args, **kwargs)
+        except Exception:
+            self._finish(error=True)
+            raise
+
+    def __iter__(self):
+        iterator = iter(self._result)
+        while True:
+            try:
+                record = next(iterator)
+            except StopIteration:
+                break
+            except Exception:
+                self._finish(error=True)
+                raise
+            self._count(record)
+            yield record
+        self._finish()
+
+    def single(self, strict=False):
+        record = self._guard(self._result.single, strict)
+        if record is not None:
+            self._count(record)
+        self._finish()
+        return record
+
+    def data(self, *keys):
+        rows = self._guard(self._result.data, *keys)
+        self._rows += len(rows)
+        self._bytes += sum(_approx_bytes(row) for row in rows)
+        self._finish()
+        return rows
+
+    def values(self, *keys):
+        rows = self._guard(self._result.values, *keys)
+        self._rows += len(rows)
+        self._bytes += sum(_approx_bytes(row) for row in rows)
+        self._finish()
+        return rows
+
+    def value(self, key=0, default=None):
+        values = self._guard(self._result.value, key, default)
+        self._rows += len(values)
+        self._bytes += _approx_bytes(values)
+        self._finish()
+        return values
+
+    def consume(self):
+        summary = self._guard(self._result.consume)
+        self._finish(summary)
+        return summary
+
+    def __getattr__(self, attr):
+        # keys, peek, fetch, to_df, graph ... doğrudan
+        return getattr(self._result, attr)
+
+
+class InstrumentedTransaction:
+
+    def __init__(self, tx, name):
+        self._tx = tx
+        self._name = name
+        self._runs = 0
+        self._results = []
+
+    def run(self, query, parameters=None, **kwargs):
+        self._runs += 1
+        name = self._name if self._runs == 1 else f"{self._name}#{self._runs}"
+        start = time.perf_counter()
+        try:
+            result = self._tx.run(_maybe_profile(query), parameters, **kwargs)
+        except Exception:
+            metrics.record(name, (time.perf_counter() - start) * 1000, error=True)
+            raise
+        result = InstrumentedResult(result, name, start)
+        self._results.append(result)
+        return result
+
+    def finish_pending(self):
+        # Sonucu okunmayan sorgular (ör. yazma yardımcıları) commit öncesi kaydedilir
+        for result in self._results:
+            result._finish()
+
+    def __getattr__(self, attr):
+        return getattr(self._tx, attr)
+
+
+class InstrumentedSession:
+
+    def __init__(self, session):
+        self._session = session
+        self._results = []
+
+    def __enter__(self):
+        self._session.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        self.finish_pending()
+        return self._session.__exit__(*exc)
+
+    def close(self):
+        self.finish_pending()
+        return self._session.close()
+
+    def run(self, query, parameters=None, **kwargs):
+        name = _raw_name(query)
+        start = time.perf_counter()
+        try:
+            result = self._session.run(_maybe_profile(query), parameters, **kwargs)
+        except Exception:
+            metrics.record(name, (time.perf_counter() - start) * 1000, error=True)
+            raise
+        result = InstrumentedResult(result, name, start)
+        self._results.append(result)
+        return result
+
+    def finish_pending(self):
+        # Okunmadan bırakılan auto-commit sonuçları oturum kapanmadan kaydedilir
+        for result in self._results:
+            result._finish()
+        self._results = []
+
+    def _wrap(self, tx_fn):
+        name = _tx_name(tx_fn)
+
+        def wrapped(tx, *args, **kwargs):
+            instrumented = InstrumentedTransaction(tx, name)
+            try:
+                return tx_fn(instrumented, *args, **kwargs)
+            finally:
+                instrumented.finish_pending()
+
+        # unit_of_work metadata/timeout'u korunmalı (job etiketleri)
+        wrapped.metadata = getattr(tx_fn, "metadata", None)
+        wrapped.timeout = getattr(tx_fn, "timeout", None)
+        return wrapped
+
+    def execute_read(self, tx_fn, *args, **kwargs):
+        return self._session.execute_read(self._wrap(tx_fn), *args, **kwargs)
+
+    def execute_write(self, tx_fn, *args, **kwargs):
+        return self._session.execute_write(self._wrap(tx_fn), *args, **kwargs)
+
+    def __getattr__(self, attr):
+        return getattr(self._session, attr)
+
+
+class InstrumentedDriver:
+
+    def __init__(self, driver):
+        self._driver = driver
+
+    def session(self, **config):
+        return InstrumentedSession(self._driver.session(**config))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._driver.close()
+
+    def __getattr__(self, attr):
+        return getattr(self._driver, attr)
+
+
+# --- Async karşılıkları (async_queries.py) ---
+
+def name_by_query(tx_fn):
+    # Genel amaçlı okuyucular için: metrik adı fonksiyon yerine sorgu metni
+    tx_fn.name_by_query = True
+    return tx_fn
+
+
+class AsyncInstrumentedResult(InstrumentedResult):
+
+    async def _finish_async(self, summary=None, error=False):
+        if self._recorded:
+            return
+        if summary is None and not error:
+            try:
+                summary = await self._result.consume()
+            except Exception:
+                summary = None
+        self._finish(summary, error)
+
+    async def _guard_async(self, fn, *args, **kwargs):
+        try:
+            return await fn(*args, **kwargs)
+        except Exception:
+            self._finish(error=True)
+            raise
+
+    async def __aiter__(self):
+        iterator = self._result.__aiter__()
+        while True:
+            try:
+                record = await iterator.__anext__()
+            except StopAsyncIteration:
+                break
+            except Exception:
+                self._finish(error=True)
+                raise
+            self._count(record)
+            yield record
+        await self._finish_async()
+
+    async def single(self, strict=False):
+        record = await self._guard_async(self._result.single, strict)
+        if record is not None:
+            self._count(record)
+        await self._finish_async()
+        return record
+
+    async def data(self, *keys):
+        rows = await self._guard_async(self._result.data, *keys)
+        self._rows += len(rows)
+        self._bytes += sum(_approx_bytes(row) for row in rows)
+        await self._finish_async()
+        return rows
+
+    async def values(self, *keys):
+        rows = await self._guard_async(self._result.values, *keys)
+        self._rows += len(rows)
+        self._bytes += sum(_approx_bytes(row) for row in rows)
+        await self._finish_async()
+        return rows
+
+    async def value(self, key=0, default=None):
+        values = await self._guard_async(self._result.value, key, default)
+        self._rows += len(values)
+        self._bytes += _approx_bytes(values)
+        await self._finish_async()
+        return values
+
+    async def consume(self):
+        summary = await self._guard_async(self._result.consume)
+        self._finish(summary)
+        return summary
+
+
+class AsyncInstrumentedTransaction(InstrumentedTransaction):
+
+    async def run(self, query, parameters=None, **kwargs):
+        self._runs += 1
+        if self._name is None:
+            name = _raw_name(query)
+        else:
+            name = self._name if self._runs == 1 else f"{self._name}#{self._runs}"
+        start = time.perf_counter()
+        try:
+            result = await self._tx.run(_maybe_profile(query), parameters, **kwargs)
+        except Exception:
+            metrics.record(name, (time.perf_counter() - start) * 1000, error=True)
+            raise
+        result = AsyncInstrumentedResult(result, name, start)
+        self._results.append(result)
+        return result
+
+    async def finish_pending(self):
+        for result in self._results:
+            await result._finish_async()
+
+
+class AsyncInstrumentedSession:
+
+    def __init__(self, session):
+        self._session = session
+        self._results = []
+
+    async def __aenter__(self):
+        await self._session.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.finish_pending()
+        return await self._session.__aexit__(*exc)
+
+    async def close(self):
+        await self.finish_pending()
+        return await self._session.close()
+
+    async def run(self, query, parameters=None, **kwargs):
+        name = _raw_name(query)
+        start = time.perf_counter()
+        try:
+            result = await self._session.run(_maybe_profile(query), parameters, **kwargs)
+        except Exception:
+            metrics.record(name, (time.perf_counter() - start) * 1000, error=True)
+            raise
+        result = AsyncInstrumentedResult(result, name, start)
+        self._results.append(result)
+        return result
+
+    async def finish_pending(self):
+        for result in self._results:
+            await result._finish_async()
+        self._results = []
+
+    def _wrap(self, tx_fn):
+        name = None if getattr(tx_fn, "name_by_query", False) else _tx_name(tx_fn)
+
+        async def wrapped(tx, *args, **kwargs):
+            instrumented = AsyncInstrumentedTransaction(tx, name)
+            try:
+                return await tx_fn(instrumented, *args, **kwargs)
+            finally:
+                await instrumented.finish_pending()
+
+        wrapped.metadata = getattr(tx_fn, "metadata", None)
+        wrapped.timeout = getattr(tx_fn, "timeout", None)
+        return wrapped
+
+    async def execute_read(self, tx_fn, *args, **kwargs):
+        return await self._session.execute_read(self._wrap(tx_fn), *args, **kwargs)
+
+    async def execute_write(self, tx_fn, *args, **kwargs):
+        return await self._session.execute_write(self._wrap(tx_fn), *args, **kwargs)
+
+    def __getattr__(self, attr):
+        return getattr(self._session, attr)
+
+
+class AsyncInstrumentedDriver:
+
+    def __init__(self, driver):
+        self._driver = driver
+
+    def session(self, **config):
+        return AsyncInstrumentedSession(self._driver.session(**config))
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._driver.close()
+
+    def __getattr__(self, attr):
+        return getattr(self._driver, attr)
+
+
+# --- Prometheus endpoint ---
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = metrics.prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_server = {"value": None}
+_server_lock = threading.Lock()
+
+def start_metrics_server(port=None, host=None):
+    # Süreç başına tek sunucu; port yoksa (NEO4J_METRICS_PORT) başlatılmaz
+    port = port or METRICS_PORT
+    if not port:
+        return None
+    host = host or METRICS_HOST
+    with _server_lock:
+        if _server["value"] is None:
+            server = ThreadingHTTPServer((host, int(port)), _MetricsHandler)
+            threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+            _server["value"] = server
+        return _server["value"]
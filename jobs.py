@@ -0,0 +1,186 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+
+# Uzun süren algoritmaları Streamlit script thread'i dışında çalıştırır.
+# İşler process içinde yaşar; sayfa yeniden çalıştığında job id ile
+# durum/sonuç okunabilir. Aynı anda gönderilen aynı işler (aynı key) tek
+# çalıştırmada birleşir.
+#
+# İptal yalnızca bir bayraktır: iş report_progress / cancel_requested ile
+# bayrağı kontrol ettiğinde durur, sunucu tarafı için on_cancel çağrılır.
+# Alt süreçler bayrağı göremez; süreç havuzu kullanan iş (ör. betweenness
+# workers > 1) iptalde havuzu kendisi sonlandırmalıdır.
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+ACTIVE_STATES = (PENDING, RUNNING)
+
+# Çalışan işin kendisi; sorgu yardımcıları transaction metadata'sı ve
+# ilerleme bildirimi için buradan okur
+current_job = ContextVar("current_job", default=None)
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class Job:
+
+    def __init__(self, name, key):
+        self.id = uuid.uuid4().hex[:12]
+        self.name = name
+        self.key = key
+        self.status = PENDING
+        self.progress = None
+        self.message = None
+        self.result = None
+        self.error = None
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self._cancel = threading.Event()
+
+    @property
+    def elapsed(self):
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    @property
+    def tx_metadata(self):
+        return {"app_job_id": self.id}
+
+    def set_progress(self, fraction=None, message=None):
+        if fraction is not None:
+            self.progress = max(0.0, min(1.0, float(fraction)))
+        if message is not None:
+            self.message = message
+
+    def raise_if_cancelled(self):
+        if self._cancel.is_set():
+            raise JobCancelled(self.id)
+
+    def info(self):
+        return {
+            "id": self.id,
+            "name": self.name,
+            "status": self.status,
+            "progress": self.progress,
+            "message": self.message,
+            "elapsed": round(self.elapsed, 1),
+            "error": self.error,
+        }
+
+
+def cancel_requested():
+    # İş dışından çağrılırsa False
+    job = current_job.get()
+    return job is not None and job.cancelled
+
+
+def _default_key(name, args, kwargs):
+    # Hashlenebilir argümanlar anahtar olur; diğerlerinde (DataFrame, model,
+    # dizi) birleştirme yapılmaz, çağıran key= vermelidir
+    key = (name, args, tuple(sorted(kwargs.items())))
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def report_progress(fraction=None, message=None):
+    # İş dışından çağrılırsa sessizce yok sayılır
+    job = current_job.get()
+    if job is not None:
+        job.set_progress(fraction, message)
+        job.raise_if_cancelled()
+
+
+class JobRunner:
+
+    def __init__(self, max_workers=2, max_finished=50, on_cancel=None):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="graph-job")
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._max_finished = max_finished
+        self._on_cancel = on_cancel
+
+    def submit(self, name, fn, *args, key=None, **kwargs):
+        # key: aynı işi tanımlayan hashlenebilir değer; verilmezse argümanlardan
+        key = _default_key(name, args, kwargs) if key is None else (name, key)
+        with self._lock:
+            for job in self._jobs.values():
+                if key is not None and job.key == key and job.status in ACTIVE_STATES:
+                    return job.id
+
+            job = Job(name, key)
+            self._jobs[job.id] = job
+            self._prune()
+        self._executor.submit(self._run, job, fn, args, kwargs)
+        return job.id
+
+    def _run(self, job, fn, args, kwargs):
+        if job.cancelled:
+            job.status = CANCELLED
+            job.finished_at = time.time()
+            return
+
+        token = current_job.set(job)
+        job.status = RUNNING
+        job.started_at = time.time()
+        try:
+            job.result = fn(*args, **kwargs)
+            job.status = CANCELLED if job.cancelled else DONE
+            if job.status == DONE:
+                job.progress = 1.0
+        except JobCancelled:
+            job.status = CANCELLED
+        except Exception as e:
+            # İptal edilen sorgular veritabanı hatası olarak döner
+            job.status = CANCELLED if job.cancelled else FAILED
+            job.error = str(e)
+        finally:
+            job.finished_at = time.time()
+            current_job.reset(token)
+
+    def _prune(self):
+        finished = [j for j in self._jobs.values() if j.status not in ACTIVE_STATES]
+        for job in sorted(finished, key=lambda j: j.submitted_at)[:-self._max_finished or None]:
+            del self._jobs[job.id]
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def status(self, job_id):
+        job = self.get(job_id)
+        return job.info() if job else None
+
+    def result(self, job_id):
+        job = self.get(job_id)
+        return job.result if job and job.status == DONE else None
+
+    def cancel(self, job_id):
+        job = self.get(job_id)
+        if job is None or job.status not in ACTIVE_STATES:
+            return False
+        job._cancel.set()
+        if job.status == RUNNING and self._on_cancel is not None:
+            self._on_cancel(job)
+        return True
+
+    def jobs(self):
+        with self._lock:
+            return [job.info() for job in sorted(self._jobs.values(), key=lambda j: j.submitted_at, reverse=True)]
@@ -0,0 +1,102 @@
+import numpy as np
+from sklearn.base import BaseEstimator, RegressorMixin
+
+# Biased matrix factorization (Funk SVD):
+#   r(u, i) ~ mu + b_u + b_i + p_u . q_i
+# Seyrek puanlar üzerinde mini-batch SGD; her epoch puan sayısında doğrusal,
+# güncellemeler batch başına vektörel. Faktörler float32 tutulur.
+# Girdi diğer modellerle aynı: user_id, movie_id sütunları (LabelEncoder kodları).
+
+
+def _columns(X):
+    if hasattr(X, "columns"):
+        return X["user_id"].to_numpy(dtype=np.int64), X["movie_id"].to_numpy(dtype=np.int64)
+    X = np.asarray(X)
+    return X[:, 0].astype(np.int64), X[:, 1].astype(np.int64)
+
+
+class MatrixFactorization(BaseEstimator, RegressorMixin):
+
+    def __init__(self, n_factors=32, n_epochs=30, learning_rate=0.01, reg=0.05,
+                 batch_size=1024, init_std=0.1, random_state=42):
+        self.n_factors = n_factors
+        self.n_epochs = n_epochs
+        self.learning_rate = learning_rate
+        self.reg = reg
+        self.batch_size = batch_size
+        self.init_std = init_std
+        self.random_state = random_state
+
+    def fit(self, X, y):
+        users, items = _columns(X)
+        ratings = np.asarray(y, dtype=np.float32)
+        rng = np.random.default_rng(self.random_state)
+
+        n_users, n_items = int(users.max()) + 1, int(items.max()) + 1
+        self.global_mean_ = np.float32(ratings.mean())
+        self.user_bias_ = np.zeros(n_users, dtype=np.float32)
+        self.item_bias_ = np.zeros(n_items, dtype=np.float32)
+        self.user_factors_ = rng.normal(0, self.init_std, (n_users, self.n_factors)).astype(np.float32)
+        self.item_factors_ = rng.normal(0, self.init_std, (n_items, self.n_factors)).astype(np.float32)
+        # Kod aralığındaki ama eğitimde hiç geçmeyen kodların faktörleri rastgele kalır
+        self.user_seen_ = np.bincount(users, minlength=n_users) > 0
+        self.item_seen_ = np.bincount(items, minlength=n_items) > 0
+
+        lr, reg = np.float32(self.learning_rate), np.float32(self.reg)
+        self.train_rmse_ = []
+        for _ in range(self.n_epochs):
+            order = rng.permutation(len(ratings))
+            squared = 0.0
+            for start in range(0, len(order), self.batch_size):
+                batch = order[start:start + self.batch_size]
+                u, i, r = users[batch], items[batch], ratings[batch]
+                pu, qi = self.user_factors_[u], self.item_factors_[i]
+
+                err = r - (self.global_mean_ + self.user_bias_[u] + self.item_bias_[i]
+                           + np.einsum("ij,ij->i", pu, qi))
+                squared += float(err @ err)
+
+                # Aynı kullanıcı/film batch içinde birden fazla geçerse güncellemeler toplanır
+                np.add.at(self.user_bias_, u, lr * (err - reg * self.user_bias_[u]))
+                np.add.at(self.item_bias_, i, lr * (err - reg * self.item_bias_[i]))
+                np.add.at(self.user_factors_, u, lr * (err[:, None] * qi - reg * pu))
+                np.add.at(self.item_factors_, i, lr * (err[:, None] * pu - reg * qi))
+            self.train_rmse_.append(float(np.sqrt(squared / len(ratings))))
+        return self
+
+    def _known(self, users, items):
+        # Eğitimde görülmeyen kodlar faktörsüz skorlanır: global ortalama +
+        # bilinen taraf(lar)ın bias'ı
+        return self._seen(users, "user_seen_"), self._seen(items, "item_seen_")
+
+    def _seen(self, codes, attr):
+        seen = getattr(self, attr, None)
+        if seen is None:
+            # user_seen_/item_seen_ öncesi kaydedilmiş modeller
+            seen = np.ones(len(self.user_bias_ if attr == "user_seen_" else self.item_bias_), dtype=bool)
+        in_range = (codes >= 0) & (codes < len(seen))
+        return in_range & seen[np.where(in_range, codes, 0)]
+
+    def predict(self, X):
+        users, items = _columns(X)
+        known_u, known_i = self._known(users, items)
+        u, i = np.where(known_u, users, 0), np.where(known_i, items, 0)
+        scores = (self.global_mean_
+                  + np.where(known_u, self.user_bias_[u], 0)
+                  + np.where(known_i, self.item_bias_[i], 0)
+                  + np.where(known_u & known_i,
+                             np.einsum("ij,ij->i", self.user_factors_[u], self.item_factors_[i]), 0))
+        return scores.astype(np.float64)
+
+    def score_users(self, user_ids, movie_ids):
+        # (len(user_ids), len(movie_ids)) skor matrisi tek matris çarpımıyla
+        user_ids, movie_ids = np.asarray(user_ids), np.asarray(movie_ids)
+        known_u, known_i = self._known(user_ids, movie_ids)
+        u, i = np.where(known_u, user_ids, 0), np.where(known_i, movie_ids, 0)
+        P = self.user_factors_[u] * known_u[:, None]
+        Q = self.item_factors_[i] * known_i[:, None]
+        scores = (P @ Q.T
+                  + np.where(known_u, self.user_bias_[u], 0)[:, None]
+                  + np.where(known_i, self.item_bias_[i], 0)[None, :]
+                  + self.global_mean_)
+        return scores.astype(np.float64)
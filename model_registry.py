@@ -0,0 +1,145 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+import joblib
+
+# Eğitilen model/encoder setleri models/<zaman>-<hash>/ altında sürümlenir;
+# models/LATEST geçerli sürümü gösterir. Artefaktlar sıkıştırılmadan yazılır,
+# böylece büyük numpy dizileri (ağaç düğümleri, faktörler) mmap ile açılır ve
+# süreçler arasında sayfa önbelleği paylaşılır.
+
+MODELS_DIR = "models"
+LATEST_FILE = "LATEST"
+MANIFEST_FILE = "manifest.json"
+KEEP_VERSIONS = 5
+ENCODERS = ("user_encoder", "movie_encoder")
+
+
+def _file_hash(path, digest):
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+
+
+def _write_atomic(path, text):
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or ".")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+def save_version(models, user_enc, movie_enc, metrics=None, root=MODELS_DIR, keep=KEEP_VERSIONS):
+    os.makedirs(root, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=".staging-", dir=root)
+
+    artifacts = dict(models)
+    artifacts["user_encoder"] = user_enc
+    artifacts["movie_encoder"] = movie_enc
+
+    files = {}
+    digest = hashlib.sha256()
+    for name in sorted(artifacts):
+        filename = f"{name}.joblib"
+        path = os.path.join(staging, filename)
+        joblib.dump(artifacts[name], path)
+        _file_hash(path, digest)
+        files[name] = filename
+
+    content_hash = digest.hexdigest()
+    version = f"{time.strftime('%Y%m%d-%H%M%S')}-{content_hash[:8]}"
+    manifest = {
+        "version": version,
+        "created_at": time.time(),
+        "hash": content_hash,
+        "models": sorted(models),
+        "files": files,
+        "metrics": metrics or [],
+    }
+    with open(os.path.join(staging, MANIFEST_FILE), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    os.replace(staging, os.path.join(root, version))
+    _write_atomic(os.path.join(root, LATEST_FILE), version)
+    _prune_versions(root, keep)
+    return version
+
+
+def list_versions(root=MODELS_DIR):
+    if not os.path.isdir(root):
+        return []
+    return sorted(d for d in os.listdir(root)
+                  if os.path.isfile(os.path.join(root, d, MANIFEST_FILE)))
+
+
+def _prune_versions(root, keep):
+    for version in list_versions(root)[:-keep or None]:
+        shutil.rmtree(os.path.join(root, version), ignore_errors=True)
+
+
+def latest_version(root=MODELS_DIR):
+    try:
+        with open(os.path.join(root, LATEST_FILE), encoding="utf-8") as f:
+            version = f.read().strip()
+        if os.path.isfile(os.path.join(root, version, MANIFEST_FILE)):
+            return version
+    except FileNotFoundError:
+        pass
+    versions = list_versions(root)
+    return versions[-1] if versions else None
+
+
+def load_version(version, root=MODELS_DIR, mmap_mode="r"):
+    directory = os.path.join(root, version)
+    with open(os.path.join(directory, MANIFEST_FILE), encoding="utf-8") as f:
+        manifest = json.load(f)
+    loaded = {name: joblib.load(os.path.join(directory, filename), mmap_mode=mmap_mode)
+              for name, filename in manifest["files"].items()}
+    models = {name: loaded[name] for name in manifest["models"]}
+    return models, loaded["user_encoder"], loaded["movie_encoder"], manifest
+
+
+class ModelRegistry:
+    # Süreç başına tek yükleme; diskte daha yeni sürüm görünürse onu yükler.
+    # Versiyonlu dizin yoksa eski düz .pkl dosyalarına düşer.
+
+    def __init__(self, root=MODELS_DIR, legacy_files=None, legacy_encoders=None):
+        self.root = root
+        self.legacy_files = legacy_files or {}
+        self.legacy_encoders = legacy_encoders
+        self._lock = threading.Lock()
+        self._loaded = None
+
+    def _load_legacy(self):
+        # Encoder'lar ve en az bir model yeterli: eski kurulumlarda sonradan
+        # eklenen modellerin (ör. MatrixFactorization) dosyası yoktur
+        if not self.legacy_encoders or not all(os.path.exists(p) for p in self.legacy_encoders):
+            return None
+        present = {name: path for name, path in self.legacy_files.items() if os.path.exists(path)}
+        if not present:
+            return None
+        models = {name: joblib.load(path) for name, path in present.items()}
+        user_path, movie_path = self.legacy_encoders
+        manifest = {"version": "legacy", "models": sorted(models), "metrics": []}
+        return models, joblib.load(user_path), joblib.load(movie_path), manifest
+
+    def get(self):
+        # (models, user_enc, movie_enc, manifest) ya da hiç model yoksa None
+        version = latest_version(self.root)
+        with self._lock:
+            current = self._loaded
+            if current is not None and (version is None or current[3]["version"] == version):
+                return current
+            if version is not None:
+                self._loaded = load_version(version, self.root)
+            elif current is None:
+                self._loaded = self._load_legacy()
+            return self._loaded
+
+    @property
+    def version(self):
+        return self._loaded[3]["version"] if self._loaded else None
@@ -1,4 +1,5 @@
-from neo4j import GraphDatabase
+from neo4j import Query, unit_of_work
+from neo4j.exceptions import ClientError
 import pandas as pd
 from sklearn.preprocessing import LabelEncoder
 from sklearn.ensemble import RandomForestRegressor
@@ -7,16 +8,258 @@ from sklearn.neighbors import KNeighborsRegressor
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_squared_error, r2_score, mean_absolute_error 
 import joblib
+from matrix_factorization import MatrixFactorization
+from model_registry import save_version
+from connection import get_connection_manager, open_session
+from jobs import current_job, report_progress
 import numpy as np
+from scipy import sparse
+import csv
+import io
+import json
+import os
+import random
+import re
+import tempfile
+import threading
+import time
+
+# Tek pooled driver; bağlantı ayarları connection.py'de (NEO4J_* ortam değişkenleri)
+driver = get_connection_manager().driver
+
+
+########## GRAPH VERSION ##########
+
+# Label / ilişki tipi başına yazma sayacı. Yazma fonksiyonları ilgili
+# anahtarları artırır; türetilmiş sonuçlar (istatistik, leaderboard,
+# projeksiyon, model) hesaplandıkları versiyonu saklayıp tekrar kullanır.
+#
+# Sınırlama: sayaçlar process içindedir. Başka bir Streamlit process'i,
+# replika, benchmark ya da cypher-shell ile yapılan yazmalar sayacı
+# değiştirmez. Bu yüzden her tüketici versiyon eşleşse bile sonucu en fazla
+# bir TTL süresi kullanır (graph_cache_fresh; istatistikler ve rating cache
+# kendi TTL'lerini uygular).
+ALL_GRAPH = "*"
+# Snapshot ve GDS projeksiyonu gibi pahalı sonuçlar için üst sınır (saniye)
+GRAPH_CACHE_TTL_SECONDS = 300
+
+_graph_versions = {}
+_graph_version_lock = threading.Lock()
+
+def bump_graph_version(*keys):
+    # Argümansız çağrı: neyin değiştiği bilinmiyor, her şey geçersiz
+    with _graph_version_lock:
+        for key in keys or (ALL_GRAPH,):
+            _graph_versions[key] = _graph_versions.get(key, 0) + 1
+
+def get_graph_version(*keys):
+    # Sayaçlar yalnızca artar, bu yüzden toplam da ancak bir yazma ile değişir
+    with _graph_version_lock:
+        if not keys:
+            return sum(_graph_versions.values())
+        return _graph_versions.get(ALL_GRAPH, 0) + sum(_graph_versions.get(k, 0) for k in keys)
+
+def graph_cache_fresh(built_at, ttl=GRAPH_CACHE_TTL_SECONDS):
+    # built_at: time.time(); dışarıdan yazmalar için yeniden doğrulama sınırı
+    return built_at is not None and time.time() - built_at < ttl
+
+def bumps(keys):
+    # Yazma tx fonksiyonunun etkilediği anahtarlar: sabit tuple ya da
+    # tx argümanlarından anahtar üreten fonksiyon. () -> her şey
+    def decorate(tx_fn):
+        tx_fn.graph_keys = keys
+        return tx_fn
+    return decorate
+
+def _graph_keys(tx_fn, args):
+    keys = getattr(tx_fn, "graph_keys", ())
+    return keys(*args) if callable(keys) else keys
+
+def run_write(driver, tx_fn, *args):
+    # Versiyon commit'ten sonra artırılır: okuyucular eski veriyi yeni
+    # versiyonla cache'leyemez, retry'lar ve rollback'ler sayacı değiştirmez
+    with open_session(driver) as session:
+        result = session.execute_write(tx_fn, *args)
+    bump_graph_version(*_graph_keys(tx_fn, args))
+    return result
+
+
+########## BACKGROUND JOBS ##########
+
+# jobs.JobRunner içinde çalışan sorgular job id ile etiketlenir; böylece
+# iptal edilen işin transaction'ı sunucuda sonlandırılabilir.
+
+def _job_tx(tx_fn):
+    job = current_job.get()
+    if job is None:
+        return tx_fn
+    wrapped = unit_of_work(metadata=job.tx_metadata)(tx_fn)
+    wrapped.__wrapped__ = tx_fn  # metriklerde asıl fonksiyon adı görünsün
+    return wrapped
+
+def _job_query(query):
+    job = current_job.get()
+    return Query(query, metadata=job.tx_metadata) if job else query
+
+def terminate_job_transactions(job_id, driver=None):
+    with open_session(driver) as session:
+        ids = [r["transactionId"] for r in session.run("""
+            SHOW TRANSACTIONS YIELD transactionId, metaData
+            WHERE metaData.app_job_id = $job_id
+            RETURN transactionId
+        """, job_id=job_id)]
+        if ids:
+            session.run("TERMINATE TRANSACTIONS $ids", ids=ids).consume()
+    return ids
+
+
+########## SCHEMA ##########
+
+# MERGE/MATCH anahtarları: (isim, label, property)
+SCHEMA_CONSTRAINTS = [
+    ("person_name_unique", "Person", "name"),
+    ("movie_title_unique", "Movie", "title"),
+    ("user_username_unique", "User", "username"),
+    ("genre_name_unique", "Genre", "name"),
+]
+
+# Rating cache'in artımlı sorguları için: (isim, desen, property)
+SCHEMA_INDEXES = [
+    ("rated_updated_at_index", "()-[r:RATED]-()", "r.updated_at"),
+    ("user_ratings_deleted_at_index", "(n:User)", "n.ratings_deleted_at"),
+    ("movie_ratings_deleted_at_index", "(n:Movie)", "n.ratings_deleted_at"),
+]
+
+def _schema_names(session):
+    constraints = {r["name"] for r in session.run("SHOW CONSTRAINTS YIELD name")}
+    indexes = {r["name"] for r in session.run("SHOW INDEXES YIELD name")}
+    return constraints, indexes
+
+def _create_schema(session, query):
+    # IF NOT EXISTS no-op olduğunda sayaçlar sıfır kalır
+    counters = session.run(query).consume().counters
+    return counters.constraints_added + counters.indexes_added > 0
+
+def ensure_schema(driver):
+    # Idempotent: IF NOT EXISTS ile tekrar çalıştırmak güvenli
+    report = {"created": [], "existing": [], "fallback_index": [], "failed": []}
+
+    with open_session(driver) as session:
+        constraints, indexes = _schema_names(session)
+
+        for name, label, prop in SCHEMA_CONSTRAINTS:
+            index_name = f"{label.lower()}_{prop}_index"
+            if name in constraints:
+                report["existing"].append(name)
+                continue
+            if index_name in indexes:
+                report["existing"].append(index_name)
+                continue
+
+            try:
+                added = _create_schema(session,
+                    f"CREATE CONSTRAINT {name} IF NOT EXISTS "
+                    f"FOR (n:{label}) REQUIRE n.{prop} IS UNIQUE"
+                )
+                report["created" if added else "existing"].append(name)
+            except Exception as e:
+                # Mevcut veride tekrar eden değerler varsa constraint kurulamaz,
+                # bu durumda sadece range index oluştur
+                try:
+                    added = _create_schema(session,
+                        f"CREATE RANGE INDEX {index_name} IF NOT EXISTS "
+                        f"FOR (n:{label}) ON (n.{prop})"
+                    )
+                    report["fallback_index" if added else "existing"].append(index_name)
+                except Exception:
+                    report["failed"].append({"name": name, "error": str(e)})
+
+        for name, pattern, prop in SCHEMA_INDEXES:
+            if name in indexes:
+                report["existing"].append(name)
+                continue
+            try:
+                added = _create_schema(session, f"CREATE RANGE INDEX {name} IF NOT EXISTS FOR {pattern} ON ({prop})")
+                report["created" if added else "existing"].append(name)
+            except Exception as e:
+                report["failed"].append({"name": name, "error": str(e)})
+
+        if SEARCH_INDEX in indexes:
+            report["existing"].append(SEARCH_INDEX)
+        else:
+            try:
+                added = _create_schema(session, f"""
+                    CREATE FULLTEXT INDEX {SEARCH_INDEX} IF NOT EXISTS
+                    FOR (n:Person|Movie|Genre|User) ON EACH [n.name, n.title, n.username]
+                """)
+                report["created" if added else "existing"].append(SEARCH_INDEX)
+            except ClientError as e:
+                # search_nodes bu durumda taramaya düşer
+                report["failed"].append({"name": SEARCH_INDEX, "error": str(e)})
+
+    return report
+
+
+########## NODE SEARCH ##########
+
+SEARCH_INDEX = "node_search"
+LUCENE_SPECIAL = re.compile(r'([+\-&|!(){}\[\]^"~*?:\\/])')
+# Index yok / henüz online değil; sözdizimi hataları bu listede yok
+FULLTEXT_UNAVAILABLE = ("no such fulltext schema index", "not online", "populating")
+
+def _fulltext_query(term):
+    # Her kelime için prefix araması: "matr rel" -> "matr* AND rel*"
+    # Küçük harf: AND/OR/NOT kelimeleri operatör olarak yorumlanmasın
+    tokens = [LUCENE_SPECIAL.sub(r"\\\1", t.lower()) for t in term.split()]
+    return " AND ".join(f"{t}*" for t in tokens)
+
+def _fulltext_unavailable(error):
+    message = (error.message or "").lower()
+    return any(reason in message for reason in FULLTEXT_UNAVAILABLE)
+
+SEARCH_FULLTEXT_QUERY = f"""
+    CALL db.index.fulltext.queryNodes('{SEARCH_INDEX}', $query)
+    YIELD node, score
+    WHERE $labels IS NULL OR any(lbl IN labels(node) WHERE lbl IN $labels)
+    RETURN elementId(node) AS id, labels(node) AS labels, node AS n, score
+    SKIP $skip LIMIT $limit
+"""
+
+SEARCH_SCAN_QUERY = """
+    MATCH (n)
+    WHERE ($labels IS NULL OR any(lbl IN labels(n) WHERE lbl IN $labels))
+      AND (toLower(n.name) CONTAINS toLower($term)
+           OR toLower(n.title) CONTAINS toLower($term)
+           OR toLower(n.username) CONTAINS toLower($term))
+    RETURN elementId(n) AS id, labels(n) AS labels, n, null AS score
+    SKIP $skip LIMIT $limit
+"""
+
+def search_nodes_fulltext(tx, term, labels=None, skip=0, limit=10):
+    result = tx.run(SEARCH_FULLTEXT_QUERY, query=_fulltext_query(term), labels=labels or None, skip=skip, limit=limit)
+    return [record.data() for record in result]
 
-uri = "bolt://localhost:7687"
-username = "neo4j"
-password = "password"
+def search_nodes_scan(tx, term, labels=None, skip=0, limit=10):
+    result = tx.run(SEARCH_SCAN_QUERY, term=term, labels=labels or None, skip=skip, limit=limit)
+    return [record.data() for record in result]
 
-driver = GraphDatabase.driver(uri, auth=(username, password))
+def search_nodes(driver, term, labels=None, page=0, page_size=10):
+    term = term.strip()
+    if not term:
+        return []
+    skip = page * page_size
+    with open_session(driver) as session:
+        try:
+            return session.execute_read(search_nodes_fulltext, term, labels, skip, page_size)
+        except ClientError as e:
+            # Fulltext index yoksa (ya da henüz online değilse) eski tarama
+            if not _fulltext_unavailable(e):
+                raise
+            return session.execute_read(search_nodes_scan, term, labels, skip, page_size)
 
 
 # Kişi ekle
+@bumps(("Person",))
 def add_movie_person(tx, name, age, gender, roles):
     tx.run("""
         MERGE (p:Person {name: $name})
@@ -26,12 +269,14 @@ def add_movie_person(tx, name, age, gender, roles):
     """, name=name, age=age, gender=gender, roles=roles)
 
 # Add user
+@bumps(("User",))
 def add_user(tx, username):
     tx.run("""
         MERGE (u:User {username: $username})
     """, username=username)
 
 # Film ekle
+@bumps(("Movie", "Genre", "IN_GENRE"))
 def add_movie_with_genres(tx, title, year, genres):
     tx.run("""
         MERGE (m:Movie {title: $title})
@@ -50,6 +295,7 @@ def add_movie_with_genres(tx, title, year, genres):
 
 
 # Oyunculuğu bağla
+@bumps(lambda person_name, movie_title, roles: roles)
 def link_movieperson_to_movie(tx, person_name, movie_title, roles):
     for role in roles:
         tx.run(f"""
@@ -59,33 +305,167 @@ def link_movieperson_to_movie(tx, person_name, movie_title, roles):
         """, person_name=person_name, movie_title=movie_title)
 
 # User - Rate Movie ilişkisini oluştur
+@bumps(("User", "Movie", "RATED"))
 def rate_movie(tx, username, movie_title, score):
     tx.run("""
         MERGE (u:User {username: $username})
         MERGE (m:Movie {title: $movie_title})
         MERGE (u)-[r:RATED]->(m)
-        SET r.score = $score
+        SET r.score = $score, r.updated_at = timestamp()
     """, username=username, movie_title=movie_title, score=score)
 
 
+# --- Batch (UNWIND) write helpers ---
+# Her fonksiyon satır listesi alır ve chunk başına tek sorgu gönderir.
+
+BATCH_SIZE = 1000
+REL_TYPE_PATTERN = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+def _chunks(rows, size):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+def _run_batches(driver, tx_fn, rows, batch_size):
+    rows = list(rows)
+    batches = 0
+    start = time.perf_counter()
+    with open_session(driver) as session:
+        for chunk in _chunks(rows, batch_size):
+            session.execute_write(tx_fn, chunk)
+            # Her chunk ayrı commit; versiyon commit'ten sonra artar
+            bump_graph_version(*_graph_keys(tx_fn, (chunk,)))
+            batches += 1
+    seconds = time.perf_counter() - start
+    return {
+        "rows": len(rows),
+        "batches": batches,
+        "seconds": round(seconds, 3),
+        "rows_per_sec": round(len(rows) / seconds, 1) if seconds > 0 else None,
+    }
+
+@bumps(("Person",))
+def _add_movie_people_batch(tx, rows):
+    tx.run("""
+        UNWIND $rows AS row
+        MERGE (p:Person {name: row.name})
+        SET p.age = row.age,
+            p.gender = row.gender,
+            p.roles = row.roles
+    """, rows=rows)
+
+@bumps(("Movie", "Genre", "IN_GENRE"))
+def _add_movies_with_genres_batch(tx, rows):
+    tx.run("""
+        UNWIND $rows AS row
+        MERGE (m:Movie {title: row.title})
+        SET m.year = row.year,
+            m.genres = row.genres
+        WITH m, row
+        UNWIND coalesce(row.genres, []) AS genre
+        MERGE (g:Genre {name: genre})
+        MERGE (m)-[:IN_GENRE]->(g)
+    """, rows=rows)
+
+@bumps(lambda rows: {row["role"] for row in rows})
+def _link_people_to_movies_batch(tx, rows):
+    # İlişki tipi parametre olamaz; her tip için tek UNWIND sorgusu
+    by_role = {}
+    for row in rows:
+        by_role.setdefault(row["role"], []).append(row)
+
+    for role, role_rows in by_role.items():
+        tx.run(f"""
+            UNWIND $rows AS row
+            MATCH (p:Person {{name: row.person_name}})
+            MATCH (m:Movie {{title: row.movie_title}})
+            MERGE (p)-[r:{role}]->(m)
+        """, rows=role_rows)
+
+@bumps(("User", "Movie", "RATED"))
+def _rate_movies_batch(tx, rows):
+    tx.run("""
+        UNWIND $rows AS row
+        MERGE (u:User {username: row.username})
+        MERGE (m:Movie {title: row.movie_title})
+        MERGE (u)-[r:RATED]->(m)
+        SET r.score = row.score, r.updated_at = timestamp()
+    """, rows=rows)
+
+def add_movie_people(driver, people, batch_size=BATCH_SIZE):
+    rows = [{
+        "name": p["name"],
+        "age": p.get("age"),
+        "gender": p.get("gender"),
+        "roles": p.get("roles", []),
+    } for p in people]
+    return _run_batches(driver, _add_movie_people_batch, rows, batch_size)
+
+def add_movies_with_genres(driver, movies, batch_size=BATCH_SIZE):
+    rows = [{
+        "title": m["title"],
+        "year": m.get("year"),
+        "genres": list(m.get("genres", [])),
+    } for m in movies]
+    return _run_batches(driver, _add_movies_with_genres_batch, rows, batch_size)
+
+def link_people_to_movies(driver, links, batch_size=BATCH_SIZE):
+    # links: {"person_name", "movie_title", "roles"} -> rol başına bir satır
+    rows = []
+    for link in links:
+        for role in link["roles"]:
+            if not REL_TYPE_PATTERN.fullmatch(role):
+                raise ValueError(f"Invalid relationship type: {role!r}")
+            rows.append({
+                "person_name": link["person_name"],
+                "movie_title": link["movie_title"],
+                "role": role,
+            })
+    # Aynı tipteki satırlar aynı chunk'a düşsün diye tipe göre sırala
+    rows.sort(key=lambda row: row["role"])
+    return _run_batches(driver, _link_people_to_movies_batch, rows, batch_size)
+
+def rate_movies(driver, ratings, batch_size=BATCH_SIZE):
+    rows = [{
+        "username": r["username"],
+        "movie_title": r["movie_title"],
+        "score": r["score"],
+    } for r in ratings]
+    return _run_batches(driver, _rate_movies_batch, rows, batch_size)
+
+
 # --- Delete helpers ---
+@bumps(("Person", "ACTED_IN", "DIRECTED", "PRODUCED"))
 def delete_person(tx, name):
     tx.run("MATCH (p:Person {name: $name}) DETACH DELETE p", name=name)
 
+@bumps(("User", "RATED"))
 def delete_user(tx, username):
-    tx.run("MATCH (u:User {username: $username}) DETACH DELETE u", username=username)
+    # Puanladığı filmler işaretlenir; rating cache bu filmlerin puanlarını yeniden çeker
+    tx.run("""
+        MATCH (u:User {username: $username})
+        CALL { WITH u MATCH (u)-[:RATED]->(m:Movie) SET m.ratings_deleted_at = timestamp() }
+        DETACH DELETE u
+    """, username=username)
 
+@bumps(("Movie", "ACTED_IN", "DIRECTED", "PRODUCED", "IN_GENRE", "RATED"))
 def delete_movie(tx, title):
-    tx.run("MATCH (m:Movie {title: $title}) DETACH DELETE m", title=title)
+    tx.run("""
+        MATCH (m:Movie {title: $title})
+        CALL { WITH m MATCH (u:User)-[:RATED]->(m) SET u.ratings_deleted_at = timestamp() }
+        DETACH DELETE m
+    """, title=title)
 
+@bumps(())
 def delete_all(tx):
     tx.run("MATCH (n) DETACH DELETE n")
 
+@bumps(("RATED",))
 def delete_user_relationship(tx, source_name, target_title):
     result = tx.run(
         """
         MATCH (u:User {username: $source_name})-[r:RATED]->(m:Movie {title: $target_title})
-        WITH r, r.score AS score
+        WITH u, r, r.score AS score
+        SET u.ratings_deleted_at = timestamp()
         DELETE r
         RETURN count(r) AS deleted_count, score
         """,
@@ -100,6 +480,7 @@ def delete_user_relationship(tx, source_name, target_title):
 
 
 
+@bumps(lambda source_name, target_title, rel_type: (rel_type,))
 def delete_person_relationship(tx, source_name, target_title, rel_type):
     result = tx.run(
         """
@@ -119,97 +500,157 @@ def delete_person_relationship(tx, source_name, target_title, rel_type):
         return {"status": "not_found"}
 
 
-def find_most_acted(tx):
+########## LEADERBOARDS ##########
+
+def find_most_acted(tx, limit=10, genre=None):
     result = tx.run(
         """
         MATCH (p:Person)-[:ACTED_IN]->(m:Movie)
+        WHERE $genre IS NULL OR (m)-[:IN_GENRE]->(:Genre {name: $genre})
         RETURN p.name AS Actor, COUNT(m) AS MovieCount
         ORDER BY MovieCount DESC
-        LIMIT 10
+        LIMIT $limit
         """,
-    ).single()
-
-    if result:
-        return {"name": result["person_name"], "acted_count": result["acted_count"]}
-    else:
-        return None
+        limit=limit, genre=genre,
+    )
+    return [record.data() for record in result]
 
 
-def genre_movie_count(tx):
+def genre_movie_count(tx, limit=10, min_year=None):
     result = tx.run(
         """
         MATCH (m:Movie)-[:IN_GENRE]->(g:Genre)
+        WHERE $min_year IS NULL OR m.year >= $min_year
         RETURN g.name AS Genre, COUNT(m) AS Count
         ORDER BY Count DESC
+        LIMIT $limit
         """,
-    ).single()
-
-    if result:
-        return {"name": result["genre_name"], "movie_count": result["movie_count"]}
-    else:
-        return None
+        limit=limit, min_year=min_year,
+    )
+    return [record.data() for record in result]
 
-def highest_ratings(tx):
+def highest_ratings(tx, limit=10, min_ratings=1, genre=None):
     result = tx.run(
         """
         MATCH (u:User)-[r:RATED]->(m:Movie)
-        RETURN m.title AS Movie, avg(r.score) AS AvgRating, count(*) AS RatingCount
+        WHERE $genre IS NULL OR (m)-[:IN_GENRE]->(:Genre {name: $genre})
+        WITH m, avg(r.score) AS AvgRating, count(*) AS RatingCount
+        WHERE RatingCount >= $min_ratings
+        RETURN m.title AS Movie, AvgRating, RatingCount
         ORDER BY AvgRating DESC
-        LIMIT 10
+        LIMIT $limit
         """,
-    ).single()
-
-    if result:
-        return {"title": result["movie_title"], "avg_rating": result["avg_rating"]}
-    else:
-        return None
+        limit=limit, min_ratings=min_ratings, genre=genre,
+    )
+    return [record.data() for record in result]
 
-def most_related_movies(tx):
+def most_related_movies(tx, limit=10, genre=None):
     result = tx.run(
         """
         MATCH (m:Movie)<-[r]-(p:Person)
+        WHERE $genre IS NULL OR (m)-[:IN_GENRE]->(:Genre {name: $genre})
         RETURN m.title AS Movie, COUNT(r) AS TotalLinks
         ORDER BY TotalLinks DESC
-        LIMIT 10
-
+        LIMIT $limit
         """,
-    ).single()
-
-    if result:
-        return {"title": result["movie_title"], "rating_count": result["rating_count"]}
-    else:
-        return None
+        limit=limit, genre=genre,
+    )
+    return [record.data() for record in result]
     
 
-def acted_together(tx):
+def acted_together(tx, limit=10):
+    # elementId karşılaştırması her çifti bir kez sayar (p1 <> p2 iki kez sayıyordu)
     result = tx.run(
         """
         MATCH (p1:Person)-[:ACTED_IN]->(m:Movie)<-[:ACTED_IN]-(p2:Person)
-        WHERE p1 <> p2
+        WHERE elementId(p1) < elementId(p2)
         RETURN p1.name AS Actor1, p2.name AS Actor2, COUNT(m) AS SharedMovies
         ORDER BY SharedMovies DESC
-        LIMIT 10
+        LIMIT $limit
         """,
-    ).single()
+        limit=limit,
+    )
+    return [record.data() for record in result]
 
-    if result:
-        return {"actor1": result["actor1_name"], "actor2": result["actor2_name"], "shared_movies": result["shared_movies_count"]}
-    else:
-        return None   
 
+# İsim -> (sorgu, bağlı olduğu label ve ilişki tipleri)
+LEADERBOARDS = {
+    "Most active actors":     (find_most_acted,     {"Person", "Movie", "Genre", "ACTED_IN", "IN_GENRE"}),
+    "Movies per genre":       (genre_movie_count,   {"Movie", "Genre", "IN_GENRE"}),
+    "Highest rated movies":   (highest_ratings,     {"User", "Movie", "Genre", "RATED", "IN_GENRE"}),
+    "Most connected movies":  (most_related_movies, {"Person", "Movie", "Genre", "ACTED_IN", "DIRECTED", "PRODUCED", "IN_GENRE"}),
+    "Actors acting together": (acted_together,      {"Person", "Movie", "ACTED_IN"}),
+}
 
-def get_degree_distribution():
-    from neo4j import GraphDatabase
-    driver = GraphDatabase.driver("bolt://localhost:7687", auth=("neo4j", "password"))
+_leaderboard_cache = {}
+_leaderboard_lock = threading.Lock()
+# Leaderboard sorguları ucuz; dışarıdan yazmalar en geç bu sürede görünür
+LEADERBOARD_TTL_SECONDS = 60
 
-    with driver.session() as session:
-        result = session.run("""
-            MATCH (n)
-            RETURN COUNT { (n)--() } AS degree
-            ORDER BY degree DESC
-            LIMIT 10
-        """)
-        return [record["degree"] for record in result]
+def get_leaderboard(driver, name, limit=10, **filters):
+    # Bağlı olunan label'lardan biri yazılana (ya da TTL dolana) kadar sonuç yeniden kullanılır
+    query_fn, depends_on = LEADERBOARDS[name]
+    key = (name, limit, tuple(sorted(filters.items())))
+    version = get_graph_version(*depends_on)
+
+    with _leaderboard_lock:
+        cached = _leaderboard_cache.get(key)
+    if cached is not None and cached[0] == version and graph_cache_fresh(cached[2], LEADERBOARD_TTL_SECONDS):
+        return cached[1]
+
+    built_at = time.time()
+    with open_session(driver) as session:
+        df = pd.DataFrame(session.execute_read(query_fn, limit, **filters))
+
+    with _leaderboard_lock:
+        _leaderboard_cache[key] = (version, df, built_at)
+    return df
+
+
+DEGREE_GROUPINGS = {
+    "label": """
+        MATCH (n)
+        WITH labels(n)[0] AS grp, COUNT { (n)--() } AS degree
+    """,
+    "rel_type": """
+        MATCH (n)-[r]-()
+        WITH n, type(r) AS grp, count(r) AS degree
+    """,
+    None: """
+        MATCH (n)
+        WITH 'All' AS grp, COUNT { (n)--() } AS degree
+    """,
+}
+
+DEGREE_BUCKETS = """
+    WITH grp, CASE WHEN $log
+                   THEN toInteger(floor(log(degree + 1) / log(2) + 1e-9))
+                   ELSE degree / $width END AS bucket
+    RETURN grp AS group, bucket, count(*) AS nodes
+    ORDER BY group, bucket
+"""
+
+def _degree_bucket_bounds(rows, log, width):
+    for row in rows:
+        b = row["bucket"]
+        row["bucket_start"] = 2 ** b - 1 if log else b * width
+        row["bucket_end"] = 2 ** (b + 1) - 2 if log else (b + 1) * width - 1
+    return rows
+
+def get_degree_distribution(bucketing="log", group_by="label", width=10, driver=None):
+    # Histogram sunucuda çıkarılır; istemciye yalnızca kova sayıları gelir.
+    # log: 2'nin kuvvetleri [0], [1-2], [3-6], ... ; linear: width genişliğinde
+    query = DEGREE_GROUPINGS[group_by] + DEGREE_BUCKETS
+    log = bucketing == "log"
+
+    def run_tx(tx):
+        result = tx.run(query, log=log, width=width)
+        return [record.data() for record in result]
+
+    with open_session(driver) as session:
+        rows = session.execute_read(_job_tx(run_tx))
+
+    return _degree_bucket_bounds(rows, log, width)
 
 
 
@@ -221,11 +662,12 @@ def run_louvain_community_detection(driver, graph_name):
     YIELD communityCount, modularity, modularities
     """
     def run_tx(tx):
-        result = tx.run(query)
-        return result.single().data()
+        return tx.run(query).single().data()
 
-    with driver.session() as session:
-        return session.execute_write(run_tx)
+    with open_session(driver) as session:
+        summary = session.execute_write(_job_tx(run_tx))
+    bump_graph_version("community")
+    return summary
 
 def get_community_data(tx):
     query = """
@@ -281,7 +723,7 @@ def node_similarity(tx):
     
 
 def get_communities(driver):
-    with driver.session() as session:
+    with open_session(driver) as session:
         result = session.run("""
             MATCH (n)
             WHERE n.community IS NOT NULL
@@ -294,16 +736,22 @@ def get_communities(driver):
 
 #### LINK PREDICTION ####
 
+# Seçim kutuları için; movie_title_unique index'i sırayı verir
+MOVIE_TITLES_QUERY = "MATCH (m:Movie) WHERE m.title IS NOT NULL RETURN m.title AS title ORDER BY title"
+
+def get_movie_titles(tx):
+    return [record["title"] for record in tx.run(MOVIE_TITLES_QUERY)]
+
 def getAllData():
     query = """
     MATCH (u:User)-[r:RATED]->(m:Movie)
     RETURN 
-        COALESCE(u.name, u.title) AS user, 
-        COALESCE(m.title, m.name) AS movie, 
-        r.rating AS rating
+        u.username AS user, 
+        m.title AS movie, 
+        r.score AS rating
     """
 
-    with driver.session() as session:
+    with open_session(driver) as session:
         results = session.run(query)
         records = [dict(record) for record in results]
 
@@ -314,6 +762,7 @@ MODEL_FILES = {
     "RandomForest": "RandomForest.pkl",
     "Ridge":        "Ridge.pkl",
     "KNN":          "KNN.pkl",
+    "MatrixFactorization": "MatrixFactorization.pkl",
 }
 USER_ENC_FILE  = "user_encoder.pkl"
 MOVIE_ENC_FILE = "movie_encoder.pkl"
@@ -335,6 +784,7 @@ def encodeTrainTest(df):
         "RandomForest": RandomForestRegressor(n_estimators=100, random_state=42),
         "Ridge":        Ridge(alpha=1.0),
         "KNN":          KNeighborsRegressor(n_neighbors=5),
+        "MatrixFactorization": MatrixFactorization(),
     }
 
     results = []
@@ -363,12 +813,8 @@ def encodeTrainTest(df):
         temp['movie']     = movie_enc.inverse_transform(temp['movie_id'])
         comparison_dfs[name] = temp[['user','movie','actual','predicted']]
 
-        # her modeli ayrı dosyaya kaydet
-        joblib.dump(mdl, MODEL_FILES[name])
-
-    # encoder çiftini de kaydet
-    joblib.dump(user_enc,  USER_ENC_FILE)
-    joblib.dump(movie_enc, MOVIE_ENC_FILE)
+    # modelleri + encoder'ları yeni bir sürüm olarak kaydet (models/<zaman>-<hash>)
+    save_version(models, user_enc, movie_enc, metrics=results)
 
     # sonuçları JSON'a yaz
     results_df = pd.DataFrame(results)
@@ -376,23 +822,37 @@ def encodeTrainTest(df):
 
     return models, user_enc, movie_enc
 
-def recommend_movies(user_name, model, df, user_enc, movie_enc, top_n=10):
-    # Eğer henüz encode edilmemişse, hemen sütunları ekleyelim
+def _encode_known(encoder, labels):
+    # Eğitimden sonra eklenen kullanıcı/filmler -1 olur (transform hata verirdi)
+    return pd.Index(encoder.classes_).get_indexer(labels)
+
+def _encode_ratings(df, user_enc, movie_enc):
+    # Rating cache eğitimden yeni satırlar içerebilir; bilinmeyen uçlar -1
     if 'user_id' not in df.columns or 'movie_id' not in df.columns:
         df = df.copy()
-        df['user_id']  = user_enc.transform(df['user'])
-        df['movie_id'] = movie_enc.transform(df['movie'])
+        df['user_id']  = _encode_known(user_enc, df['user'])
+        df['movie_id'] = _encode_known(movie_enc, df['movie'])
+    return df
 
-    user_id = user_enc.transform([user_name])[0]
-    rated   = df[df['user_id'] == user_id]['movie_id'].unique()
-    all_movies = df['movie_id'].unique()
-    unrated = [m for m in all_movies if m not in rated]
+def recommend_movies(user_name, model, df, user_enc, movie_enc, top_n=10):
+    # Eğer henüz encode edilmemişse, hemen sütunları ekleyelim
+    df = _encode_ratings(df, user_enc, movie_enc)
+
+    # Yeni kullanıcı -1 ile skorlanır (faktör modellerinde global ortalama + film bias'ı)
+    user_id = _encode_known(user_enc, [user_name])[0]
+    rated   = df[df['user'] == user_name]['movie_id'].unique()
+    # Yalnızca modelin tanıdığı filmler önerilebilir (isme geri çevrilir)
+    all_movies = df.loc[df['movie_id'] >= 0, 'movie_id'].unique()
+    unrated = np.setdiff1d(all_movies, rated, assume_unique=True)
 
     candidate_df = pd.DataFrame({
         'user_id': [user_id] * len(unrated),
         'movie_id': unrated
     })
-    candidate_df['predicted_rating'] = model.predict(candidate_df)
+    if hasattr(model, 'score_users'):
+        candidate_df['predicted_rating'] = model.score_users([user_id], unrated)[0]
+    else:
+        candidate_df['predicted_rating'] = model.predict(candidate_df)
 
     top_recs = (
         candidate_df
@@ -403,7 +863,334 @@ def recommend_movies(user_name, model, df, user_enc, movie_enc, top_n=10):
 
     return top_recs[['movie', 'predicted_rating']].round(2)
 
+# Tek predict çağrısında skorlanan en fazla (kullanıcı, film) çifti
+RECOMMEND_MAX_PAIRS = 2_000_000
 
+def recommend_movies_batch(model, df, user_enc, movie_enc, users=None, top_n=10,
+                           max_pairs=RECOMMEND_MAX_PAIRS):
+    # Tüm (veya verilen) kullanıcılar için tek geçişte öneri: kullanıcı blokları
+    # x tüm filmler ızgarası skorlanır, puanlanmış filmler seyrek matrisle
+    # maskelenir, ilk top_n argpartition ile seçilir.
+    # Eğitimden sonra eklenen kullanıcı/filmler yeniden eğitime kadar dışarıda kalır
+    df = _encode_ratings(df, user_enc, movie_enc)
+    df = df[(df['user_id'] >= 0) & (df['movie_id'] >= 0)]
+
+    if users is None:
+        user_ids = np.unique(df['user_id'].to_numpy())
+    else:
+        user_ids = _encode_known(user_enc, list(users))
+        user_ids = user_ids[user_ids >= 0]
+    movie_ids = np.unique(df['movie_id'].to_numpy())
+    n_movies = len(movie_ids)
+    top_n = min(top_n, n_movies)
+    if top_n == 0 or len(user_ids) == 0:
+        return pd.DataFrame(columns=['user', 'movie', 'predicted_rating', 'rank'])
+
+    # Kullanıcı x aday film puanlama matrisi (sütun = movie_ids içindeki konum)
+    rated = sparse.csr_matrix(
+        (np.ones(len(df), dtype=bool),
+         (df['user_id'].to_numpy(), np.searchsorted(movie_ids, df['movie_id'].to_numpy()))),
+        shape=(len(user_enc.classes_), n_movies),
+    )
+
+    block_size = max(1, max_pairs // n_movies)
+    frames = []
+    for start in range(0, len(user_ids), block_size):
+        report_progress(start / len(user_ids), f"Scoring users {start}/{len(user_ids)}")
+        block = user_ids[start:start + block_size]
+        if hasattr(model, 'score_users'):
+            # Faktör modelleri bloğu tek matris çarpımıyla skorlar
+            scores = model.score_users(block, movie_ids)
+        else:
+            grid = pd.DataFrame({
+                'user_id': np.repeat(block, n_movies),
+                'movie_id': np.tile(movie_ids, len(block)),
+            })
+            scores = np.asarray(model.predict(grid), dtype=np.float64).reshape(len(block), n_movies)
+
+        mask = rated[block].tocoo()
+        scores[mask.row, mask.col] = -np.inf
+
+        top = np.argpartition(-scores, top_n - 1, axis=1)[:, :top_n]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind="stable")
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+        keep = np.isfinite(top_scores)
+        rows, ranks = np.nonzero(keep)
+        frames.append(pd.DataFrame({
+            'user': user_enc.inverse_transform(block[rows]),
+            'movie': movie_enc.inverse_transform(movie_ids[top[rows, ranks]]),
+            'predicted_rating': np.round(top_scores[rows, ranks], 2),
+            'rank': ranks + 1,
+        }))
+
+    return pd.concat(frames, ignore_index=True)
+
+
+
+
+########## GRAPH VIEW SAMPLING ##########
+
+SAMPLING_STRATEGIES = ["Top degree", "Random", "By community"]
+
+_SAMPLE_NODE_QUERIES = {
+    "Top degree": """
+        MATCH (n)
+        WHERE $labels IS NULL OR any(lbl IN labels(n) WHERE lbl IN $labels)
+        WITH n, COUNT { (n)--() } AS degree
+        ORDER BY degree DESC
+        LIMIT $max_nodes
+    """,
+    # Bernoulli örnekleme: tüm düğümler aynı olasılıkla aday olur (erken LIMIT
+    # tarama sırasının başını kayırırdı); fazlası _thin_sample ile atılır
+    "Random": """
+        MATCH (n)
+        WHERE ($labels IS NULL OR any(lbl IN labels(n) WHERE lbl IN $labels))
+          AND rand() < $sample_rate
+        WITH n
+    """,
+    # Louvain'in yazdığı n.community üzerinden en büyük toplulukların en
+    # yüksek dereceli üyeleri; üye listeleri toplanmaz
+    "By community": """
+        MATCH (c)
+        WHERE c.community IS NOT NULL
+          AND ($labels IS NULL OR any(lbl IN labels(c) WHERE lbl IN $labels))
+        WITH c.community AS community, count(*) AS size
+        ORDER BY size DESC
+        LIMIT $communities
+        CALL {
+            WITH community
+            MATCH (n)
+            WHERE n.community = community
+              AND ($labels IS NULL OR any(lbl IN labels(n) WHERE lbl IN $labels))
+            WITH n, COUNT { (n)--() } AS degree
+            ORDER BY degree DESC
+            LIMIT $per_community
+            RETURN n
+        }
+        WITH n
+        LIMIT $max_nodes
+    """,
+}
+
+# Random örneklemede beklenen aday sayısı max_nodes'un bu katı; max_nodes'un
+# altında kalma olasılığını düşük tutacak kadar
+SAMPLE_OVERSAMPLE = 1.5
+
+def _sample_count_query(labels):
+    # Label sayıları count store'dan okunur (tarama yok); çok label'lı
+    # düğümler iki kez sayılabilir, bu yalnızca örnekleme oranını düşürür
+    if not labels:
+        return "MATCH (n) RETURN count(n) AS total"
+    parts = [f"MATCH (n:`{label.replace('`', '``')}`) RETURN count(n) AS c" for label in labels]
+    return "CALL { " + " UNION ALL ".join(parts) + " } RETURN sum(c) AS total"
+
+_SAMPLE_PROJECTION = """
+    RETURN elementId(n) AS id,
+           labels(n) AS labels,
+           coalesce(n.name, n.title, n.username) AS caption,
+           properties(n) AS props
+"""
+
+SAMPLE_EDGES_QUERY = """
+    MATCH (n)-[r]->(m)
+    WHERE elementId(n) IN $ids AND elementId(m) IN $ids
+    RETURN elementId(n) AS source, elementId(m) AS target, type(r) AS rel_type
+    LIMIT $max_edges
+"""
+
+def _sample_params(labels, max_nodes, communities, total=0):
+    return {
+        "labels": labels or None,
+        "max_nodes": max_nodes,
+        "communities": communities,
+        "per_community": max(1, max_nodes // communities),
+        "sample_rate": min(1.0, SAMPLE_OVERSAMPLE * max_nodes / total) if total else 1.0,
+    }
+
+def _thin_sample(nodes, max_nodes, rng=random):
+    # Bernoulli adaylarından eşit olasılıkla max_nodes tanesi
+    return rng.sample(nodes, max_nodes) if len(nodes) > max_nodes else nodes
+
+def sample_subgraph(tx, labels=None, max_nodes=100, max_edges=500,
+                    strategy="Top degree", communities=5):
+    total = tx.run(_sample_count_query(labels)).single()["total"] if strategy == "Random" else 0
+    params = _sample_params(labels, max_nodes, communities, total)
+    nodes = [r.data() for r in tx.run(_SAMPLE_NODE_QUERIES[strategy] + _SAMPLE_PROJECTION, **params)]
+    if strategy == "Random":
+        nodes = _thin_sample(nodes, max_nodes)
+
+    # Topluluk bilgisi yoksa (Louvain çalışmamış) derece örneklemesine dön
+    if not nodes and strategy == "By community":
+        nodes = [r.data() for r in tx.run(_SAMPLE_NODE_QUERIES["Top degree"] + _SAMPLE_PROJECTION, **params)]
+
+    # Kenarlar yalnızca seçilen düğümler arasında, budget sunucuda uygulanır
+    ids = [node["id"] for node in nodes]
+    edges = [r.data() for r in tx.run(SAMPLE_EDGES_QUERY, ids=ids, max_edges=max_edges)]
+
+    return {"nodes": nodes, "edges": edges}
+
+
+########## EGO NETWORK EXPLORER ##########
+
+def get_node_projection(tx, node_id):
+    record = tx.run("""
+        MATCH (n) WHERE elementId(n) = $node_id
+    """ + _SAMPLE_PROJECTION, node_id=node_id).single()
+    return record.data() if record else None
+
+def expand_nodes(tx, node_ids, known_ids, fanout=25):
+    # Yeni komşular düğüm başına fanout ile sınırlı; zaten bilinen
+    # düğümlere giden kenarlar ise sınırsız (bilinen küme zaten küçük)
+    result = tx.run("""
+        UNWIND $ids AS id
+        MATCH (n) WHERE elementId(n) = id
+        CALL {
+            WITH n
+            MATCH (n)-[r]-(m)
+            WHERE NOT elementId(m) IN $known
+            RETURN r, m LIMIT $fanout
+          UNION
+            WITH n
+            MATCH (n)-[r]-(m)
+            WHERE elementId(m) IN $known
+            RETURN r, m
+        }
+        RETURN elementId(startNode(r)) AS source,
+               elementId(endNode(r)) AS target,
+               type(r) AS rel_type,
+               elementId(m) AS id,
+               labels(m) AS labels,
+               coalesce(m.name, m.title, m.username) AS caption,
+               properties(m) AS props
+    """, ids=list(node_ids), known=list(known_ids), fanout=fanout)
+    return [record.data() for record in result]
+
+def _merge_expansion(graph, rows):
+    new_ids = []
+    for row in rows:
+        if row["id"] not in graph["nodes"]:
+            graph["nodes"][row["id"]] = {k: row[k] for k in ("id", "labels", "caption", "props")}
+            new_ids.append(row["id"])
+        key = f"{row['source']}|{row['target']}|{row['rel_type']}"
+        graph["edges"][key] = {k: row[k] for k in ("source", "target", "rel_type")}
+    return new_ids
+
+def expand_ego_network(driver, graph, node_id, fanout=25):
+    # Tek düğümü bir hop genişletir; graph yerinde güncellenir
+    if node_id in graph["expanded"]:
+        return []
+    with open_session(driver) as session:
+        rows = session.execute_read(expand_nodes, [node_id], graph["nodes"].keys(), fanout)
+    graph["expanded"].add(node_id)
+    return _merge_expansion(graph, rows)
+
+def get_ego_network(driver, node_id, hops=1, fanout=25):
+    graph = {"nodes": {}, "edges": {}, "expanded": set()}
+    with open_session(driver) as session:
+        root = session.execute_read(get_node_projection, node_id)
+        if root is None:
+            return graph
+        graph["nodes"][node_id] = root
+
+        frontier = [node_id]
+        for _ in range(hops):
+            if not frontier:
+                break
+            rows = session.execute_read(expand_nodes, frontier, graph["nodes"].keys(), fanout)
+            graph["expanded"].update(frontier)
+            frontier = _merge_expansion(graph, rows)
+    return graph
+
+def ego_graph_data(graph):
+    # draw_network'ün beklediği şekil
+    return {"nodes": list(graph["nodes"].values()), "edges": list(graph["edges"].values())}
+
+
+########## STREAMING EXPORT ##########
+
+EXPORT_FORMATS = ["CSV", "JSONL", "Parquet"]
+EXPORT_COLUMNS = ["source_id", "source", "relationship", "target_id", "target"]
+EXPORT_CHUNK_SIZE = 10000
+
+def iter_relationship_chunks(driver, chunk_size=EXPORT_CHUNK_SIZE):
+    # fetch_size ile sonuç sunucudan chunk_size'lık parçalar halinde çekilir;
+    # tüm ilişkiler hiçbir zaman aynı anda bellekte olmaz
+    query = """
+        MATCH (n)-[r]->(m)
+        RETURN elementId(n) AS source_id,
+               coalesce(n.name, n.title, n.username) AS source,
+               type(r) AS relationship,
+               elementId(m) AS target_id,
+               coalesce(m.name, m.title, m.username) AS target
+    """
+    with open_session(driver, fetch_size=chunk_size) as session:
+        chunk = []
+        for record in session.run(query):
+            chunk.append(record.values())
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+def _write_csv(chunks, path):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(EXPORT_COLUMNS)
+        for chunk in chunks:
+            writer.writerows(chunk)
+
+def _write_jsonl(chunks, path):
+    with open(path, "w", encoding="utf-8") as f:
+        for chunk in chunks:
+            f.writelines(json.dumps(dict(zip(EXPORT_COLUMNS, row)), ensure_ascii=False) + "\n" for row in chunk)
+
+def _write_parquet(chunks, path):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Parquet export requires pyarrow: pip install pyarrow")
+
+    schema = pa.schema([(col, pa.string()) for col in EXPORT_COLUMNS])
+    with pq.ParquetWriter(path, schema) as writer:
+        for chunk in chunks:
+            columns = list(zip(*chunk))
+            writer.write_batch(pa.record_batch([pa.array(c, pa.string()) for c in columns], schema=schema))
+
+def write_export(chunks, path=None, fmt="CSV"):
+    # chunks: EXPORT_COLUMNS sırasında satır listeleri (kaynağı backend'e bağlı)
+    writers = {"CSV": _write_csv, "JSONL": _write_jsonl, "Parquet": _write_parquet}
+    if path is None:
+        suffix = {"CSV": ".csv", "JSONL": ".jsonl", "Parquet": ".parquet"}[fmt]
+        fd, path = tempfile.mkstemp(prefix="full_graph_", suffix=suffix)
+        os.close(fd)
+    writers[fmt](chunks, path)
+    return path
+
+def export_graph(driver, path=None, fmt="CSV", chunk_size=EXPORT_CHUNK_SIZE):
+    # Dosyaya artımlı yazar; en fazla bir chunk bellekte tutulur
+    return write_export(iter_relationship_chunks(driver, chunk_size), path, fmt)
+
+def iter_export_lines(driver, fmt="CSV", chunk_size=EXPORT_CHUNK_SIZE):
+    # Dosya istemeyen kullanım için: chunk başına bir bytes parçası
+    if fmt == "CSV":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_COLUMNS)
+        for chunk in iter_relationship_chunks(driver, chunk_size):
+            writer.writerows(chunk)
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    elif fmt == "JSONL":
+        for chunk in iter_relationship_chunks(driver, chunk_size):
+            yield "".join(json.dumps(dict(zip(EXPORT_COLUMNS, row)), ensure_ascii=False) + "\n" for row in chunk).encode("utf-8")
+    else:
+        raise ValueError(f"Streaming is only supported for CSV and JSONL, not {fmt}")
 
 
 ########## GDS GRAPH CREATION ##########
@@ -418,8 +1205,8 @@ def clearGDS():
         result = tx.run(query)
         return result.single()
     
-    with driver.session() as session:
-        return session.execute_write(run_tx)
+    with open_session(driver) as session:
+        return session.execute_write(_job_tx(run_tx))
 
 def create_gds_projection():
     query = """
@@ -439,8 +1226,110 @@ def create_gds_projection():
         result = tx.run(query)
         return result.single()
     
-    with driver.session() as session:
-        return session.execute_write(run_tx)
+    with open_session(driver) as session:
+        return session.execute_write(_job_tx(run_tx))
+
+# --- Projection lifecycle ---
+# full-movie-graph yalnızca kapsadığı label/ilişki tipleri yazıldığında
+# yeniden kurulur; algoritmalar ve oturumlar aynı projeksiyonu paylaşır,
+# uzun süre kullanılmazsa GDS belleğini boşaltmak için düşürülür.
+
+GDS_GRAPH_NAME = "full-movie-graph"
+GDS_PROJECTION_KEYS = ("Person", "Movie", "Genre", "User", "ACTED_IN", "DIRECTED", "IN_GENRE", "RATED")
+GDS_IDLE_SECONDS = 15 * 60
+
+_gds_projection = {"info": None, "last_used": 0.0, "timer": None}
+_gds_projection_lock = threading.RLock()
+
+def _gds_graph_exists():
+    with open_session(driver) as session:
+        record = session.run("CALL gds.graph.exists($name) YIELD exists", name=GDS_GRAPH_NAME).single()
+        return bool(record and record["exists"])
+
+def _gds_graph_memory():
+    with open_session(driver) as session:
+        record = session.run("""
+            CALL gds.graph.list($name)
+            YIELD memoryUsage, sizeInBytes
+            RETURN memoryUsage, sizeInBytes
+        """, name=GDS_GRAPH_NAME).single()
+        return record.data() if record else {"memoryUsage": None, "sizeInBytes": None}
+
+def _schedule_gds_eviction():
+    timer = _gds_projection["timer"]
+    if timer is not None:
+        timer.cancel()
+    timer = threading.Timer(GDS_IDLE_SECONDS, _evict_idle_gds_projection)
+    timer.daemon = True
+    timer.start()
+    _gds_projection["timer"] = timer
+
+def _evict_idle_gds_projection():
+    with _gds_projection_lock:
+        idle = time.monotonic() - _gds_projection["last_used"]
+        if _gds_projection["info"] is None:
+            return
+        if idle < GDS_IDLE_SECONDS:
+            _schedule_gds_eviction()
+            return
+        try:
+            clearGDS()
+        finally:
+            _gds_projection["info"] = None
+            _gds_projection["timer"] = None
+
+def get_gds_projection_info():
+    with _gds_projection_lock:
+        info = _gds_projection["info"]
+        if info is None:
+            return None
+        return dict(info, idle_seconds=round(time.monotonic() - _gds_projection["last_used"], 1))
+
+def ensure_gds_projection(force=False):
+    version = get_graph_version(*GDS_PROJECTION_KEYS)
+
+    with _gds_projection_lock:
+        info = _gds_projection["info"]
+        reusable = (
+            not force
+            and info is not None
+            and info["graph_version"] == version
+            and graph_cache_fresh(info["built_at"])
+            and _gds_graph_exists()
+        )
+
+        if not reusable:
+            # Process yeni başladıysa mevcut projeksiyonun ne zaman kurulduğunu
+            # bilemeyiz; güvenli tarafta kalıp yeniden kur
+            clearGDS()
+            record = create_gds_projection()
+            info = {
+                "graph_name": GDS_GRAPH_NAME,
+                "graph_version": version,
+                "built_at": time.time(),
+                "node_count": record["nodeCount"],
+                "relationship_count": record["relationshipCount"],
+                "project_millis": record["projectMillis"],
+                "labels": list(GDS_PROJECTION_KEYS[:4]),
+                "relationship_types": list(GDS_PROJECTION_KEYS[4:]),
+            }
+            info.update(_gds_graph_memory())
+            _gds_projection["info"] = info
+
+        _gds_projection["last_used"] = time.monotonic()
+        _schedule_gds_eviction()
+        return dict(info, reused=reusable)
+
+def run_louvain_job(driver, graph_name=GDS_GRAPH_NAME):
+    # Arka plan işi olarak: projeksiyon + Louvain + topluluk atamaları
+    report_progress(0.0, "Preparing GDS projection")
+    ensure_gds_projection()
+    report_progress(0.3, "Running Louvain")
+    summary = run_louvain_community_detection(driver, graph_name)
+    report_progress(0.9, "Fetching community assignments")
+    with open_session(driver) as session:
+        communities = session.execute_read(_job_tx(get_community_data))
+    return {"summary": summary, "communities": communities}
 
 def pageRankGDS():
     query = f"""
@@ -457,27 +1346,33 @@ def pageRankGDS():
         result = tx.run(query)
         return [record.data() for record in result]
     
-    with driver.session() as session:
-        return session.execute_write(run_tx)
+    ensure_gds_projection()
+    with open_session(driver) as session:
+        return session.execute_write(_job_tx(run_tx))
 
-def betweennessGDS():
+def betweennessGDS(sampling_size=None, sampling_seed=42, k=10):
+    # sampling_size verilirse GDS yalnızca o kadar kaynak düğümden yol sayar
     query = f"""
-        CALL gds.betweenness.stream('full-movie-graph')
+        CALL gds.betweenness.stream('full-movie-graph', $config)
             YIELD nodeId, score
             RETURN 
             gds.util.asNode(nodeId).name AS name,
             labels(gds.util.asNode(nodeId)) AS labels,
             ROUND(score, 2) AS score
             ORDER BY score DESC
-            LIMIT 10
+            LIMIT $k
         """
+    config = {}
+    if sampling_size is not None:
+        config = {"samplingSize": int(sampling_size), "samplingSeed": sampling_seed}
     
     def run_tx(tx):
-        result = tx.run(query)
+        result = tx.run(query, config=config, k=k)
         return [record.data() for record in result]
     
-    with driver.session() as session:
-        return session.execute_write(run_tx)
+    ensure_gds_projection()
+    with open_session(driver) as session:
+        return session.execute_write(_job_tx(run_tx))
 
 
 def degreeCentralityGDS():
@@ -496,38 +1391,66 @@ def degreeCentralityGDS():
         result = tx.run(query)
         return [record.data() for record in result]
 
-    with driver.session() as session:
-        return session.execute_write(run_tx)
+    ensure_gds_projection()
+    with open_session(driver) as session:
+        return session.execute_write(_job_tx(run_tx))
     
 
 #################### KONWLEDGE GRAPH DISTRUBITION ####################
 
-def get_node_label_distribution():
-    query = """
+# Tek round trip; label ve ilişki sayıları count store'dan okunur
+GRAPH_STATISTICS_QUERY = """
+    CALL { MATCH (m:Movie) RETURN count(m) AS movies }
+    CALL { MATCH (p:Person) RETURN count(p) AS persons }
+    CALL { MATCH (u:User) RETURN count(u) AS users }
+    CALL { MATCH (g:Genre) RETURN count(g) AS genres }
+    CALL { MATCH ()-[r]->() RETURN count(r) AS total_relationships }
+    CALL { MATCH (:User)-[r:RATED]->() RETURN avg(r.score) AS avg_rating }
+    RETURN movies, persons, users, genres, total_relationships, avg_rating
+"""
+
+LABEL_DISTRIBUTION_QUERY = """
     MATCH (n)
     RETURN labels(n)[0] AS label, count(*) AS count
     ORDER BY count DESC
-    """
+"""
+
+RELATIONSHIP_DISTRIBUTION_QUERY = """
+    MATCH ()-[r]->()
+    RETURN type(r) AS relationship_type, count(*) AS count
+    ORDER BY count DESC
+"""
+
+TOP_CONNECTED_QUERY = """
+    MATCH (n)-[r]->()
+    RETURN coalesce(n.name, n.title, "Unnamed Node") AS node, count(r) AS relation_count
+    ORDER BY relation_count DESC LIMIT $limit
+"""
+
+def get_graph_statistics(tx):
+    return tx.run(GRAPH_STATISTICS_QUERY).single().data()
+
+
+def get_top_connected(tx, limit=10):
+    return [record.data() for record in tx.run(TOP_CONNECTED_QUERY, limit=limit)]
+
+
+def get_node_label_distribution(driver=None):
     def run_tx(tx):
-        result = tx.run(query)
+        result = tx.run(LABEL_DISTRIBUTION_QUERY)
         return [record.data() for record in result]
 
-    with driver.session() as session:
-        return session.execute_read(run_tx)
+    with open_session(driver) as session:
+        return session.execute_read(_job_tx(run_tx))
 
 
-def get_relationship_distribution():
-    query = """
-    MATCH ()-[r]->()
-    RETURN type(r) AS relationship_type, count(*) AS count
-    ORDER BY count DESC
-    """
+def get_relationship_distribution(driver=None):
     def run_tx(tx):
-        result = tx.run(query)
+        result = tx.run(RELATIONSHIP_DISTRIBUTION_QUERY)
         return [record.data() for record in result]
 
-    with driver.session() as session:
-        return session.execute_read(run_tx)
+    with open_session(driver) as session:
+        return session.execute_read(_job_tx(run_tx))
 
  
 def get_similarity_graph():
@@ -541,10 +1464,10 @@ def get_similarity_graph():
     ORDER BY sim DESC
     LIMIT 20
     """
-    with driver.session() as session:
-        records = session.run(query)
+    ensure_gds_projection()
+    with open_session(driver) as session:
+        records = session.run(_job_query(query))
         df = pd.DataFrame([r.data() for r in records])
-    driver.close()
     return df
 
 if __name__ == "__main__":
@@ -0,0 +1,222 @@
+import json
+import os
+import tempfile
+import threading
+import time
+
+import pandas as pd
+
+from connection import open_session
+from neo4j_processes import driver as default_driver, get_graph_version
+
+# RATED ilişkilerinin yerel sütunlu kopyası (Parquet; pyarrow yoksa pickle).
+# İlk çağrıda tam tarama, sonrasında yalnızca r.updated_at >= watermark olan
+# puanlar çekilir. Silmeler, silinen puanın hayatta kalan ucuna (User/Movie)
+# yazılan ratings_deleted_at ile izlenir; o düğümlerin puanları yeniden okunur.
+# Son olarak count store'daki RATED sayısı cache ile karşılaştırılır; tutmazsa
+# farklı (user, movie) çiftleri sayılır, o da tutmazsa (ör. delete_all,
+# dışarıdan yazma) tam yükleme yapılır.
+
+CACHE_DIR = "cache"
+RATING_COLUMNS = ["user", "movie", "rating"]
+# Başka client'ların yazmaları için en fazla bu kadar eski veri döner
+RATINGS_MAX_AGE_SECONDS = 60
+# Watermark'tan önce başlayıp sonra commit olan yazmaları kaçırmamak için örtüşme
+WATERMARK_OVERLAP_MS = 60_000
+
+try:
+    import pyarrow  # noqa: F401
+    CACHE_FORMAT = "parquet"
+except ImportError:
+    CACHE_FORMAT = "pickle"
+
+
+def _fetch_all(tx):
+    # getAllData ile aynı sütunlar
+    result = tx.run("""
+        MATCH (u:User)-[r:RATED]->(m:Movie)
+        RETURN u.username AS user, m.title AS movie, r.score AS rating
+    """)
+    return [r.values() for r in result]
+
+
+def _fetch_changed(tx, since):
+    result = tx.run("""
+        MATCH (u:User)-[r:RATED]->(m:Movie)
+        WHERE r.updated_at >= $since
+        RETURN u.username AS user, m.title AS movie, r.score AS rating
+    """, since=since)
+    return [r.values() for r in result]
+
+
+def _fetch_deletion_markers(tx, since):
+    users = [r["key"] for r in tx.run(
+        "MATCH (u:User) WHERE u.ratings_deleted_at >= $since RETURN u.username AS key", since=since)]
+    movies = [r["key"] for r in tx.run(
+        "MATCH (m:Movie) WHERE m.ratings_deleted_at >= $since RETURN m.title AS key", since=since)]
+    return users, movies
+
+
+def _fetch_ratings_of(tx, users, movies):
+    result = tx.run("""
+        MATCH (u:User)-[r:RATED]->(m:Movie)
+        WHERE u.username IN $users OR m.title IN $movies
+        RETURN u.username AS user, m.title AS movie, r.score AS rating
+    """, users=users, movies=movies)
+    return [r.values() for r in result]
+
+
+def _rated_count(tx):
+    # Tek label'lı ilişki sayımı count store'dan okunur
+    return tx.run("MATCH (:User)-[r:RATED]->() RETURN count(r) AS n").single()["n"]
+
+
+def _rated_pair_count(tx):
+    # Paralel RATED ilişkileri cache'te tek satırdır; ucuz sayım tutmadığında
+    return tx.run("""
+        MATCH (u:User)-[:RATED]->(m:Movie)
+        RETURN count(DISTINCT [u.username, m.title]) AS n
+    """).single()["n"]
+
+
+def _backfill_updated_at(session):
+    # updated_at'siz (eski ya da dışarıdan yazılmış) puanlar artımlı sorguya
+    # ve index'e girmez; bir kez 0 ile doldurulur
+    session.run("""
+        MATCH ()-[r:RATED]->()
+        WHERE r.updated_at IS NULL
+        CALL { WITH r SET r.updated_at = coalesce(r.updated_at, 0) } IN TRANSACTIONS OF 10000 ROWS
+    """).consume()
+
+
+def _server_time(tx):
+    return tx.run("RETURN timestamp() AS now").single()["now"]
+
+
+def _frame(rows):
+    return pd.DataFrame(rows, columns=RATING_COLUMNS)
+
+
+class RatingCache:
+
+    def __init__(self, driver=None, cache_dir=CACHE_DIR, fmt=CACHE_FORMAT):
+        self.driver = driver or default_driver
+        self.cache_dir = cache_dir
+        self.fmt = fmt
+        self.data_path = os.path.join(cache_dir, f"ratings.{'parquet' if fmt == 'parquet' else 'pkl'}")
+        self.meta_path = os.path.join(cache_dir, "ratings.meta.json")
+        self._lock = threading.Lock()
+        self._frame = None
+        self._meta = None
+        self._graph_version = None
+        self.last_refresh = None
+
+    # --- Disk ---
+
+    def _load_disk(self):
+        if not (os.path.exists(self.data_path) and os.path.exists(self.meta_path)):
+            return None, None
+        try:
+            with open(self.meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            if self.fmt == "parquet":
+                frame = pd.read_parquet(self.data_path)
+            else:
+                frame = pd.read_pickle(self.data_path)
+            return frame, meta
+        except Exception:
+            # Bozuk cache tam yüklemeyle yeniden kurulur
+            return None, None
+
+    def _save_disk(self, frame, meta):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir)
+        os.close(fd)
+        if self.fmt == "parquet":
+            frame.to_parquet(tmp, index=False)
+        else:
+            frame.to_pickle(tmp)
+        os.replace(tmp, self.data_path)
+
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp, self.meta_path)
+
+    # --- Refresh ---
+
+    def _full_load(self, session):
+        now = session.execute_read(_server_time)
+        # Artımlı yolla aynı anahtar: (user, movie) başına bir satır
+        frame = _frame(session.execute_read(_fetch_all))
+        return frame.drop_duplicates(["user", "movie"], keep="last").reset_index(drop=True), now
+
+    def _incremental(self, session, frame, since):
+        now = session.execute_read(_server_time)
+        changed = session.execute_read(_fetch_changed, since)
+        users, movies = session.execute_read(_fetch_deletion_markers, since)
+
+        updates = [_frame(changed)]
+        if users or movies:
+            # Bu uçların puanları yeniden okunup cache'teki satırların yerine geçer
+            frame = frame[~(frame["user"].isin(users) | frame["movie"].isin(movies))]
+            updates.append(_frame(session.execute_read(_fetch_ratings_of, users, movies)))
+
+        frame = pd.concat([frame] + updates, ignore_index=True)
+        frame = frame.drop_duplicates(["user", "movie"], keep="last").reset_index(drop=True)
+        stats = {"changed": len(changed), "deleted_markers": len(users) + len(movies)}
+        return frame, now, stats
+
+    def refresh(self, force_full=False):
+        with self._lock:
+            frame, meta = (self._frame, self._meta) if self._frame is not None else self._load_disk()
+            start = time.perf_counter()
+
+            with open_session(self.driver) as session:
+                backfilled = bool(meta and meta.get("backfilled"))
+                if not backfilled:
+                    _backfill_updated_at(session)
+                    backfilled = True
+                    force_full = True
+                if frame is None or meta is None or force_full:
+                    frame, now = self._full_load(session)
+                    mode, stats = "full", {}
+                else:
+                    frame, now, stats = self._incremental(session, frame, meta["watermark"])
+                    mode = "incremental"
+                    if (session.execute_read(_rated_count) != len(frame)
+                            and session.execute_read(_rated_pair_count) != len(frame)):
+                        frame, now = self._full_load(session)
+                        mode = "full (reconciled)"
+
+            meta = {"watermark": now - WATERMARK_OVERLAP_MS, "rows": len(frame), "refreshed_at": time.time(),
+                    "backfilled": backfilled}
+            self._save_disk(frame, meta)
+            self._frame, self._meta = frame, meta
+            self.last_refresh = {"mode": mode, "rows": len(frame),
+                                 "seconds": round(time.perf_counter() - start, 3), **stats}
+            return frame
+
+    def get(self, max_age=RATINGS_MAX_AGE_SECONDS):
+        # Bu süreçteki yazmalardan sonra ya da max_age dolunca artımlı yenile;
+        # aksi halde bellekteki frame döner
+        version = get_graph_version("User", "Movie", "RATED")
+        stale = self._meta is None or time.time() - self._meta["refreshed_at"] > max_age
+        if self._frame is None or version != self._graph_version or stale:
+            self.refresh()
+            self._graph_version = version
+        # Sığ kopya: çağıranın eklediği sütunlar (user_id, movie_id) cache'e yazılmaz
+        return self._frame.copy(deep=False)
+
+
+_cache = {"value": None}
+_cache_lock = threading.Lock()
+
+def get_rating_cache(driver=None):
+    with _cache_lock:
+        if _cache["value"] is None:
+            _cache["value"] = RatingCache(driver)
+        return _cache["value"]
+
+def get_ratings(driver=None):
+    return get_rating_cache(driver).get()
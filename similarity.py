@@ -0,0 +1,151 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from graph_snapshot import edge_ranges, get_snapshot
+
+# Film x özellik seyrek matrisi (türler, oyuncu/yönetmen/yapımcı, puanlayan
+# kullanıcılar) üzerinden benzerlik. Kesişimler bloklar halinde seyrek matris
+# çarpımıyla hesaplanır; bellek blok boyutuyla sınırlıdır.
+
+SIMILARITY_METRICS = ["jaccard", "overlap", "cosine"]
+
+# özellik -> (ilişki tipleri, filme göre yön)
+MOVIE_FEATURES = {
+    "genres": (["IN_GENRE"], "out"),
+    "cast":   (["ACTED_IN", "DIRECTED", "PRODUCED"], "in"),
+    "raters": (["RATED"], "in"),
+}
+
+SIMILARITY_BLOCK_SIZE = 2048
+
+_matrix_cache = {}
+
+
+def movie_feature_matrix(snapshot, features=("genres", "cast", "raters")):
+    movies, matrix, _ = _feature_matrices(snapshot, features)
+    return movies, matrix
+
+
+def _feature_matrices(snapshot, features):
+    # (filmler, matris, matrisin CSC transpozu); transpoz her sorguda
+    # yeniden kurulmasın diye matrisle birlikte saklanır
+    key = (id(snapshot), snapshot.version, tuple(features))
+    if key in _matrix_cache:
+        return _matrix_cache[key]
+
+    movies = snapshot.nodes_with_label("Movie")
+    row_of = np.full(snapshot.n_nodes, -1, dtype=np.int64)
+    row_of[movies] = np.arange(len(movies))
+
+    rows, cols = [], []
+    for feature in features:
+        rel_types, direction = MOVIE_FEATURES[feature]
+        if direction == "out":
+            indptr, indices = snapshot.indptr, snapshot.indices
+        else:
+            indptr, indices = snapshot.in_indptr, snapshot.in_indices
+        mask = snapshot.rel_type_mask(rel_types, csc=direction == "in")
+
+        src, pos = edge_ranges(indptr, movies)
+        keep = mask[pos]
+        rows.append(row_of[src[keep]])
+        # Özellik sütunu = komşu düğümün indeksi (türler/kişiler/kullanıcılar ayrık)
+        cols.append(indices[pos[keep]])
+
+    rows = np.concatenate(rows) if rows else np.empty(0, dtype=np.int64)
+    cols = np.concatenate(cols) if cols else np.empty(0, dtype=np.int64)
+    matrix = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.float32), (rows, cols)),
+        shape=(len(movies), snapshot.n_nodes),
+    )
+    # Aynı kişi hem oynayıp hem yönetmiş olabilir: küme semantiği
+    matrix.data[:] = 1.0
+
+    _matrix_cache.clear()
+    _matrix_cache[key] = (movies, matrix, matrix.T.tocsc())
+    return _matrix_cache[key]
+
+
+def _scores(intersections, sizes_left, sizes_right, metric):
+    # intersections: seyrek blok; yalnızca sıfır olmayan kesişimler için skor
+    coo = intersections.tocoo()
+    inter = coo.data
+    a, b = sizes_left[coo.row], sizes_right[coo.col]
+    if metric == "jaccard":
+        values = inter / (a + b - inter)
+    elif metric == "overlap":
+        values = inter / np.minimum(a, b)
+    elif metric == "cosine":
+        values = inter / np.sqrt(a * b)
+    else:
+        raise ValueError(f"Unknown similarity metric: {metric}")
+    return coo.row, coo.col, values
+
+
+def top_k_similar(matrix, k=10, metric="jaccard", rows=None, block_size=SIMILARITY_BLOCK_SIZE,
+                  transposed=None):
+    # Her satır için en benzer k satır: (komşu indeksleri, skorlar), -1 ile doldurulur
+    rows = np.arange(matrix.shape[0]) if rows is None else np.asarray(rows)
+    sizes = np.asarray(matrix.getnnz(axis=1), dtype=np.float64)
+    if transposed is None:
+        transposed = matrix.T.tocsc()
+
+    neighbours = np.full((len(rows), k), -1, dtype=np.int64)
+    scores = np.zeros((len(rows), k), dtype=np.float32)
+
+    for start in range(0, len(rows), block_size):
+        block = rows[start:start + block_size]
+        intersections = matrix[block] @ transposed
+        r, c, values = _scores(intersections, sizes[block], sizes, metric)
+
+        not_self = block[r] != c
+        r, c, values = r[not_self], c[not_self], values[not_self]
+
+        # Satır içinde skora göre azalan sırala, her satırın ilk k elemanını al
+        order = np.lexsort((-values, r))
+        r, c, values = r[order], c[order], values[order]
+        starts = np.searchsorted(r, np.arange(len(block)))
+        rank = np.arange(len(r)) - starts[r]
+        top = rank < k
+        neighbours[start + r[top], rank[top]] = c[top]
+        scores[start + r[top], rank[top]] = values[top]
+
+    return neighbours, scores
+
+
+def similar_movies(title, k=10, metric="jaccard", features=("genres", "cast", "raters"), snapshot=None):
+    # Tek film için tek satırlık çarpım: milisaniye mertebesinde
+    snapshot = snapshot or get_snapshot()
+    movies, matrix, transposed = _feature_matrices(snapshot, tuple(features))
+    candidates = np.flatnonzero(np.isin(movies, snapshot.index_of(title)))
+    if not len(candidates):
+        return pd.DataFrame(columns=["movie1", "movie2", "sim"])
+
+    neighbours, scores = top_k_similar(matrix, k, metric, rows=candidates[:1], transposed=transposed)
+    found = neighbours[0] >= 0
+    return pd.DataFrame({
+        "movie1": title,
+        "movie2": [snapshot.name(movies[j]) for j in neighbours[0][found]],
+        "sim": np.round(scores[0][found], 3),
+    })
+
+
+def similarity_pairs(k=5, metric="jaccard", features=("genres", "cast", "raters"),
+                     snapshot=None, block_size=SIMILARITY_BLOCK_SIZE):
+    # Tüm filmler için top-k komşular, get_similarity_graph ile aynı sütunlar
+    snapshot = snapshot or get_snapshot()
+    movies, matrix, transposed = _feature_matrices(snapshot, tuple(features))
+    neighbours, scores = top_k_similar(matrix, k, metric, block_size=block_size, transposed=transposed)
+    i, rank = np.nonzero(neighbours >= 0)
+    j, sim = neighbours[i, rank], scores[i, rank]
+
+    # Skorlar simetrik: (A, B) ve (B, A) tek satır
+    lo, hi = np.minimum(i, j), np.maximum(i, j)
+    _, first = np.unique(lo * len(movies) + hi, return_index=True)
+    lo, hi, sim = lo[first], hi[first], sim[first]
+    return pd.DataFrame({
+        "movie1": [snapshot.name(movies[a]) for a in lo],
+        "movie2": [snapshot.name(movies[b]) for b in hi],
+        "sim": np.round(sim, 3),
+    })
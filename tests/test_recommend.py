@@ -0,0 +1,47 @@
+import pandas as pd
+from sklearn.linear_model import Ridge
+from sklearn.preprocessing import LabelEncoder
+
+from matrix_factorization import MatrixFactorization
+from neo4j_processes import recommend_movies, recommend_movies_batch
+
+
+def _trained():
+    df = pd.DataFrame({
+        "user":   ["ann", "ann", "bob", "bob", "cem"],
+        "movie":  ["Alien", "Brazil", "Alien", "Cube", "Brazil"],
+        "rating": [5, 3, 4, 2, 4],
+    })
+    user_enc, movie_enc = LabelEncoder(), LabelEncoder()
+    X = pd.DataFrame({"user_id": user_enc.fit_transform(df["user"]),
+                      "movie_id": movie_enc.fit_transform(df["movie"])})
+    models = {
+        "MatrixFactorization": MatrixFactorization(n_factors=4, n_epochs=5).fit(X, df["rating"]),
+        "Ridge": Ridge().fit(X, df["rating"]),
+    }
+    # Eğitimden sonra cache'e gelen puanlar: yeni kullanıcı ve yeni film
+    fresh = pd.concat([df, pd.DataFrame({"user": ["dia", "ann"], "movie": ["Alien", "Dune"],
+                                         "rating": [3, 5]})], ignore_index=True)
+    return models, fresh, user_enc, movie_enc
+
+
+def test_batch_recommendations_skip_labels_added_after_training():
+    models, df, user_enc, movie_enc = _trained()
+    for model in models.values():
+        recs = recommend_movies_batch(model, df, user_enc, movie_enc, top_n=2)
+        assert set(recs["user"]) == {"ann", "bob", "cem"}
+        assert "Dune" not in set(recs["movie"])
+        # Yeni kullanıcı açıkça istense de hata yok
+        recs = recommend_movies_batch(model, df, user_enc, movie_enc, users=["dia", "bob"], top_n=2)
+        assert set(recs["user"]) == {"bob"}
+
+
+def test_recommendations_for_a_user_added_after_training():
+    models, df, user_enc, movie_enc = _trained()
+    for model in models.values():
+        recs = recommend_movies("dia", model, df, user_enc, movie_enc)
+        # dia yalnızca Alien'ı puanladı; kalan bilinen filmler önerilir
+        assert set(recs["movie"]) == {"Brazil", "Cube"}
+
+    recs = recommend_movies("ann", models["MatrixFactorization"], df, user_enc, movie_enc)
+    assert set(recs["movie"]) == {"Cube"}
@@ -0,0 +1,35 @@
+import random
+
+import numpy as np
+
+from neo4j_processes import _sample_params, _thin_sample
+
+
+def _random_sample(total, max_nodes, rng):
+    # "Random" sorgusunun sunucu tarafı: düğümler depolama sırasıyla taranır,
+    # her biri rand() < sample_rate ile aday olur
+    rate = _sample_params(None, max_nodes, 5, total)["sample_rate"]
+    candidates = [i for i in range(total) if rng.random() < rate]
+    return _thin_sample(candidates, max_nodes, rng)
+
+
+def test_random_sample_spans_whole_id_range():
+    rng = random.Random(7)
+    total, max_nodes = 10_000, 100
+    chosen = np.concatenate([_random_sample(total, max_nodes, rng) for _ in range(50)])
+
+    # On eşit id diliminin her biri ~%10 almalı; baş tarafa yığılma yok
+    counts = np.bincount(chosen * 10 // total, minlength=10) / len(chosen)
+    assert counts.min() > 0.07
+    assert counts.max() < 0.13
+
+
+def test_random_sample_size():
+    rng = random.Random(3)
+    sizes = [len(_random_sample(5_000, 100, rng)) for _ in range(50)]
+    assert max(sizes) == 100
+    assert np.mean(sizes) > 98
+
+
+def test_thin_sample_keeps_small_candidate_sets():
+    assert _thin_sample([1, 2, 3], 10) == [1, 2, 3]
@@ -1,7 +1,16 @@
 import streamlit as st
-from neo4j import GraphDatabase, basic_auth
 from neo4j.exceptions import ServiceUnavailable, AuthError
+from connection import get_connection_manager, open_session
+from backends import get_backend
+from instrumentation import metrics as query_metrics, set_profile_sample_rate, start_metrics_server
+import instrumentation
 from neo4j_processes import *
+from graph_view import draw_network
+from centrality import pageRankLocal, betweennessLocal, degreeCentralityLocal, betweennessEstimateLocal, betweennessEstimateGDS
+from jobs import JobRunner, ACTIVE_STATES, FAILED, CANCELLED
+from model_registry import ModelRegistry
+from rating_cache import get_rating_cache
+from similarity import SIMILARITY_METRICS, MOVIE_FEATURES, similar_movies, similarity_pairs
 import pandas as pd
 from streamlit_option_menu import option_menu
 from pyvis.network import Network
@@ -9,14 +18,9 @@ import streamlit.components.v1 as components
 import matplotlib.pyplot as plt
 import networkx as nx
 import plotly.express as px
-import joblib, os
+import joblib, os, weakref
 import networkx as nx
 
-# Bağlantı bilgileri
-NEO4J_URI = "bolt://localhost:7687"
-NEO4J_USER = "neo4j"
-NEO4J_PASS = "password"
-
 st.set_page_config(
     page_title="Neo4j Movie DB App",
     page_icon="https://st2.depositphotos.com/1062085/6772/v/950/depositphotos_67729517-stock-illustration-data-visualization-icon-concept.jpg",
@@ -26,138 +30,129 @@ st.set_page_config(
 
 @st.cache_resource
 def get_driver():
-    return GraphDatabase.driver(NEO4J_URI, auth=basic_auth(NEO4J_USER, NEO4J_PASS))
+    # neo4j_processes ile aynı pooled driver; burada kapatılmamalı
+    driver = get_connection_manager().driver
+    # NEO4J_METRICS_PORT verilmişse Prometheus /metrics endpoint'i
+    start_metrics_server()
+    # Constraint/index kurulumu driver başına bir kez
+    get_schema_report(driver)
+    return driver
+
+
+@st.cache_resource
+def get_schema_report(_driver):
+    # Sonuç Settings panelinde gösterilir
+    try:
+        return ensure_schema(_driver)
+    except (ServiceUnavailable, AuthError) as e:
+        return {"skipped": str(e)}
+
+
+@st.cache_resource
+def get_graph_backend():
+    # GRAPH_BACKEND=memory: Neo4j sunucusu olmadan süreç içi graf (backends.py)
+    backend = get_backend()
+    if backend.name == "neo4j":
+        get_driver()
+    return backend
+
+
+class ExportFile:
+    # Geçici export dosyası: yeni export'ta ya da oturum state'i silinince
+    # (oturum sonu / süreç kapanışı) diskten kaldırılır
+    def __init__(self, fmt, path):
+        self.fmt = fmt
+        self.path = path
+        self._finalizer = weakref.finalize(self, _remove_file, path)
+
+    def discard(self):
+        self._finalizer()
+
+
+def _remove_file(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
 
 
 MODEL_FILES  = {
     "RandomForest": "RandomForest.pkl",
     "Ridge":        "Ridge.pkl",
     "KNN":          "KNN.pkl",
+    "MatrixFactorization": "MatrixFactorization.pkl",
 }
 USER_ENC_FILE  = "user_encoder.pkl"
 MOVIE_ENC_FILE = "movie_encoder.pkl"
 
-def load_model():
-    # 1) Modeller ve encoder dosyaları var mı?
-    files_ok = all(os.path.exists(p) for p in MODEL_FILES.values()) \
-               and os.path.exists(USER_ENC_FILE) \
-               and os.path.exists(MOVIE_ENC_FILE)
-    if files_ok:
-        models = {n: joblib.load(p) for n, p in MODEL_FILES.items()}
-        user_enc  = joblib.load(USER_ENC_FILE)
-        movie_enc = joblib.load(MOVIE_ENC_FILE)
-        return models, user_enc, movie_enc
-
-    # 2) Eksikse yeniden eğit
-    df = getAllData()
-    return encodeTrainTest(df)
-    
-def check_neo4j_connection():
-    try:
-        driver = get_driver()
-        with driver.session() as session:
-            session.run("RETURN 1")
-        return True
-    except (ServiceUnavailable, AuthError, Exception):
-        return False
-
-def get_graph_data(selected_types):
-    driver = get_driver()
-    with driver.session() as session:
-
-        # Filtreli ilişkili düğümler
-        if selected_types:
-            query = f"""
-            MATCH (n)-[r]->(m)
-            WHERE ANY(lbl IN labels(n) WHERE lbl IN $types)
-               OR ANY(lbl IN labels(m) WHERE lbl IN $types)
-            RETURN n, type(r) AS rel_type, m
-            """
-            rel_result = session.run(query, types=selected_types)
-        else:
-            rel_result = session.run("MATCH (n)-[r]->(m) RETURN n, type(r) AS rel_type, m")
-
-        # Filtreli ilişkisiz düğümler
-        if selected_types:
-            solo_query = """
-            MATCH (n)
-            WHERE NOT (n)--()
-              AND ANY(lbl IN labels(n) WHERE lbl IN $types)
-            RETURN n
-            """
-            solo_result = session.run(solo_query, types=selected_types)
-        else:
-            solo_result = session.run("MATCH (n) WHERE NOT (n)--() RETURN n")
-
-        return {
-            "rel_records": list(rel_result),
-            "solo_nodes": list(solo_result)
-        }
-
-
-def draw_network(graph_data, selected_types):
-    rel_counter = 0
-    node_counter = 0
-    from pyvis.network import Network
-
-    rel_records = graph_data["rel_records"]
-    solo_nodes = graph_data["solo_nodes"]
-
-    net = Network(height="550px", width="100%", bgcolor="#ffffff", font_color="black", notebook=False, directed=True)
-    net.force_atlas_2based()
-    added_nodes = set()
+@st.cache_resource
+def get_model_registry():
+    # Süreç başına tek registry; düz .pkl dosyaları eski kurulumlar için yedek
+    return ModelRegistry(legacy_files=MODEL_FILES, legacy_encoders=(USER_ENC_FILE, MOVIE_ENC_FILE))
 
-    def get_color(labels):
-        if "Person" in labels:
-            return "#FF6B6B"
-        elif "Movie" in labels:
-            return "#4D96FF"
-        elif "Genre" in labels:
-            return "#FFD93D"
-        elif "User" in labels:
-            return "#6BCB77"
-        else:
-            return "#D3D3D3"
 
-    def should_add(labels):
-        return not selected_types or any(lbl in selected_types for lbl in labels)
+def load_model():
+    # 1) Son sürüm bellekte mi / diskte daha yenisi var mı?
+    loaded = get_model_registry().get()
+    if loaded is None:
+        # 2) Hiç model yoksa eğit ve yeni sürümü yükle
+        encodeTrainTest(get_graph_backend().ratings())
+        loaded = get_model_registry().get()
+    models, user_enc, movie_enc, _ = loaded
+    return models, user_enc, movie_enc
 
-    def add_node_if_needed(node):
-        node_id = node.element_id
-        if node_id not in added_nodes:
-            labels = list(node.labels)
-            if should_add(labels):
-                label = node.get("name") or node.get("title") or node.get("username")
-                tooltip = "\n".join([f"{k}: {v}" for k, v in node.items()])
-                net.add_node(node_id, label=label, title=tooltip, color=get_color(labels))
-                added_nodes.add(node_id)
 
-    # Önce tüm geçerli düğümleri ekle (ilişkili ve ilişkisiz)
-    all_nodes = [rec["n"] for rec in rel_records] + [rec["m"] for rec in rel_records] + [rec["n"] for rec in solo_nodes]
-    for node in all_nodes:
-        node_counter += 1
-        add_node_if_needed(node)
-        if node_counter >= 100:
-            break
 
-    # Şimdi sadece ilişkili düğümler arasında kenar ekle
-    for record in rel_records:
-        rel_counter += 1
-        n_id = record["n"].element_id
-        m_id = record["m"].element_id
-        if n_id in added_nodes and m_id in added_nodes:
-            net.add_edge(n_id, m_id, label=record["rel_type"])
-        if rel_counter >= 500:
-            break
+@st.cache_resource
+def get_job_runner():
+    # Process genelinde tek runner; iş sonuçları sayfa yeniden çalışınca da okunur.
+    # İptal backend'e göre: Neo4j'de transaction sonlandırılır, bellekte no-op
+    backend = get_graph_backend()
+    return JobRunner(max_workers=2, on_cancel=lambda job: backend.cancel_job(job.id))
+
+
+def show_job(slot):
+    # session_state[slot] içindeki işin durumunu gösterir; bittiyse sonucu döner
+    runner = get_job_runner()
+    job_id = st.session_state.get(slot)
+    info = runner.status(job_id) if job_id else None
+    if info is None:
+        return None
+
+    if info["status"] in ACTIVE_STATES:
+        st.progress(info["progress"] or 0.0, text=f"{info['message'] or info['status'].capitalize()} ({info['elapsed']}s)")
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("Refresh status", key=f"{slot}_refresh"):
+                st.rerun()
+        with col2:
+            if st.button("Cancel", key=f"{slot}_cancel"):
+                runner.cancel(job_id)
+                st.rerun()
+        return None
+
+    if info["status"] == FAILED:
+        st.error(f"Job failed after {info['elapsed']}s: {info['error']}")
+    elif info["status"] == CANCELLED:
+        st.warning(f"Job cancelled after {info['elapsed']}s.")
+    else:
+        st.caption(f"Finished in {info['elapsed']}s")
+        return runner.result(job_id)
+    return None
 
-    return net
 
+def check_neo4j_connection():
+    # Arka planda yenilenen son sağlık kontrolü; render başına round trip yok
+    return get_graph_backend().healthy()
 
+def get_graph_data(selected_types, max_nodes=100, max_edges=500, strategy="Top degree"):
+    # Node/edge budget ve label filtresi backend içinde uygulanır
+    return get_graph_backend().sample_subgraph(selected_types, max_nodes, max_edges, strategy)
 
 
 def show_graph(selected_types):
     records = get_graph_data(selected_types)
-    net = draw_network(records, selected_types)
+    net = draw_network(records)
     net.save_graph("graph.html")
     net.write_html("graph.html")  # same as save_graph
 
@@ -172,52 +167,41 @@ def show_graph(selected_types):
     components.html(html, height=650, scrolling=True)
 
 
+# Dışarıdan (başka bir client) yapılan yazmalar için üst sınır
+STATS_TTL_SECONDS = 60
+
+@st.cache_data(ttl=STATS_TTL_SECONDS, show_spinner=False)
+def load_statistics(graph_version):
+    # graph_version yalnızca cache anahtarı; her yazmada değişir
+    return get_graph_backend().statistics()
+
+
 def show_statistics():
-    driver = get_driver()
-    with driver.session() as session:
-        film_count = session.run("MATCH (m:Movie) RETURN count(m) AS count").single()["count"]
-        person_count = session.run("MATCH (p:Person) RETURN count(p) AS count").single()["count"]
-        user_count = session.run("MATCH (u:User) RETURN count(u) AS count").single()["count"]
-        genre_count = session.run("MATCH (g:Genre) RETURN count(g) AS count").single()["count"]
-        avg_rating = session.run("MATCH (:User)-[r:RATED]->() RETURN avg(r.score) AS avg").single()["avg"]
-        total_rel = session.run("MATCH ()-[r]->() RETURN count(r) AS count").single()["count"]
+    stats = load_statistics(get_graph_version())
+    avg_rating = stats["avg_rating"]
 
     col1, col2, col3, col4, col5, col6 = st.columns(6)
-    col1.metric("Movies", film_count)
-    col2.metric("Person", person_count)
+    col1.metric("Movies", stats["movies"])
+    col2.metric("Person", stats["persons"])
     col3.metric("Avg. Rating", f"{avg_rating:.2f}" if avg_rating else "N/A")
-    col4.metric("Total Relationships", total_rel)
-    col5.metric("Users", user_count)
-    col6.metric("Genres", genre_count)
+    col4.metric("Total Relationships", stats["total_relationships"])
+    col5.metric("Users", stats["users"])
+    col6.metric("Genres", stats["genres"])
 
 
-def search_node(term):
-    driver = get_driver()
-    with driver.session() as session:
-        result = session.run("""
-            MATCH (n)
-            WHERE toLower(n.name) CONTAINS toLower($term) OR toLower(n.title) CONTAINS toLower($term)
-            RETURN labels(n) AS labels, n LIMIT 10
-        """, term=term)
-        return [r.data() for r in result]
+def search_node(term, labels=None, page=0, page_size=10):
+    # Fulltext index üzerinden sıralı ve sayfalı arama
+    return get_graph_backend().search_nodes(term, labels, page, page_size)
 
 
 def show_relationship_counts():
-    driver = get_driver()
-    with driver.session() as session:
-        result = session.run("""
-            MATCH (n)-[r]->()
-            RETURN coalesce(n.name, n.title, "Unnamed Node") AS node, count(r) AS relation_count
-            ORDER BY relation_count DESC LIMIT 10
-        """)
-        return pd.DataFrame([r.data() for r in result])
-
+    return pd.DataFrame(get_graph_backend().top_connected(), columns=["node", "relation_count"])
 
-# Beyaz kutu: Neo4j bağlantı durumu
-print("Connection status:", check_neo4j_connection())
 
+backend = get_graph_backend()
+connected = check_neo4j_connection()
 
-if check_neo4j_connection() == True:
+if connected:
 
     # Menü seçim fonksiyonu
     def update_menu(choice):
@@ -264,9 +248,11 @@ if check_neo4j_connection() == True:
                 <p style="color: %s; font-weight: bold;">%s</p>
             </div>
         """ % (
-            "green" if check_neo4j_connection() else "red",
-            "🟢 Connected" if check_neo4j_connection() else "🔴 Not Connected"
+            "green" if connected else "red",
+            "🟢 Connected" if connected else "🔴 Not Connected"
         ), unsafe_allow_html=True)
+        if backend.name != "neo4j":
+            st.caption(f"Graph backend: {backend.name} (in-process)")
 
 
         selected = option_menu(
@@ -329,9 +315,7 @@ if check_neo4j_connection() == True:
                         if not name:
                             st.warning("Please enter a name and age.")
                         else:
-                            with get_driver() as driver:
-                                with driver.session() as session:
-                                    session.execute_write(add_user, name.strip())
+                            backend.add_user(name.strip())
                             st.success(f"{name} added successfully!")
 
 
@@ -352,9 +336,7 @@ if check_neo4j_connection() == True:
                         if not name or not roles:
                             st.warning("Please enter a name and select at least one role.")
                         else:
-                            with get_driver() as driver:
-                                with driver.session() as session:
-                                    session.execute_write(add_movie_person, name.strip(), age, gender, roles)
+                            backend.add_person(name.strip(), age, gender, roles)
                             st.success(f"{name} added successfully!")
 
 
@@ -377,9 +359,7 @@ if check_neo4j_connection() == True:
                     if not title or not genres:
                         st.warning("Please enter title and select at least one genre.")
                     else:
-                        with get_driver() as driver:
-                            with driver.session() as session:
-                                session.execute_write(add_movie_with_genres, title.strip(), year, genres)
+                        backend.add_movie(title.strip(), year, genres)
                         st.success(f"Movie '{title}' added with genres: {', '.join(genres)}")
 
 
@@ -408,9 +388,7 @@ if check_neo4j_connection() == True:
                         if not user_name or not movie_title:
                             st.warning("Please enter both username and movie title.")
                         else:
-                            with get_driver() as driver:
-                                with driver.session() as session:
-                                    session.execute_write(rate_movie, user_name.strip(), movie_title.strip(), score)
+                            backend.rate(user_name.strip(), movie_title.strip(), score)
                             st.success(f"User '{user_name}' rated '{movie_title}' with {score}/10.")
 
 
@@ -437,9 +415,7 @@ if check_neo4j_connection() == True:
                         if not person_name or not movie_title or not selected_roles:
                             st.warning("Please fill in all fields.")
                         else:
-                            with get_driver() as driver:
-                                with driver.session() as session:
-                                    session.execute_write(link_movieperson_to_movie, person_name.strip(), movie_title.strip(), selected_roles)
+                            backend.link(person_name.strip(), movie_title.strip(), selected_roles)
                             st.success(f"{person_name} linked to '{movie_title}' as: {', '.join(selected_roles)}")
 
 
@@ -448,18 +424,24 @@ if check_neo4j_connection() == True:
             st.markdown("<h3 style='text-align: left; font-size: 20px;'>Add by Query</h3>", unsafe_allow_html=True)
             st.markdown("<p style='text-align: left; font-size: 17px; margin-bottom: 30px;'>You can add data to the database using a Cypher query.</p>", unsafe_allow_html=True)
 
-            query = st.text_area("Enter your Cypher query here", height=100, placeholder="E.g., CREATE (:Person {name: 'Neo', age: 30})")
+            query = st.text_area("Enter your Cypher query here", height=100, placeholder="E.g., CREATE (:Person {name: 'Neo', age: 30})",
+                                 disabled=not backend.supports_cypher)
+            if not backend.supports_cypher:
+                st.info(f"Cypher queries need the Neo4j backend; the current backend is '{backend.name}'.")
 
-            if st.button("Execute Query"):
+            if backend.supports_cypher and st.button("Execute Query"):
                 if not query.strip():
                     st.warning("Please enter a query.")
                 else:
                     with st.spinner("Running your query..."):
                         try:
                             driver = get_driver()
-                            with driver.session() as session:
+                            with open_session(driver) as session:
                                 result = session.run(query)
                                 records = list(result)
+                                if result.consume().counters.contains_updates:
+                                    # Ham sorgunun neyi değiştirdiği bilinmiyor
+                                    bump_graph_version()
 
                                 if records:
                                     df = pd.DataFrame([r.data() for r in records])
@@ -505,9 +487,7 @@ if check_neo4j_connection() == True:
                         if not name:
                             st.warning("Please enter a name.")
                         else:
-                            with get_driver() as driver:
-                                with driver.session() as session:
-                                    session.execute_write(delete_user, name.strip())
+                            backend.delete_user(name.strip())
                             st.success(f"User '{name}' was deleted successfully!")
 
                 elif selected_category == "Movie Person":
@@ -518,9 +498,7 @@ if check_neo4j_connection() == True:
                         if not name:
                             st.warning("Please enter a name.")
                         else:
-                            with get_driver() as driver:
-                                with driver.session() as session:
-                                    session.execute_write(delete_person, name.strip())
+                            backend.delete_person(name.strip())
                             st.success(f"Movie Person '{name}' was deleted successfully!")
 
 
@@ -533,9 +511,7 @@ if check_neo4j_connection() == True:
                     if not title:
                         st.warning("Please enter a movie title.")
                     else:
-                        with get_driver() as driver:
-                            with driver.session() as session:
-                                session.execute_write(delete_movie, title=title.strip())
+                        backend.delete_movie(title.strip())
                         st.success(f"Movie '{title}' deleted successfully!")
 
 
@@ -557,11 +533,7 @@ if check_neo4j_connection() == True:
                     submitted = st.button("Delete Relationship")
 
                     if submitted:
-                        driver = get_driver()
-
-                        with driver.session() as session:
-                            result = session.execute_write(
-                                delete_person_relationship, source_name, target_title, rel_type, source_label)
+                        result = backend.delete_link(source_name, target_title, rel_type)
 
                         if result["status"] == "deleted":
                             if "score" in result:
@@ -582,11 +554,7 @@ if check_neo4j_connection() == True:
                     submitted = st.button("Delete Relationship")
 
                     if submitted:
-                        driver = get_driver()
-
-                        with driver.session() as session:
-                            result = session.execute_write(
-                                delete_user_relationship, source_name, target_title)
+                        result = backend.delete_rating(source_name, target_title)
 
                         if result["status"] == "deleted":
                             if "score" in result:
@@ -602,27 +570,31 @@ if check_neo4j_connection() == True:
                 st.markdown("<p style='text-align: left; font-size: 17px;'>This will delete all nodes and relationships in the database.</p>", unsafe_allow_html=True)
 
                 if st.button("Delete All Data"):
-                    with get_driver() as driver:
-                        with driver.session() as session:
-                            session.execute_write(delete_all)
+                    backend.delete_all()
                     st.success("All data deleted successfully!")
 
         with tab2:
             st.markdown("<h3 style='text-align: left; font-size: 20px;'>Delete by Query</h3>", unsafe_allow_html=True)
             st.markdown("<p style='text-align: left; font-size: 17px; margin-bottom: 30px'>You can delete data from the database using a Cypher query.</p>", unsafe_allow_html=True)
 
-            query = st.text_area("Enter your Cypher query here", height=100, placeholder="E.g., MATCH (n) DETACH DELETE n")
+            query = st.text_area("Enter your Cypher query here", height=100, placeholder="E.g., MATCH (n) DETACH DELETE n",
+                                 disabled=not backend.supports_cypher)
+            if not backend.supports_cypher:
+                st.info(f"Cypher queries need the Neo4j backend; the current backend is '{backend.name}'.")
 
-            if st.button("Execute Query"):
+            if backend.supports_cypher and st.button("Execute Query"):
                 if not query.strip():
                     st.warning("Please enter a query.")
                 else:
                     with st.spinner("Running your query..."):
                         try:
                             driver = get_driver()
-                            with driver.session() as session:
+                            with open_session(driver) as session:
                                 result = session.run(query)
                                 records = list(result)
+                                if result.consume().counters.contains_updates:
+                                    # Ham sorgunun neyi değiştirdiği bilinmiyor
+                                    bump_graph_version()
 
                                 if records:
                                     df = pd.DataFrame([r.data() for r in records])
@@ -640,27 +612,115 @@ if check_neo4j_connection() == True:
         show_statistics()
 
         st.subheader("Graph View")
-        selected_types = st.multiselect("Filter by Node Types", ["Person", "Movie", "Genre", "User"])
+        view_mode = st.radio("View mode", ["Overview", "Ego explorer"], horizontal=True)
+
+        if view_mode == "Overview":
+            col1, col2, col3, col4 = st.columns([3, 2, 1, 1])
+            with col1:
+                selected_types = st.multiselect("Filter by Node Types", ["Person", "Movie", "Genre", "User"])
+            with col2:
+                sampling = st.selectbox("Sampling", SAMPLING_STRATEGIES)
+            with col3:
+                max_nodes = st.number_input("Max nodes", min_value=10, max_value=1000, value=100, step=10)
+            with col4:
+                max_edges = st.number_input("Max edges", min_value=10, max_value=5000, value=500, step=50)
+        else:
+            # Arama ile başlangıç düğümü seç, k-hop komşuluğu getir, istenince genişlet
+            col1, col2, col3 = st.columns([3, 1, 1])
+            with col1:
+                ego_term = st.text_input("Start node (search by name/title)")
+            with col2:
+                ego_hops = st.number_input("Hops", min_value=1, max_value=3, value=1, step=1)
+            with col3:
+                ego_fanout = st.number_input("Fan-out per node", min_value=1, max_value=200, value=25, step=5)
+        graph_area = st.container()
+
+        st.subheader("Search Nodes")
+        col1, col2, col3 = st.columns([3, 2, 1])
+        with col1:
+            term = st.text_input("Search by name/title")
+        with col2:
+            search_labels = st.multiselect("Search in", ["Person", "Movie", "Genre", "User"])
+        with col3:
+            search_page = st.number_input("Page", min_value=1, value=1, step=1)
+
+        # Sayfanın bağımsız okumaları tek seferde; Neo4j backend'de eşzamanlı çalışır
+        tasks = {"top_connected": ("top_connected", ())}
+        if view_mode == "Overview":
+            tasks["graph"] = ("sample_subgraph", (selected_types, max_nodes, max_edges, sampling))
+        elif ego_term:
+            tasks["candidates"] = ("search_nodes", (ego_term,))
+        if term:
+            tasks["search"] = ("search_nodes", (term, search_labels, search_page - 1))
         with st.spinner("Loading interactive graph..."):
-            graph_data = get_graph_data(selected_types)
-            net = draw_network(graph_data, selected_types)
+            page_data = backend.read_many(tasks)
+
+        with graph_area:
+            if view_mode == "Overview":
+                graph_data = page_data["graph"]
+            else:
+                candidates = page_data.get("candidates", [])
+                if candidates:
+                    start = st.selectbox(
+                        "Matches", candidates,
+                        format_func=lambda c: f"{c['n'].get('name') or c['n'].get('title') or c['n'].get('username')} ({', '.join(c['labels'])})",
+                    )
+                    if st.button("Explore"):
+                        st.session_state.ego_graph = backend.ego_network(start["id"], ego_hops, ego_fanout)
+
+                ego_graph = st.session_state.get("ego_graph")
+                if ego_graph and ego_graph["nodes"]:
+                    unexpanded = [n for n in ego_graph["nodes"].values() if n["id"] not in ego_graph["expanded"]]
+                    if unexpanded:
+                        col1, col2 = st.columns([3, 1])
+                        with col1:
+                            to_expand = st.selectbox("Expand node", unexpanded, format_func=lambda n: n["caption"] or n["id"])
+                        with col2:
+                            st.write("")
+                            if st.button("Expand"):
+                                backend.expand_ego_network(ego_graph, to_expand["id"], ego_fanout)
+                    st.caption(f"{len(ego_graph['nodes'])} nodes, {len(ego_graph['edges'])} relationships loaded")
+
+                selected_types = []
+                graph_data = ego_graph_data(ego_graph) if ego_graph else {"nodes": [], "edges": []}
+
+            net = draw_network(graph_data)
             net.save_graph("graph.html")
 
             with open("graph.html", "r", encoding="utf-8") as f:
                 html = f.read()
             components.html(html, height=600, scrolling=True)
 
-        st.subheader("Search Nodes")
-        term = st.text_input("Search by name/title")
         if term:
-            results = search_node(term)
-            st.write(results)
+            st.write(page_data["search"])
 
         st.subheader("🔗 Top Connected Nodes")
-        df_rel = show_relationship_counts()
+        df_rel = pd.DataFrame(page_data["top_connected"], columns=["node", "relation_count"])
         st.dataframe(df_rel)
         st.bar_chart(df_rel.set_index("node"))
 
+        st.subheader("🏆 Leaderboards")
+        col1, col2, col3 = st.columns([3, 1, 2])
+        with col1:
+            board = st.selectbox("Leaderboard", list(LEADERBOARDS))
+        with col2:
+            top_n = st.number_input("Top N", min_value=1, max_value=500, value=10, step=5)
+        filters = {}
+        with col3:
+            if board in ("Most active actors", "Highest rated movies", "Most connected movies"):
+                genre_filter = st.text_input("Genre filter (optional)")
+                if genre_filter.strip():
+                    filters["genre"] = genre_filter.strip()
+            elif board == "Movies per genre":
+                min_year = st.number_input("Released since", min_value=0, max_value=2100, value=0, step=1)
+                if min_year:
+                    filters["min_year"] = min_year
+        if board == "Highest rated movies":
+            filters["min_ratings"] = st.slider("Minimum number of ratings", 1, 100, 1)
+
+        leaderboard_df = backend.leaderboard(board, top_n, **filters)
+        st.dataframe(leaderboard_df, use_container_width=True)
+
         st.subheader("⬇️ Export Data")
         st.markdown("<p style='text-align: left; font-size: 15px;'>You can export the top connected nodes or the full graph data.</p>", unsafe_allow_html=True)
         st.markdown("<p style='text-align: left; font-size: 15px;'>Select the type of export you want to perform.</p>", unsafe_allow_html=True)
@@ -670,17 +730,24 @@ if check_neo4j_connection() == True:
             st.download_button("Export Top Relations CSV", data=df_rel.to_csv(index=False).encode("utf-8"), file_name="top_relations.csv")
 
         elif export_option == "Full Graph Data":
-            driver = get_driver()
-            with driver.session() as session:
-                result = session.run("MATCH (n)-[r]->(m) RETURN n, type(r) AS rel_type, m")
-                records = result.data()
-                full_df = pd.DataFrame([{
-                "source": rec["n"].get("name") or rec["n"].get("title") or "Unnamed Source",
-                "target": rec["m"].get("name") or rec["m"].get("title") or "Unnamed Target",
-                "relationship": rec["rel_type"]
-            } for rec in records])
-
-            st.download_button("Export Full Graph CSV", data=full_df.to_csv(index=False).encode("utf-8"), file_name="full_graph_data.csv")
+            export_format = st.selectbox("Format", EXPORT_FORMATS)
+
+            # Sorgu yalnızca istenince çalışır; sonuç diske parça parça yazılır
+            if st.button("Prepare Export"):
+                previous = st.session_state.pop("export_file", None)
+                if previous:
+                    previous.discard()
+                with st.spinner("Exporting graph..."):
+                    try:
+                        st.session_state.export_file = ExportFile(export_format, backend.export(export_format))
+                    except ImportError as e:
+                        st.error(str(e))
+
+            export_file = st.session_state.get("export_file")
+            if export_file and export_file.fmt == export_format and os.path.exists(export_file.path):
+                extension = os.path.splitext(export_file.path)[1]
+                with open(export_file.path, "rb") as f:
+                    st.download_button(f"Export Full Graph {export_format}", data=f, file_name=f"full_graph_data{extension}")
 
 
     if st.session_state.page == "ML & Analysis":
@@ -692,21 +759,44 @@ if check_neo4j_connection() == True:
 
         tabs = st.tabs(["🎯 Degree Distribution", "🧩 Community Detection", "⭐ Centralities", "📊 Knowledge Graph Completion", "📈 Link Prediction", "Similarity Graph"])
 
+        # Sekmelerin bağımsız okumaları tek seferde (Neo4j'de eşzamanlı). Widget
+        # değerleri önceki çalıştırmadan session_state'te hazır. Puanlar rating
+        # cache'ten (artımlı, senkron) ayrıca gelir.
+        ml_data = backend.read_many({
+            "degrees": ("degree_distribution", (st.session_state.get("degree_bucketing", "log"),
+                                                st.session_state.get("degree_group_by", "label"))),
+            "movie_titles": ("movie_titles", ()),
+        })
+
 
         with tabs[0]:
             st.markdown("<h3 style='text-align: left; font-size: 20px;'>Degree Distribution</h3>", unsafe_allow_html=True)
             st.markdown("<p style='text-align: left; font-size: 18px;'>This graph shows the degree distribution of the nodes in the database.</p>", unsafe_allow_html=True)
 
-            degrees = get_degree_distribution()
+            col1, col2 = st.columns(2)
+            with col1:
+                st.radio("Bucketing", ["log", "linear"], horizontal=True, key="degree_bucketing")
+            with col2:
+                st.selectbox("Group by", ["label", "rel_type", None], key="degree_group_by",
+                             format_func=lambda g: {"label": "Node label", "rel_type": "Relationship type", None: "None"}[g])
+
+            degrees = ml_data["degrees"]
 
             if degrees:
-                fig = px.histogram(
-                    x=degrees,
-                    nbins=30,
-                    labels={'x': 'Degree', 'y': 'Node Count'},
+                hist_df = pd.DataFrame(degrees)
+                hist_df["Degree"] = [
+                    f"{r.bucket_start}" if r.bucket_start == r.bucket_end else f"{r.bucket_start}-{r.bucket_end}"
+                    for r in hist_df.itertuples()
+                ]
+                fig = px.bar(
+                    hist_df,
+                    x="Degree",
+                    y="nodes",
+                    color="group",
+                    labels={'nodes': 'Node Count', 'group': 'Group'},
                     title="Node Degree Distribution",
+                    category_orders={"Degree": list(dict.fromkeys(hist_df.sort_values("bucket_start")["Degree"]))},
                 )
-                fig.update_traces(marker_color='indianred')
                 fig.update_layout(
                     xaxis_title="Degree",
                     yaxis_title="Number of Nodes",
@@ -725,39 +815,38 @@ if check_neo4j_connection() == True:
             st.markdown("<h3 style='text-align: left; font-size: 20px;'>Community Detection with Louvain Algorithm</h3>", unsafe_allow_html=True)
             st.markdown("<p style='text-align: left; font-size: 18px;'>This section allows you to detect communities in the graph using the Louvain algorithm.</p>", unsafe_allow_html=True)
 
-            if st.button("Run Louvain Algorithm"):
+            if not backend.supports_gds:
+                st.info(f"Louvain runs on Neo4j GDS; the current backend is '{backend.name}'.")
+            elif st.button("Run Louvain Algorithm"):
+                st.session_state.louvain_job = get_job_runner().submit("louvain", run_louvain_job, driver, GDS_GRAPH_NAME)
 
-                with st.spinner("Algorithm is running..."):
-                    result = run_louvain_community_detection(driver, graph_name='full-movie-graph')
+            louvain = show_job("louvain_job")
 
-                    if result:
-                        st.success("Louvain algorithm ran successfully!")
+            if louvain:
+                result = louvain["summary"]
+                community_data = louvain["communities"]
 
-                        st.write(f"🔹 Total number of communities: {result.get('communityCount', 'N/A')}")
-                        st.write(f"🔹 Modularity score: {result.get('modularity', 'N/A')}")
+                if result:
+                    st.success("Louvain algorithm ran successfully!")
 
-                        # Topluluk bazında detaylı veri çekiliyor
-                        with driver.session() as session:
-                            community_data = session.execute_read(get_community_data)
+                    st.write(f"🔹 Total number of communities: {result.get('communityCount', 'N/A')}")
+                    st.write(f"🔹 Modularity score: {result.get('modularity', 'N/A')}")
 
-                        if community_data:
-                            st.write("Number of nodes per community:")
+                    if community_data:
+                        st.write("Number of nodes per community:")
 
-                            # Burada örnek olarak Streamlit'in bar_chart fonksiyonunu kullanabiliriz:
-                            import pandas as pd
+                        df = pd.DataFrame(community_data)
+                        community_counts = df['community'].value_counts().sort_index()
+                        st.bar_chart(community_counts)
 
-                            df = pd.DataFrame(community_data)
-                            community_counts = df['community'].value_counts().sort_index()
-                            st.bar_chart(community_counts)
+                        st.write("Detailed community assignment data")
+                        st.dataframe(df)
 
-                            st.write("Detailed community assignment data")
-                            st.dataframe(df)
-
-                        else:
-                            st.warning("No detailed community data available. Only summary results are shown.")
                     else:
-                        st.warning("Algorithm failed to run or returned no results.")
-            else:
+                        st.warning("No detailed community data available. Only summary results are shown.")
+                else:
+                    st.warning("Algorithm failed to run or returned no results.")
+            elif "louvain_job" not in st.session_state:
                 st.info("Click the button to run the Louvain algorithm.")
 
 
@@ -765,8 +854,14 @@ if check_neo4j_connection() == True:
         with tabs[2]:
             st.markdown("<h3 style='text-align: left; font-size: 20px;'>Centralities</h3>", unsafe_allow_html=True)
             st.markdown("<p style='text-align: left; font-size: 18px;'>This section allows you to analyze the centrality of nodes in the graph.</p>", unsafe_allow_html=True)
-            clearGDS()  
-            create_gds_projection()
+
+            projection = get_gds_projection_info() if backend.supports_gds else None
+            if projection:
+                st.caption(
+                    f"GDS projection '{projection['graph_name']}': {projection['node_count']} nodes, "
+                    f"{projection['relationship_count']} relationships, {projection['memoryUsage']} in memory, "
+                    f"idle {projection['idle_seconds']}s"
+                )
 
 
             centrality_options = [
@@ -776,40 +871,80 @@ if check_neo4j_connection() == True:
             ]
 
             selected_centrality = st.selectbox("Select Centrality Measure", centrality_options)
+            centrality_backend = st.radio("Backend", ["Neo4j GDS", "Local (in-process)"] if backend.supports_gds else ["Local (in-process)"],
+                                          horizontal=True)
+
+            if centrality_backend == "Neo4j GDS":
+                algorithms = {
+                    "Degree Centrality": degreeCentralityGDS,
+                    "Betweenness Centrality": betweennessGDS,
+                    "PageRank": pageRankGDS,
+                }
+            else:
+                # GDS eklentisi gerekmez; snapshot graf değişmedikçe yeniden kullanılır
+                algorithms = {
+                    "Degree Centrality": degreeCentralityLocal,
+                    "Betweenness Centrality": betweennessLocal,
+                    "PageRank": pageRankLocal,
+                }
+
+            job_kwargs = {}
+            if selected_centrality == "Betweenness Centrality":
+                # Kaynak örneklemesi ile yaklaşık mod; kesin hesap her zaman seçilebilir
+                approximate = st.checkbox("Approximate (sample source nodes)")
+                if approximate:
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        sample_by = st.radio("Sample by", ["Sample size", "Target error"], horizontal=True)
+                    with col2:
+                        if sample_by == "Sample size":
+                            job_kwargs["samples"] = st.number_input("Source nodes", min_value=1, value=100, step=10)
+                        else:
+                            job_kwargs["target_error"] = st.number_input(
+                                "Max normalized error", min_value=0.01, max_value=0.5, value=0.1, step=0.01)
+                algorithms["Betweenness Centrality"] = (
+                    betweennessEstimateGDS if centrality_backend == "Neo4j GDS" else betweennessEstimateLocal)
 
             if st.button("Run Centrality"):
+                # GDS fonksiyonları projeksiyonu kendileri hazırlar; yerel olanlar
+                # backend'in snapshot'ını iş içinde alır
+                algorithm = algorithms[selected_centrality]
+                if centrality_backend != "Neo4j GDS":
+                    local_algorithm = algorithm
+                    algorithm = lambda **kwargs: local_algorithm(backend.snapshot(), **kwargs)
+                st.session_state.centrality_job = get_job_runner().submit(
+                    f"{centrality_backend}: {selected_centrality}", algorithm, **job_kwargs)
+                st.session_state.centrality_selected = selected_centrality
+
+            centralities = show_job("centrality_job")
+            if isinstance(centralities, dict):
+                estimate = centralities
+                centralities = estimate["rows"]
+                if estimate["exact"]:
+                    st.caption(f"Exact betweenness over {estimate['nodes']} nodes.")
+                else:
+                    bound = f", ±{estimate['error_bound']} per score" if estimate["error_bound"] is not None else ""
+                    st.info(
+                        f"Approximate: {estimate['sample_size']} of {estimate['nodes']} source nodes. "
+                        f"With {estimate['confidence']:.0%} confidence every score is within "
+                        f"{estimate['normalized_error']} of the exact value (normalized){bound}."
+                    )
 
-                with st.spinner("Clearing previous GDS data..."):
-                    clearGDS()
-
-                with st.spinner("Creating GDS projection..."):
-                    create_gds_projection()
-
-                with st.spinner("Running centrality algorithm..."):
-                    if selected_centrality == "Degree Centrality":
-                        centralities = degreeCentralityGDS()
-                        label_y = "Degree Centrality"
-
-                    elif selected_centrality == "Betweenness Centrality":
-                        centralities = betweennessGDS()
-                        label_y = "Betweenness Centrality"
-
-                    elif selected_centrality == "PageRank":
-                        centralities = pageRankGDS()
-                        label_y = "PageRank Centrality"
+            if centralities is not None:
+                shown_centrality = st.session_state.centrality_selected
+                label_y = "PageRank Centrality" if shown_centrality == "PageRank" else shown_centrality
 
-                    if centralities:
-                        with st.spinner("Fetching centrality results..."):
-                            st.subheader(f"Top 10 Centrality Nodes - {selected_centrality}")
-                            st.table(centralities)
+                if centralities:
+                    st.subheader(f"Top 10 Centrality Nodes - {shown_centrality}")
+                    st.table(centralities)
 
-                            names = [row['name'] for row in centralities]
-                            scores = [row['score'] for row in centralities]
+                    names = [row['name'] for row in centralities]
+                    scores = [row['score'] for row in centralities]
 
-                            fig = px.bar(x=names, y=scores, labels={'x': 'Node', 'y': label_y})
-                            st.plotly_chart(fig)
-                    else:
-                        st.warning("Centrality result not found.")
+                    fig = px.bar(x=names, y=scores, labels={'x': 'Node', 'y': label_y})
+                    st.plotly_chart(fig)
+                else:
+                    st.warning("Centrality result not found.")
 
 
 
@@ -819,34 +954,39 @@ if check_neo4j_connection() == True:
             
             options = ["Node Distribution by Label", "Relationship Distribution"]
             selected_option = st.selectbox("Select an option", options)
+            kg_source = st.radio("Compute on", ["Neo4j" if backend.name == "neo4j" else "In-memory graph", "Local snapshot"],
+                                 horizontal=True, key="kg_source")
 
             if st.button("Show Knowledge Graph Distribution"):
-                
-                if selected_option == "Node Distribution by Label":
-                    with st.spinner("Fetching node distribution..."):
-                        node_dist = get_node_label_distribution()
-                    
-                        st.subheader("Node Label Distribution")
-                        st.table(node_dist)
+                # Snapshot tüm grafı çeker; script thread'i yerine iş içinde kurulur
+                local = kg_source == "Local snapshot"
+                method = "label_distribution" if selected_option == "Node Distribution by Label" else "relationship_distribution"
+                st.session_state.kg_job = get_job_runner().submit(
+                    f"kg-distribution: {selected_option} ({kg_source})",
+                    lambda: getattr(backend.snapshot() if local else backend, method)())
+                st.session_state.kg_option = selected_option
+
+            kg_dist = show_job("kg_job")
+            if kg_dist is not None:
+                if st.session_state.get("kg_option") == "Node Distribution by Label":
+                    st.subheader("Node Label Distribution")
+                    st.table(kg_dist)
+
+                    labels = [row['label'] for row in kg_dist]
+                    counts = [row['count'] for row in kg_dist]
+
+                    fig = px.pie(names=labels, values=counts, title="Node Types Distribution")
+                    st.plotly_chart(fig)
 
-                        labels = [row['label'] for row in node_dist]
-                        counts = [row['count'] for row in node_dist]
-
-                        fig = px.pie(names=labels, values=counts, title="Node Types Distribution")
-                        st.plotly_chart(fig)
-
-                elif selected_option == "Relationship Distribution":
-                    with st.spinner("Fetching relationship distribution..."):
-                        rel_dist = get_relationship_distribution()
-
-                        st.subheader("Relationship Type Distribution")
-                        st.table(rel_dist)
+                else:
+                    st.subheader("Relationship Type Distribution")
+                    st.table(kg_dist)
 
-                        rel_labels = [row['relationship_type'] for row in rel_dist]
-                        rel_counts = [row['count'] for row in rel_dist]
+                    rel_labels = [row['relationship_type'] for row in kg_dist]
+                    rel_counts = [row['count'] for row in kg_dist]
 
-                        fig2 = px.bar(x=rel_labels, y=rel_counts, labels={'x': 'Relationship Type', 'y': 'Count'}, title="Relationship Types Frequency")
-                        st.plotly_chart(fig2)
+                    fig2 = px.bar(x=rel_labels, y=rel_counts, labels={'x': 'Relationship Type', 'y': 'Count'}, title="Relationship Types Frequency")
+                    st.plotly_chart(fig2)
 
 
         with tabs[4]:
@@ -854,7 +994,12 @@ if check_neo4j_connection() == True:
 
             # Modelleri ve encoder’ları yükle / eğit
             models, user_enc, movie_enc = load_model()
-            df = getAllData()
+            st.caption(f"Model version: {get_model_registry().version}")
+            # Neo4j'de yerel rating cache: yalnızca son watermark'tan sonraki değişiklikler çekilir
+            df = backend.ratings()
+            refresh = get_rating_cache().last_refresh if backend.name == "neo4j" else None
+            if refresh:
+                st.caption(f"Ratings: {refresh['rows']} rows, last refresh {refresh['mode']} in {refresh['seconds']}s")
 
             # Kullanıcı seçimi
             selected_user = st.selectbox("Select a user for prediction:", user_enc.classes_)
@@ -869,7 +1014,8 @@ if check_neo4j_connection() == True:
 
                     # Metriğe Göre Karşılaştırma Tablosu
                     st.markdown("### Models Comparison by Metrics")
-                    results_df = pd.read_json("results_df.json", orient="records", lines=True)
+                    metrics = get_model_registry().get()[3]["metrics"]
+                    results_df = pd.DataFrame(metrics) if metrics else pd.read_json("results_df.json", orient="records", lines=True)
                     st.dataframe(results_df)
 
                     # Metriğe Göre Karşılaştırma Grafikleri
@@ -899,14 +1045,70 @@ if check_neo4j_connection() == True:
             else:
                 st.warning("Lütfen önce bir kullanıcı seçip ‘Create Prediction’ butonuna tıklayın.")
 
+            with st.expander("Batch recommendations (all users)"):
+                cols = st.columns(2)
+                with cols[0]:
+                    batch_model = st.selectbox("Model", list(models), key="batch_model")
+                with cols[1]:
+                    batch_top_n = st.number_input("Top N per user", min_value=1, max_value=100, value=10, key="batch_top_n")
+
+                if st.button("Score All Users"):
+                    st.session_state.batch_recs_job = get_job_runner().submit(
+                        f"recommend-all-{batch_model}", recommend_movies_batch,
+                        models[batch_model], df, user_enc, movie_enc, top_n=int(batch_top_n),
+                        key=(batch_model, int(batch_top_n), len(df)),
+                    )
+
+                batch_recs = show_job("batch_recs_job")
+                if batch_recs is not None:
+                    st.dataframe(batch_recs)
+                    st.download_button(
+                        "Download CSV", batch_recs.to_csv(index=False),
+                        file_name="recommendations.csv", mime="text/csv",
+                    )
+
         with tabs[5]:
             st.markdown("<h3 style='text-align: left; font-size: 20px;'>Similarity Graph</h3>", unsafe_allow_html=True)
             st.markdown("<p style='text-align: left; font-size: 18px;'>This section allows you to visualize the similarity graph of movies.</p>", unsafe_allow_html=True)
 
-            if st.button("Find Similar Movies"):
-                df= get_similarity_graph()
+            engine = st.radio("Engine", ["GDS", "Local"] if backend.supports_gds else ["Local"], horizontal=True, key="similarity_engine")
+
+            if engine == "GDS":
+                if st.button("Find Similar Movies"):
+                    st.session_state.similarity_job = get_job_runner().submit("gds-similarity", get_similarity_graph)
+
+                df = show_job("similarity_job")
+                title = "Top 20 Similar Movies:"
+            else:
+                # Seyrek matris üzerinde in-process hesap; GDS gerekmez. Snapshot
+                # yalnızca butona basılınca iş içinde kurulur, liste ucuz sorgudan (ml_data)
+                movie_titles = ml_data["movie_titles"]
+                cols = st.columns(4)
+                with cols[0]:
+                    movie = st.selectbox("Movie", ["All movies"] + movie_titles, key="similarity_movie")
+                with cols[1]:
+                    metric = st.selectbox("Metric", SIMILARITY_METRICS, key="similarity_metric")
+                with cols[2]:
+                    features = st.multiselect("Features", list(MOVIE_FEATURES), default=list(MOVIE_FEATURES), key="similarity_features")
+                with cols[3]:
+                    top_k = st.number_input("Top K", min_value=1, max_value=50, value=10, key="similarity_k")
+
+                if st.button("Find Similar Movies") and features:
+                    if movie == "All movies":
+                        compute = lambda: (similarity_pairs(k=int(top_k), metric=metric, features=features,
+                                                            snapshot=backend.snapshot())
+                                           .sort_values("sim", ascending=False).head(20))
+                    else:
+                        compute = lambda: similar_movies(movie, k=int(top_k), metric=metric, features=features,
+                                                         snapshot=backend.snapshot())
+                    st.session_state.similarity_local_job = get_job_runner().submit(
+                        "local-similarity", compute, key=(movie, metric, tuple(features), int(top_k)))
+
+                df = show_job("similarity_local_job")
+                title = "Similar Movies:"
 
-                st.write("Top 20 Similar Movies:")
+            if df is not None and not df.empty:
+                st.write(title)
                 st.table(df)
                 
                 # Create a network graph
@@ -948,6 +1150,36 @@ if check_neo4j_connection() == True:
         st.markdown("---")
         st.markdown("<h3 style='text-align: left; font-size: 20px;'>Settings</h3>", unsafe_allow_html=True)
 
+        st.markdown("**Connection**")
+        st.json(backend.info())
+
+        if backend.name == "neo4j":
+            st.markdown("**Schema**")
+            schema_report = get_schema_report(get_driver())
+            if schema_report.get("skipped"):
+                st.warning(f"Schema setup skipped: {schema_report['skipped']}")
+            elif schema_report.get("failed"):
+                st.warning(f"{len(schema_report['failed'])} schema item(s) could not be created.")
+            st.json(schema_report)
+
+        st.markdown("**Query diagnostics**")
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            profile_rate = st.slider("PROFILE sample rate", 0.0, 1.0, float(instrumentation.PROFILE_SAMPLE_RATE), 0.01,
+                                     help="Fraction of queries run with PROFILE to capture db hits.")
+            set_profile_sample_rate(profile_rate)
+        with col2:
+            st.write("")
+            if st.button("Reset metrics"):
+                query_metrics.reset()
+        query_stats = query_metrics.snapshot()
+        if query_stats:
+            st.dataframe(pd.DataFrame(query_stats), use_container_width=True)
+        else:
+            st.caption("No queries recorded yet.")
+        if instrumentation.METRICS_PORT:
+            st.caption(f"Prometheus metrics: http://localhost:{instrumentation.METRICS_PORT}/metrics")
+
 
 else:
     st.markdown("<h1 style='text-align: left; font-size: 30px;'>Neo4j Connection Error</h1>", unsafe_allow_html=True)
@@ -958,4 +1190,5 @@ else:
 
     if st.button("🔄 Refresh"):
         with st.spinner("Refreshing..."):
+            get_connection_manager().check_health()
             st.rerun()